@@ -0,0 +1 @@
+# OpenWords benchmark scripts — run from data/ as `python -m benchmarks.<name>`
@@ -0,0 +1,107 @@
+"""
+Corpus analytics: row-by-row Python over SQLite vs. the columnar export.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_columnar              # 2000 articles
+    python -m benchmarks.bench_columnar -n 10000
+
+Computes the same statistics — complex-sentence rate and mean sentence
+length per source, and the mean Chinese / English length ratio — once by
+walking the sentences through Python and once with pyarrow over the Parquet
+files written by `export --columnar`, and checks they agree. Needs pyarrow.
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from crawler.archive import Corpus
+from crawler.export.columnar import export_columnar
+
+from .synth import build_corpus_db
+
+
+def _python_stats(db_path: Path) -> dict:
+    acc = defaultdict(lambda: [0, 0, 0])  # sentences, complex, words
+    ratio_sum, ratio_n = 0.0, 0
+    with Corpus(db_path) as corpus:
+        for schema in corpus.schemas():
+            for source, en, cn, is_complex in corpus.conn.execute(
+                f"""SELECT a.source, s.en_text, s.cn_text, s.is_complex
+                      FROM {schema}.sentences s
+                      JOIN {schema}.paragraphs p ON p.id = s.paragraph_id
+                      JOIN {schema}.articles a ON a.id = p.article_id"""
+            ):
+                a = acc[source]
+                a[0] += 1
+                a[1] += bool(is_complex)
+                a[2] += len(en.split())
+                if cn:
+                    ratio_sum += len(cn) / len(en)
+                    ratio_n += 1
+    return {
+        "by_source": {s: (c / n, w / n) for s, (n, c, w) in sorted(acc.items())},
+        "cn_en_ratio": ratio_sum / ratio_n,
+    }
+
+
+def _arrow_stats(out_dir: Path) -> dict:
+    import pyarrow.compute as pc  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+
+    t = ds.dataset(out_dir, format="parquet", partitioning="hive").to_table(
+        columns=["source", "is_complex", "en_words", "en_chars", "cn_chars"]
+    )
+    grouped = t.group_by("source").aggregate([("is_complex", "mean"), ("en_words", "mean")])
+    translated = t.filter(pc.greater(t["cn_chars"], 0))
+    ratio = pc.mean(pc.divide(pc.cast(translated["cn_chars"], "float64"), translated["en_chars"]))
+    return {
+        "by_source": {
+            r["source"]: (r["is_complex_mean"], r["en_words_mean"])
+            for r in sorted(grouped.to_pylist(), key=lambda r: r["source"])
+        },
+        "cn_en_ratio": ratio.as_py(),
+    }
+
+
+def _close(a: dict, b: dict) -> bool:
+    if a["by_source"].keys() != b["by_source"].keys():
+        return False
+    pairs = [(x, y) for s in a["by_source"] for x, y in zip(a["by_source"][s], b["by_source"][s])]
+    pairs.append((a["cn_en_ratio"], b["cn_en_ratio"]))
+    return all(abs(x - y) < 1e-9 for x, y in pairs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        db_path, out_dir = root / "bench.db", root / "corpus"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_corpus_db(db_path, args.articles)
+            t0 = time.perf_counter()
+            export_columnar(db_path, out_dir)
+            export_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        py = _python_stats(db_path)
+        py_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        arrow = _arrow_stats(out_dir)
+        arrow_s = time.perf_counter() - t0
+
+    print(f"{args.articles} articles\n")
+    print(f"  export --columnar   {export_s:>7.2f} s  (archived months only once)")
+    print(f"  python row walk     {py_s:>7.2f} s")
+    print(f"  pyarrow scan        {arrow_s:>7.2f} s  ({py_s / arrow_s:.0f}x faster)")
+    print(f"  results agree: {'yes' if _close(py, arrow) else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Write-throughput benchmark: per-call connections vs. a long-lived ArticleDB.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_db_writes            # 200 articles
+    python -m benchmarks.bench_db_writes -n 1000
+
+Each strategy writes the same synthetic articles into a fresh temporary DB,
+checking url_exists() before every save as the crawler does.
+"""
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from crawler.db import ArticleDB, init_db
+
+from .synth import make_article
+
+
+# ── Baseline: the original per-call pattern ───────────────────────────────────
+
+def _legacy_url_exists(url: str, db_path: Path) -> bool:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def _legacy_save_article(raw, paragraphs, title_cn, db_path: Path) -> int:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        cur = conn.execute(
+            """
+            INSERT OR IGNORE INTO articles
+                (source, url, title, title_cn, author, published_at,
+                 category, difficulty, image_url, crawled_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (raw.source, raw.url, raw.title, title_cn, raw.author, raw.published_at,
+             raw.category, raw.difficulty, raw.image_url, now),
+        )
+        article_id = cur.lastrowid
+        for para in paragraphs:
+            para_id = conn.execute(
+                "INSERT INTO paragraphs (article_id, seq, en_text, cn_text) VALUES (?, ?, ?, ?)",
+                (article_id, para.seq, para.en_text, para.cn_text),
+            ).lastrowid
+            for sent in para.sentences:
+                conn.execute(
+                    """
+                    INSERT INTO sentences
+                        (paragraph_id, seq, en_text, cn_text, is_complex, analysis)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (para_id, sent.seq, sent.en_text, sent.cn_text,
+                     int(sent.is_complex), sent.analysis),
+                )
+        conn.commit()
+        return article_id
+    finally:
+        conn.close()
+
+
+# ── Strategies ────────────────────────────────────────────────────────────────
+
+def run_legacy(articles, db_path: Path) -> None:
+    init_db(db_path)
+    for raw, paragraphs, title_cn in articles:
+        if not _legacy_url_exists(raw.url, db_path):
+            _legacy_save_article(raw, paragraphs, title_cn, db_path)
+
+
+def run_handle(articles, db_path: Path, batch_size: int) -> None:
+    with ArticleDB(db_path, batch_size=batch_size) as db:
+        for raw, paragraphs, title_cn in articles:
+            if not db.url_exists(raw.url):
+                db.save_article(raw, paragraphs, title_cn)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    articles = [make_article(i, rng) for i in range(args.articles)]
+    n_sentences = sum(len(p.sentences) for _, paras, _ in articles for p in paras)
+
+    strategies = [
+        ("per-call connection (old)", lambda p: run_legacy(articles, p)),
+        ("ArticleDB batch=1", lambda p: run_handle(articles, p, 1)),
+        ("ArticleDB batch=20", lambda p: run_handle(articles, p, 20)),
+        ("ArticleDB batch=all", lambda p: run_handle(articles, p, len(articles))),
+    ]
+
+    print(f"Writing {len(articles)} articles / {n_sentences} sentences per strategy\n")
+    print(f"  {'strategy':<28} {'seconds':>8} {'articles/s':>11} {'sentences/s':>12}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (label, fn) in enumerate(strategies):
+            db_path = Path(tmp) / f"bench-{i}.db"
+            t0 = time.perf_counter()
+            fn(db_path)
+            elapsed = time.perf_counter() - t0
+            baseline = baseline or elapsed
+            print(
+                f"  {label:<28} {elapsed:>8.2f} {len(articles) / elapsed:>11.1f} "
+                f"{n_sentences / elapsed:>12.0f}   ×{baseline / elapsed:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Detail file size: original full format vs. compact format 2.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_detail_size                       # ../article-data/detail
+    python -m benchmarks.bench_detail_size --dir /path/to/detail
+
+Re-encodes every full-format detail file with article_detail_compact(),
+expands it again the way the web app does (expandDetail() in
+src/lib/article-actions.ts) to check nothing is lost, and reports raw and
+gzip sizes of both formats.
+"""
+import argparse
+import gzip
+import json
+import statistics
+from pathlib import Path
+
+from crawler.export.layouts import COMPACT_DETAIL_VERSION, article_detail_compact
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent.parent / "article-data" / "detail"
+
+
+def _encode(obj: dict) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _expand(compact: dict) -> list[tuple]:
+    """Reader-visible paragraph / sentence content of a compact detail."""
+    out = []
+    for p in compact["paragraphs"]:
+        sents = [(s["en"], s.get("cn", ""), s.get("complex", False), s.get("analysis", ""))
+                 for s in p["sentences"]]
+        en = p.get("en", " ".join(s[0] for s in sents))
+        cn = p.get("cn", " ".join(s[1] for s in sents))
+        out.append((en, cn, sents))
+    return out
+
+
+def _visible(full: dict) -> list[tuple]:
+    """The same content read straight from a full detail."""
+    return [
+        (p["en_text"], p["cn_text"],
+         [(s["en_text"], s["cn_text"], s["is_complex"], s["analysis"]) for s in p["sentences"]])
+        for p in full["paragraphs"]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", type=Path, default=DEFAULT_DIR)
+    args = parser.parse_args()
+
+    files = sorted(args.dir.glob("*.json"))
+    if not files:
+        raise SystemExit(f"No detail files in {args.dir}")
+    full_raw = full_gz = compact_raw = compact_gz = 0
+    ratios = []
+    for path in files:
+        full = json.loads(path.read_bytes())
+        if full.get("format") == COMPACT_DETAIL_VERSION:
+            raise SystemExit(f"{path} is already compact; point --dir at a full-format export")
+
+        compact = article_detail_compact(full)
+        if _expand(compact) != _visible(full):
+            raise SystemExit(f"{path.name}: compact round trip differs")
+
+        f_bytes, c_bytes = _encode(full), _encode(compact)
+        full_raw += len(f_bytes)
+        compact_raw += len(c_bytes)
+        full_gz += len(gzip.compress(f_bytes, 9))
+        compact_gz += len(gzip.compress(c_bytes, 9))
+        ratios.append(len(c_bytes) / len(f_bytes))
+
+    print(f"{len(files)} detail files in {args.dir} (round trip OK)\n")
+    print(f"  {'':<10} {'full KB':>9} {'compact KB':>11} {'saved':>7}")
+    for label, f, c in (("raw", full_raw, compact_raw), ("gzip -9", full_gz, compact_gz)):
+        print(f"  {label:<10} {f / 1024:>9.1f} {c / 1024:>11.1f} {1 - c / f:>7.0%}")
+    print(f"\n  per file: median {statistics.median(ratios):.0%} of full size, "
+          f"worst {max(ratios):.0%}")
+
+
+if __name__ == "__main__":
+    main()
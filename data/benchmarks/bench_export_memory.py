@@ -0,0 +1,60 @@
+"""
+Peak memory of the streaming export engine as the corpus grows.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_export_memory                  # 500, 2000, 6000 articles
+    python -m benchmarks.bench_export_memory -n 1000 -n 10000
+
+Each run exports both layouts (web + per-date) in one pass into a temporary
+directory and reports the wall time, plus the tracemalloc peak of Python
+allocations from a second, traced run. The synthetic corpus spreads articles
+over a year, so larger runs also mean larger day files; a flat peak shows
+neither a day nor the index is buffered in memory.
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from crawler.export.engine import run_export
+from crawler.export.layouts import DailyLayout, WebLayout
+
+from .synth import build_corpus_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, action="append",
+                        help="Corpus size; repeat for several (default: 500, 2000, 6000)")
+    args = parser.parse_args()
+    sizes = args.articles or [500, 2000, 6000]
+
+    print(f"  {'articles':>8} {'export s':>9} {'peak MB':>8} {'output MB':>10}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            db_path = root / "bench.db"
+            with contextlib.redirect_stdout(io.StringIO()):  # migration / export log
+                build_corpus_db(db_path, n)
+
+                t0 = time.perf_counter()
+                run_export(db_path, [WebLayout(root / "web"), DailyLayout(root / "daily")])
+                elapsed = time.perf_counter() - t0
+
+                # Second run, traced: tracemalloc slows allocation-heavy code
+                tracemalloc.start()
+                run_export(db_path, [WebLayout(root / "web2"), DailyLayout(root / "daily2")])
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            out_bytes = sum(
+                p.stat().st_size for d in ("web", "daily") for p in (root / d).rglob("*") if p.is_file()
+            )
+        print(f"  {n:>8} {elapsed:>9.2f} {peak / 2**20:>8.1f} {out_bytes / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
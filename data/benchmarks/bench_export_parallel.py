@@ -0,0 +1,76 @@
+"""
+Web export: sequential vs. a pool of worker processes / threads.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_export_parallel                   # 3000 articles, 2 and 4 workers
+    python -m benchmarks.bench_export_parallel -n 10000 -w 2 -w 8
+    python -m benchmarks.bench_export_parallel --compress gz
+    python -m benchmarks.bench_export_parallel --days 20            # one month: chunked jobs
+
+Every mode exports the same synthetic corpus from scratch into its own
+directory; the output trees are then compared file by file with the
+sequential one, so a mode that is fast but not byte-identical fails.
+Speedups are bounded by the number of CPU cores.
+"""
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from crawler.export.engine import run_export
+from crawler.export.layouts import WebLayout
+
+from .synth import build_corpus_db
+
+
+def _same_tree(a: Path, b: Path) -> bool:
+    files_a = sorted(p.relative_to(a) for p in a.rglob("*") if p.is_file())
+    files_b = sorted(p.relative_to(b) for p in b.rglob("*") if p.is_file())
+    if files_a != files_b:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(a, b, [str(p) for p in files_a], shallow=False)
+    return not mismatch and not errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, default=3000)
+    parser.add_argument("-w", "--workers", type=int, action="append",
+                        help="Pool size; repeat for several (default: 2, 4)")
+    parser.add_argument("--compress", default="", metavar="gz,br")
+    parser.add_argument("--days", type=int, default=365,
+                        help="Spread the articles over this many days of crawl dates")
+    args = parser.parse_args()
+    pools = args.workers or [2, 4]
+    compress = tuple(f.strip() for f in args.compress.split(",") if f.strip())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        db_path = root / "bench.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_corpus_db(db_path, args.articles, days=args.days)
+
+        modes = [("sequential", 1, False)]
+        modes += [(f"{w} processes", w, False) for w in pools]
+        modes += [(f"{w} threads", w, True) for w in pools]
+
+        print(f"{args.articles} articles over {args.days} days, {os.cpu_count()} CPUs\n")
+        print(f"  {'mode':<14} {'export s':>9} {'speedup':>8}  identical")
+        base_time = None
+        for i, (label, workers, threads) in enumerate(modes):
+            out = root / f"out{i}"
+            with contextlib.redirect_stdout(io.StringIO()):
+                t0 = time.perf_counter()
+                run_export(db_path, [WebLayout(out, compress=compress)], workers=workers, threads=threads)
+                elapsed = time.perf_counter() - t0
+            base_time = base_time or elapsed
+            same = "—" if i == 0 else ("yes" if _same_tree(root / "out0", out) else "NO")
+            print(f"  {label:<14} {elapsed:>9.2f} {base_time / elapsed:>7.2f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
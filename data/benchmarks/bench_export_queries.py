@@ -0,0 +1,101 @@
+"""
+Export read path: N+1 per-article / per-paragraph queries vs. set-based reads.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_export_queries                 # 250, 1000, 4000 articles
+    python -m benchmarks.bench_export_queries -n 500 -n 8000
+
+For each corpus size both strategies assemble every article with its
+paragraphs, sentences and glossary — the part of an export that touches the
+database — and the script reports wall time and the number of SQL statements run. The
+two results are compared so a speed-up can never come from reading less.
+
+SQLite runs in-process, so each of the N+1 queries is cheap and much of the
+remaining time is row → dict conversion; the statement count is the figure
+that grows with the corpus.
+"""
+import argparse
+import contextlib
+import io
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from crawler.export.queries import iter_articles
+
+from .synth import build_corpus_db
+
+
+# ── Baseline: the original N+1 pattern ────────────────────────────────────────
+
+def _legacy_articles(conn: sqlite3.Connection) -> list[dict]:
+    articles = []
+    for row in conn.execute("SELECT * FROM articles ORDER BY crawled_at DESC").fetchall():
+        article = dict(row)
+        paragraphs = []
+        for para in conn.execute(
+            "SELECT * FROM paragraphs WHERE article_id = ? ORDER BY seq", (row["id"],)
+        ).fetchall():
+            para_dict = dict(para)
+            para_dict.pop("derived", None)  # normalized storage flags (not normalized here)
+            para_dict["sentences"] = [dict(s) for s in conn.execute(
+                "SELECT * FROM sentences WHERE paragraph_id = ? ORDER BY seq", (para["id"],)
+            ).fetchall()]
+            paragraphs.append(para_dict)
+        article["paragraphs"] = paragraphs
+        article["glossary"] = dict(conn.execute(
+            "SELECT term, cn FROM glossary WHERE article_id = ? ORDER BY term", (row["id"],)
+        ).fetchall())
+        articles.append(article)
+    return articles
+
+
+def _set_based_articles(conn: sqlite3.Connection) -> list[dict]:
+    return list(iter_articles(conn))
+
+
+def _run(conn: sqlite3.Connection, fn) -> tuple[float, int, list[dict]]:
+    statements = 0
+
+    def count(_sql: str) -> None:
+        nonlocal statements
+        statements += 1
+
+    conn.set_trace_callback(count)
+    t0 = time.perf_counter()
+    result = fn(conn)
+    elapsed = time.perf_counter() - t0
+    conn.set_trace_callback(None)
+    return elapsed, statements, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, action="append",
+                        help="Corpus size; repeat for several (default: 250, 1000, 4000)")
+    args = parser.parse_args()
+    sizes = args.articles or [250, 1000, 4000]
+
+    print(f"  {'articles':>8} {'N+1 s':>8} {'queries':>8} {'set s':>8} {'queries':>8} {'speedup':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "bench.db"
+            with contextlib.redirect_stdout(io.StringIO()):  # migration log
+                build_corpus_db(db_path, n)
+            conn = sqlite3.connect(str(db_path))
+            conn.row_factory = sqlite3.Row
+
+            legacy_s, legacy_q, legacy = _run(conn, _legacy_articles)
+            set_s, set_q, current = _run(conn, _set_based_articles)
+            conn.close()
+
+        by_id = {a["id"]: a for a in legacy}
+        if len(current) != len(legacy) or any(a != by_id[a["id"]] for a in current):
+            raise SystemExit(f"  results differ at {n} articles")
+        print(f"  {n:>8} {legacy_s:>8.2f} {legacy_q:>8} {set_s:>8.2f} {set_q:>8} "
+              f"{legacy_s / set_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
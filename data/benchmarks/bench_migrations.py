@@ -0,0 +1,71 @@
+"""
+Time each schema migration on a large pre-versioning (v1) database.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_migrations             # 5,000 articles
+    python -m benchmarks.bench_migrations -n 20000
+
+A synthetic corpus is built at the latest schema, copied into a fresh v1
+database (the layout every articles.db had before migrations existed), and
+migrated back up step by step.
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from crawler.migrations import migrate
+
+from .synth import build_corpus_db
+
+_V1_COPY = (
+    """INSERT INTO articles SELECT id, source, url, title, title_cn, author,
+           published_at, category, difficulty, image_url, crawled_at FROM src.articles""",
+    "INSERT INTO paragraphs SELECT id, article_id, seq, en_text, cn_text FROM src.paragraphs",
+    """INSERT INTO sentences SELECT id, paragraph_id, seq, en_text, cn_text,
+           is_complex, analysis FROM src.sentences""",
+)
+
+
+def make_v1_db(src: Path, dst: Path) -> None:
+    conn = sqlite3.connect(str(dst), isolation_level=None)
+    migrate(conn, target=1)
+    conn.execute("ATTACH DATABASE ? AS src", (str(src),))
+    conn.execute("BEGIN")
+    for stmt in _V1_COPY:
+        conn.execute(stmt)
+    conn.execute("COMMIT")
+    conn.execute("DETACH DATABASE src")
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "corpus.db"
+        dst = Path(tmp) / "v1.db"
+        print(f"Building {args.articles} synthetic articles...")
+        build_corpus_db(src, args.articles)
+        make_v1_db(src, dst)
+
+        conn = sqlite3.connect(str(dst), isolation_level=None)
+        n_sent = conn.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+        size_mb = dst.stat().st_size / 1e6
+        print(f"v1 database: {args.articles} articles, {n_sent} sentences, {size_mb:.1f} MB\n")
+
+        t0 = time.perf_counter()
+        timings = migrate(conn)
+        total = time.perf_counter() - t0
+        conn.close()
+
+    for version, description, seconds in timings:
+        print(f"  v{version}  {seconds:>7.2f}s  {description}")
+    print(f"  total {total:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Normalized storage: articles.db size and web export time, before and after.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_normalize              # 2000 articles
+    python -m benchmarks.bench_normalize -n 10000 --repeat 3
+
+Builds a synthetic corpus in the plain layout and VACUUMs it, exports the
+web layout, converts the database with ArticleDB.normalize() (derived
+paragraph text, compressed analysis, VACUUM) and exports again. Sizes are
+per table (dbstat); export time is the best of --repeat runs into a fresh
+directory. The two export trees must be byte-identical.
+"""
+import argparse
+import contextlib
+import io
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from crawler.db import ArticleDB
+from crawler.export.engine import run_export
+from crawler.export.layouts import WebLayout
+from crawler.normalize import table_sizes
+
+from .bench_export_parallel import _same_tree
+from .synth import build_corpus_db
+
+
+def _sizes(db_path: Path) -> tuple[int, dict[str, int]]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return db_path.stat().st_size, table_sizes(conn)
+    finally:
+        conn.close()
+
+
+def _export(db_path: Path, out: Path, repeat: int) -> float:
+    best = float("inf")
+    for i in range(repeat):
+        target = out if i == 0 else out.with_name(f"{out.name}-{i}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            run_export(db_path, [WebLayout(target)])
+            best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=2, help="Export runs per layout (best is kept)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        db_path = root / "bench.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_corpus_db(db_path, args.articles)
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+
+        plain_size, plain_tables = _sizes(db_path)
+        plain_time = _export(db_path, root / "plain", args.repeat)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ArticleDB(db_path) as db:
+                stats = db.normalize()
+        norm_size, norm_tables = _sizes(db_path)
+        norm_time = _export(db_path, root / "normalized", args.repeat)
+
+        print(f"{args.articles} articles: {stats.en_paragraphs} en / {stats.cn_paragraphs} cn "
+              f"paragraph texts derived, {stats.analyses} analyses compressed "
+              f"in {stats.seconds:.2f}s\n")
+        print(f"  {'table':<24} {'plain MB':>9} {'normalized MB':>14}")
+        for table in list(plain_tables)[:6]:
+            print(f"  {table:<24} {plain_tables[table] / 1e6:>9.2f} "
+                  f"{norm_tables.get(table, 0) / 1e6:>14.2f}")
+        print(f"  {'file':<24} {plain_size / 1e6:>9.2f} {norm_size / 1e6:>14.2f}"
+              f"  ({1 - norm_size / plain_size:.0%} smaller)\n")
+        same = "yes" if _same_tree(root / "plain", root / "normalized") else "NO"
+        print(f"  web export s            {plain_time:>9.2f} {norm_time:>14.2f}"
+              f"  ({plain_time / norm_time:.2f}x)  identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+"""
+End-to-end crawl: articles per minute, per-stage latency and peak memory.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_pipeline                      # 5 articles per source
+    python -m benchmarks.bench_pipeline --articles 20 --delay 0.2 --label "after batching"
+    python -m benchmarks.bench_pipeline --record ../bench-fixtures   # snapshot the live feeds
+    python -m benchmarks.bench_pipeline --fixtures ../bench-fixtures
+    python -m benchmarks.bench_pipeline --history
+
+Runs crawler.main.run() over all four sources against a temporary DB with
+nothing leaving the machine. An in-process HTTP server plays every
+publisher: it serves RSS feeds, article pages and images from a fixture
+directory laid out as host/path — recorded from the live sites with
+--record, or by default generated from segmentation_corpus.txt in each
+publisher's page structure — and rewrites every absolute URL it serves to
+point back at itself. The stub translator answers each request after
+--delay seconds, like a remote API, and complex sentences are analyzed as
+with DeepSeek. Crawl delays are off unless --polite.
+
+Each run is appended to benchmarks/results/pipeline.jsonl (commit,
+parameters, articles per minute, stage percentiles, peak memory) and
+compared with the previous run of the same parameters; --history lists
+the saved runs.
+"""
+import argparse
+import contextlib
+import html
+import io
+import json
+import mimetypes
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from crawler import config
+from crawler.main import run
+from crawler.sources import get_sources, source_names
+from crawler.translator import StubTranslator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+CORPUS = Path(__file__).resolve().parent / "segmentation_corpus.txt"
+RESULTS = Path(__file__).resolve().parent / "results" / "pipeline.jsonl"
+STAGES = ("discover", "fetch", "translate", "save", "metrics", "word_index", "glossary", "thumbnails")
+
+# Real article pages are a few hundred KB, mostly inline scripts and state
+_PAGE_SCRIPT_WORDS = 6000
+
+# Absolute URLs to point at the local server; XML namespace URIs are left alone
+_ABSOLUTE_URL = re.compile(rb"""(xmlns(?::[\w.-]+)?\s*=\s*["'])?https?://""")
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+def fixture_path(root: Path, url: str) -> Path:
+    """Where the response for `url` lives under fixture directory `root`."""
+    parts = urlsplit(url)
+    path = unquote(parts.path) or "/"
+    if path.endswith("/"):
+        path += "index.html"
+    return root / parts.netloc / path.lstrip("/")
+
+
+def _load_sentences() -> list[str]:
+    lines = CORPUS.read_text(encoding="utf-8").splitlines()
+    return [line.strip().removesuffix("\\n") for line in lines if line.strip() and not line.startswith("#")]
+
+
+def _paragraphs(rng: random.Random, sentences: list[str], n: int) -> list[str]:
+    """`n` paragraphs of 3-5 corpus sentences; about a quarter get a long, complex one."""
+    out = []
+    for _ in range(n):
+        para = rng.sample(sentences, rng.randint(3, 5))
+        if rng.random() < 0.25:
+            a, b, c = rng.sample(sentences, 3)
+            para[0] = f"{a[:-1]}, although {b[0].lower()}{b[1:-1]}, which {c[0].lower()}{c[1:]}"
+        out.append(" ".join(para))
+    return out
+
+
+def _page(title: str, body: str, rng: random.Random, site: str) -> str:
+    script = json.dumps({"config": [f"{rng.getrandbits(32):08x}" for _ in range(_PAGE_SCRIPT_WORDS)]})
+    links = "".join(f'<li><a href="https://{site}/section/{i}">Section {i}</a></li>' for i in range(30))
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+        f"<script>window.__STATE__ = {script};</script></head><body>"
+        f"<header><nav><ul>{links}</ul></nav></header><main>{body}</main>"
+        "<aside><p>Most viewed: the stories our readers have been following most closely this week.</p>"
+        "<p>Sign up for the morning briefing and get the day's most important news in your inbox.</p></aside>"
+        f"<footer><p>© 2026 {site}. All rights reserved. Registered in England and Wales.</p></footer>"
+        "</body></html>"
+    )
+
+
+def _figure(image: str) -> str:
+    return (f'<figure><img src="{image}" alt=""><figcaption>Photograph: a picture agency '
+            f"photographer captured the scene earlier this week.</figcaption></figure>")
+
+
+def _guardian(i: int, paras: list[str], image: str) -> tuple[str, str]:
+    section = ("world", "science", "technology")[i % 3]
+    url = f"https://www.theguardian.com/{section}/2026/oct/19/story-{i}"
+    ps = "".join(f"<p>{html.escape(p)}</p>" for p in paras)
+    body = (f'<article><div data-gu-name="body"><div class="article-body-commercial-selector">'
+            f'{_figure(image)}{ps}<div class="submeta"><p>Topics: world news, science, '
+            f"technology and more from the Guardian newsroom.</p></div></div></div></article>")
+    return url, body
+
+
+def _bbc(i: int, paras: list[str], image: str) -> tuple[str, str]:
+    url = f"https://www.bbc.co.uk/news/articles/c{i:09d}o"
+    blocks = "".join(f'<div data-component="text-block"><p>{html.escape(p)}</p></div>' for p in paras)
+    body = (f'<article><div data-component="image-block">{_figure(image)}</div>{blocks}'
+            '<div data-component="links-block"><p>Related: more stories from across the BBC '
+            "News website and the BBC World Service.</p></div></article>")
+    return url, body
+
+
+def _voa(i: int, paras: list[str], image: str) -> tuple[str, str]:
+    url = f"https://learningenglish.voanews.com/a/story-{i}/{7800000 + i}.html"
+    ps = "".join(f"<p>{html.escape(p)}</p>" for p in paras)
+    body = (f'<div class="media-block">{_figure(image)}</div><div class="wsw">{ps}</div>'
+            '<div class="social-share"><p>Share this story with your classmates and friends on '
+            "social media today.</p></div>")
+    return url, body
+
+
+def _conversation(i: int, paras: list[str], image: str) -> tuple[str, str]:
+    url = f"https://theconversation.com/story-{i}-{200000 + i}"
+    ps = "".join(f"<p>{html.escape(p)}</p>" for p in paras)
+    body = (f'<article><div class="content-body content" itemprop="articleBody">{_figure(image)}{ps}'
+            '</div><div class="republish-info"><p>This article is republished from The Conversation '
+            "under a Creative Commons license.</p></div></article>")
+    return url, body
+
+
+_PUBLISHERS = {
+    "guardian": (_guardian, "https://i.guim.co.uk/img/media/{digest}/master/1200.jpg"),
+    "bbc": (_bbc, "https://ichef.bbci.co.uk/news/1024/cpsprodpb/{digest}.jpg"),
+    "voa": (_voa, "https://gdb.voanews.com/{digest}_w1200.jpg"),
+    "conversation": (_conversation, "https://images.theconversation.com/files/{digest}/original.jpg"),
+}
+
+
+def _rss(source, items: list[dict]) -> str:
+    out = []
+    for item in items:
+        media = (f'<media:thumbnail url="{item["image"]}" width="1024"/>' if source == "bbc"
+                 else f'<media:content url="{item["image"]}" width="1200" medium="image"/>')
+        out.append(
+            f"<item><title>{html.escape(item['title'])}</title><link>{item['url']}</link>"
+            f"<description>{html.escape(item['summary'])}</description>"
+            f"<pubDate>{format_datetime(item['published'])}</pubDate>"
+            f"<dc:creator>{item['author']}</dc:creator><category>{item['category']}</category>"
+            f"{media}</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" '
+        'xmlns:media="http://search.yahoo.com/mrss/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f"<channel><title>{source}</title><link>https://example.org/</link>"
+        f"<description>Latest stories</description>{''.join(out)}</channel></rss>"
+    )
+
+
+def _atom(items: list[dict]) -> str:
+    out = []
+    for item in items:
+        published = item["published"].isoformat()
+        out.append(
+            f"<entry><id>{item['url']}</id><published>{published}</published><updated>{published}</updated>"
+            f'<link rel="alternate" type="text/html" href="{item["url"]}"/>'
+            f"<title>{html.escape(item['title'])}</title>"
+            f'<summary type="html">{html.escape(item["summary"])}</summary>'
+            f"<author><name>{item['author']}</name></author>"
+            f'<category term="{item["category"]}"/><media:content url="{item["image"]}" medium="image"/></entry>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:media="http://search.yahoo.com/mrss/"><title>The Conversation</title>'
+        f"<updated>2026-10-19T00:00:00Z</updated>{''.join(out)}</feed>"
+    )
+
+
+def _write_image(path: Path, rng: random.Random) -> None:
+    from PIL import Image
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    size = (1200, 800)
+    bands = [Image.linear_gradient("L").resize(size) for _ in range(2)]
+    bands.append(Image.effect_noise(size, rng.randint(20, 60)))
+    Image.merge("RGB", bands).save(path, "JPEG", quality=85)
+
+
+def write_fixtures(root: Path, per_source: int, paragraphs: int, seed: int = 42) -> int:
+    """
+    Generate feeds and pages for `per_source` articles of every source under
+    `root`, plus their images if Pillow is installed. Returns files written.
+    """
+    try:
+        import PIL  # noqa: F401 — thumbnails are skipped without it anyway
+        images = True
+    except ImportError:
+        images = False
+    rng = random.Random(seed)
+    sentences = _load_sentences()
+    start = datetime(2026, 10, 19, 8, tzinfo=timezone.utc)
+    files = 0
+    for source in get_sources():
+        make_page, image_url = _PUBLISHERS[source.name]
+        feeds: dict[str, list[dict]] = {url: [] for url in source.rss_urls}
+        for i in range(per_source):
+            digest = f"{rng.getrandbits(64):016x}"
+            paras = _paragraphs(rng, sentences, paragraphs)
+            image = image_url.format(digest=digest)
+            url, body = make_page(i, paras, image)
+            title = " ".join(rng.choice(sentences).rstrip(".").split()[:10])
+            page = fixture_path(root, url)
+            page.parent.mkdir(parents=True, exist_ok=True)
+            page.write_text(_page(title, body, rng, urlsplit(url).netloc), encoding="utf-8")
+            files += 1
+            if images:
+                _write_image(fixture_path(root, image), rng)
+                files += 1
+            feed = source.rss_urls[i % len(source.rss_urls)]
+            feeds[feed].append({
+                "url": url, "title": title, "summary": paras[0], "image": image,
+                "author": "Staff reporter", "category": "Science and technology",
+                "published": start - timedelta(hours=i),
+            })
+        if source.name == "bbc":  # live pages are dropped before any fetch
+            feeds[source.rss_urls[0]].append({**feeds[source.rss_urls[0]][0],
+                                             "url": "https://www.bbc.co.uk/news/live/c000000000t"})
+        for feed, items in feeds.items():
+            path = fixture_path(root, feed)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            text = _atom(items) if source.name == "conversation" else _rss(source.name, items)
+            path.write_text(text, encoding="utf-8")
+            files += 1
+    return files
+
+
+def record(root: Path, names: list[str] | None, per_source: int) -> None:
+    """Save the live feeds of `names`, and the first `per_source` pages and images of each."""
+    import requests
+
+    session = requests.Session()
+    session.headers.update(config.HEADERS)
+
+    def save(url: str) -> Path:
+        resp = session.get(url, proxies=config.PROXIES or None, timeout=20)
+        resp.raise_for_status()
+        path = fixture_path(root, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(resp.content)
+        time.sleep(config.CRAWL_DELAY_SECONDS)
+        return path
+
+    for source in get_sources(names):
+        feeds = []
+        for url in source.rss_urls:
+            try:
+                feeds.append(str(save(url)))
+            except requests.RequestException as exc:
+                print(f"    {url[:80]}: {exc}")
+        source.rss_urls = feeds  # discover() reads the saved copies
+        try:
+            metas = source.discover(limit=per_source)
+        finally:
+            del source.rss_urls
+        saved = 0
+        for meta in metas:
+            for url in filter(None, (meta["url"], meta.get("image_url"))):
+                try:
+                    save(url)
+                    saved += 1
+                except requests.RequestException as exc:
+                    print(f"    {url[:80]}: {exc}")
+        print(f"  {source.name:<13} {len(feeds)} feed(s), {saved} page(s) and image(s)")
+
+
+# ── Local publisher ───────────────────────────────────────────────────────────
+
+class _FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(root: Path) -> _FixtureServer:
+    """Serve `root` at http://127.0.0.1:<port>/<host>/<path> on a free port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 — http.server API
+            path = fixture_path(root, "https:/" + self.path.split("?", 1)[0])
+            if root.resolve() not in path.resolve().parents or not path.is_file():
+                self.send_error(404)
+                return
+            body = path.read_bytes()
+            kind = mimetypes.guess_type(path.name)[0]
+            if kind is None:
+                head = body[:200].lstrip()
+                kind = "application/xml" if head.startswith((b"<?xml", b"<rss", b"<feed")) else "text/html"
+            if kind.startswith(("text/", "application/")):
+                body = _ABSOLUTE_URL.sub(lambda m: m[0] if m[1] else base, body)
+            self.send_response(200)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = _FixtureServer(("127.0.0.1", 0), Handler)
+    base = f"http://127.0.0.1:{server.server_address[1]}/".encode()
+    return server
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def _commit() -> str:
+    try:
+        head = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=DATA_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               cwd=DATA_DIR, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return head + ("+dirty" if dirty else "")
+
+
+def crawl(fixtures: Path, args: argparse.Namespace) -> dict:
+    """One run of the crawler against `fixtures`; the result record."""
+    server = make_server(fixtures)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+    sources = get_sources()
+    saved_config = config.CRAWL_DELAY_SECONDS, config.PROXIES
+    saved_env = {k: os.environ.get(k) for k in ("NO_PROXY", "no_proxy")}
+    translator = StubTranslator(args.delay)
+    log = io.StringIO()
+    try:
+        for source in sources:
+            source.rss_urls = [re.sub(r"^https?://", base, url) for url in type(source).rss_urls]
+        if not args.polite:
+            config.CRAWL_DELAY_SECONDS = 0.0
+        config.PROXIES = {}
+        os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+        baseline_rss = _peak_rss_mb()
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(
+            sys.stdout if args.verbose else log
+        ):
+            if args.trace_memory:
+                tracemalloc.start()
+            t0 = time.perf_counter()
+            timer = run(
+                limit=args.articles,
+                db_path=Path(tmp) / "bench.db",
+                translator=translator,
+                analyze=not args.no_analyze,
+                thumbnail_dir=Path(tmp) / "thumbs",
+            )
+            wall = time.perf_counter() - t0
+            traced = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+            tracemalloc.stop()
+    finally:
+        for source in sources:
+            source.__dict__.pop("rss_urls", None)
+        config.CRAWL_DELAY_SECONDS, config.PROXIES = saved_config
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        server.shutdown()
+        server.server_close()
+
+    saved = len(timer.samples.get("save", ()))
+    expected = args.articles * len(sources)
+    if saved < expected and not args.verbose:
+        print(f"  Only {saved} of {expected} articles saved; end of the crawl log:")
+        print("\n".join("    " + line for line in log.getvalue().splitlines()[-15:]))
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "label": args.label,
+        "params": {
+            "fixtures": str(args.fixtures) if args.fixtures else "generated",
+            "articles": args.articles,
+            "paragraphs": args.paragraphs,
+            "delay": args.delay,
+            "analyze": not args.no_analyze,
+            "polite": args.polite,
+        },
+        "articles": saved,
+        "wall_s": round(wall, 2),
+        "articles_per_min": round(saved / wall * 60, 1) if wall else 0.0,
+        "translator_calls": translator.calls,
+        "peak_rss_mb": _peak_rss_mb(),
+        "baseline_rss_mb": baseline_rss,
+        "traced_peak_mb": round(traced / 2**20, 1) if traced is not None else None,
+        "stages": timer.summary(),
+    }
+
+
+def _history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _report(result: dict, previous: dict | None) -> None:
+    memory = f"peak RSS {result['peak_rss_mb']} MB" if result["peak_rss_mb"] is not None else ""
+    if result["traced_peak_mb"] is not None:
+        memory += f"{', ' if memory else ''}Python allocations peak {result['traced_peak_mb']} MB"
+    print(f"\n  {result['articles']} articles in {result['wall_s']:.1f}s: "
+          f"{result['articles_per_min']:.1f} articles/min, {result['translator_calls']} translator "
+          f"calls{', ' + memory if memory else ''}\n")
+    print(f"  {'stage':<11} {'samples':>7} {'total s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8}")
+    for stage in STAGES:
+        s = result["stages"].get(stage)
+        if s:
+            print(f"  {stage:<11} {s['samples']:>7} {s['total_s']:>8.2f} {s['p50']:>8.1f} "
+                  f"{s['p95']:>8.1f} {s['p99']:>8.1f} {s['max']:>8.1f}")
+    if previous:
+        change = result["articles_per_min"] / previous["articles_per_min"] - 1 if previous["articles_per_min"] else 0
+        print(f"\n  vs previous run ({previous['timestamp'][:16]}, {previous['commit'] or '?'}"
+              f"{', ' + previous['label'] if previous['label'] else ''}): "
+              f"{previous['articles_per_min']:.1f} articles/min ({change:+.0%})")
+
+
+def _print_history(runs: list[dict]) -> None:
+    print(f"  {'date':<16} {'commit':<14} {'art/min':>8} {'translate p50':>14} "
+          f"{'peak MB':>8}  label / parameters")
+    for r in runs:
+        translate = r["stages"].get("translate", {}).get("p50")
+        params = ", ".join(f"{k}={v}" for k, v in r["params"].items())
+        print(f"  {r['timestamp'][:16]:<16} {r['commit'] or '?':<14} {r['articles_per_min']:>8.1f} "
+              f"{translate if translate is not None else '-':>14} {r['peak_rss_mb'] or '-':>8}  "
+              f"{r['label'] or params}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=config.ARTICLES_PER_SOURCE,
+                        help=f"Articles per source (default: {config.ARTICLES_PER_SOURCE})")
+    parser.add_argument("--paragraphs", type=int, default=16,
+                        help="Paragraphs per generated article (default: 16)")
+    parser.add_argument("--delay", type=float, default=0.05,
+                        help="Stub translator latency per request, seconds (default: 0.05)")
+    parser.add_argument("--no-analyze", action="store_true", help="Skip complex-sentence analysis")
+    parser.add_argument("--polite", action="store_true", help="Keep config.CRAWL_DELAY_SECONDS pauses")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also report the tracemalloc peak (slows the run)")
+    parser.add_argument("--fixtures", type=Path, help="Recorded fixture directory (default: generated)")
+    parser.add_argument("--record", type=Path, metavar="DIR",
+                        help="Save the live feeds and --articles pages per source to DIR, then exit")
+    parser.add_argument("--sources", type=lambda v: v.split(","), help="Sources to --record")
+    parser.add_argument("--label", default="", help="Note stored with the result")
+    parser.add_argument("--results", type=Path, default=RESULTS, help=f"Result log (default: {RESULTS})")
+    parser.add_argument("--no-save", action="store_true", help="Do not append the result")
+    parser.add_argument("--history", action="store_true", help="List saved runs and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the crawl log")
+    args = parser.parse_args()
+
+    if args.history:
+        _print_history(_history(args.results))
+        return
+    if args.record:
+        record(args.record, args.sources or source_names(), args.articles)
+        return
+
+    if args.fixtures:
+        result = crawl(args.fixtures, args)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            files = write_fixtures(Path(tmp), args.articles, args.paragraphs)
+            print(f"  Generated {files} fixture files for {args.articles} article(s) per source")
+            result = crawl(Path(tmp), args)
+
+    previous = next((r for r in reversed(_history(args.results)) if r["params"] == result["params"]), None)
+    _report(result, previous)
+    if not args.no_save:
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        with args.results.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        print(f"\n  Saved to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Sentence search latency: FTS5 index vs. full-table LIKE scans.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_search               # 5,000 articles
+    python -m benchmarks.bench_search -n 20000
+
+Runs the same queries through crawler.search.search() with and without the
+full-text tables and reports the median latency of each. The synthetic
+Chinese text is cut from one short string, so every cn query matches a large
+share of sentences: treat those rows as a worst case for BM25 ranking.
+"""
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from crawler.search import search
+
+from .synth import build_corpus_db
+
+QUERIES = [
+    ("en", "geomorphic"),
+    ("en", "cryothermous"),
+    ("en", "researchers found evidence"),
+    ("cn", "气候科学家"),
+    ("cn", "经济增长可能放缓"),
+]
+
+
+def _median_ms(conn: sqlite3.Connection, lang: str, query: str, repeat: int) -> tuple[float, int]:
+    samples = []
+    hits = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        hits = search(conn, query, lang=lang, limit=20)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), len(hits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--articles", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fts_db = Path(tmp) / "fts.db"
+        print(f"Building {args.articles} synthetic articles...")
+        build_corpus_db(fts_db, args.articles)
+
+        fts = sqlite3.connect(str(fts_db))
+        n_sent = fts.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+
+        # Same data, no full-text tables → search() falls back to LIKE
+        scan = sqlite3.connect(":memory:")
+        fts.backup(scan)
+        for name in ("sentences_fts", "sentences_fts_cn"):
+            scan.execute(f"DROP TABLE {name}")
+
+        print(f"{n_sent} sentences\n")
+        print(f"  {'query':<28} {'LIKE ms':>9} {'FTS5 ms':>9} {'hits':>5}")
+        for lang, query in QUERIES:
+            like_ms, _ = _median_ms(scan, lang, query, args.repeat)
+            fts_ms, n_hits = _median_ms(fts, lang, query, args.repeat)
+            print(f"  {lang}:{query:<25} {like_ms:>9.1f} {fts_ms:>9.2f} {n_hits:>5}")
+        fts.close()
+        scan.close()
+
+
+if __name__ == "__main__":
+    main()
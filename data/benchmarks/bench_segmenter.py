@@ -0,0 +1,150 @@
+"""
+Sentence segmentation: accuracy on a labeled corpus, and throughput.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_segmenter
+    python -m benchmarks.bench_segmenter --repeat 500 --show-errors
+
+Compares the original split_sentences() (one re.split per paragraph plus an
+abbreviation check on a growing buffer, reproduced below) with
+crawler.segmenter.segment_article(), which segments a whole article into
+offsets in one call.
+
+Accuracy is measured on segmentation_corpus.txt (one sentence per line,
+blank line between paragraphs, a trailing \\n for a line break instead of a
+space after the sentence): boundary precision / recall and the share of
+paragraphs split exactly right. Throughput segments the corpus paragraphs,
+grouped into articles of 12 paragraphs, --repeat times.
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+
+from crawler.segmenter import segment_article
+
+CORPUS = Path(__file__).resolve().parent / "segmentation_corpus.txt"
+LINE_BREAK = "\\n"  # corpus line suffix: the sentence is followed by a line break
+PARAS_PER_ARTICLE = 12
+
+# ── The original implementation (crawler/analyzer.py before the segmenter) ────
+
+_LEGACY_ABBREVS = {
+    "Mr", "Mrs", "Ms", "Dr", "Prof", "Sr", "Jr", "vs", "etc", "e.g",
+    "i.e", "fig", "Jan", "Feb", "Mar", "Apr", "Jun", "Jul", "Aug",
+    "Sep", "Oct", "Nov", "Dec", "U.S", "U.K", "St",
+}
+_LEGACY_ABBREV_PAT = re.compile(
+    r"\b(" + "|".join(re.escape(a) for a in _LEGACY_ABBREVS) + r")\.$",
+    re.IGNORECASE,
+)
+
+
+def legacy_split(text: str) -> list[str]:
+    parts = re.split(r'(?<=[.!?])\s+(?=[A-Z"“])', text)
+    sentences: list[str] = []
+    buf = ""
+    for part in parts:
+        candidate = buf + " " + part if buf else part
+        if buf and _LEGACY_ABBREV_PAT.search(buf.rstrip()):
+            buf = candidate
+            continue
+        if buf:
+            sentences.append(buf.strip())
+        buf = part
+    if buf:
+        sentences.append(buf.strip())
+    return [s for s in sentences if s]
+
+
+def new_split_article(paragraphs: list[str]) -> list[list[str]]:
+    return [[p[s:e] for s, e in spans] for p, spans in zip(paragraphs, segment_article(paragraphs))]
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+def load_corpus(path: Path = CORPUS) -> list[tuple[str, list[str]]]:
+    """Paragraphs as (text, gold sentences)."""
+    paragraphs, current, text = [], [], ""
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("#"):
+            continue
+        line = line.strip()
+        if line:
+            sentence = line.removesuffix(LINE_BREAK)
+            current.append(sentence)
+            text += sentence + ("\n" if line.endswith(LINE_BREAK) else " ")
+        elif current:
+            paragraphs.append((text.rstrip(), current))
+            current, text = [], ""
+    if current:
+        paragraphs.append((text.rstrip(), current))
+    return paragraphs
+
+
+def _boundaries(sentences: list[str]) -> set[int]:
+    """Character offsets (in the joined paragraph) where sentences 2..n start."""
+    out, pos = set(), 0
+    for s in sentences[:-1]:
+        pos += len(s) + 1
+        out.add(pos)
+    return out
+
+
+def score(gold: list[list[str]], predicted: list[list[str]]) -> tuple[float, float, float, list]:
+    tp = fp = fn = exact = 0
+    errors = []
+    for g, p in zip(gold, predicted):
+        gb, pb = _boundaries(g), _boundaries(p)
+        tp += len(gb & pb)
+        fp += len(pb - gb)
+        fn += len(gb - pb)
+        if g == p:
+            exact += 1
+        else:
+            errors.append((g, p))
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall, exact / len(gold), errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Corpus passes for throughput")
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    texts = [text for text, _ in corpus]
+    gold = [sentences for _, sentences in corpus]
+    results = {
+        "legacy": [legacy_split(t) for t in texts],
+        "segmenter": new_split_article(texts),
+    }
+    n_sent = sum(len(p) for p in gold)
+    print(f"{len(gold)} labeled paragraphs, {n_sent} sentences\n")
+    print(f"  {'':<10} {'precision':>9} {'recall':>7} {'exact':>6}  {'sent/s':>9}")
+
+    articles = [texts[i:i + PARAS_PER_ARTICLE] for i in range(0, len(texts), PARAS_PER_ARTICLE)]
+    for name, predicted in results.items():
+        precision, recall, exact, errors = score(gold, predicted)
+
+        t0 = time.perf_counter()
+        n = 0
+        for _ in range(args.repeat):
+            for article in articles:
+                if name == "legacy":
+                    for t in article:
+                        n += len(legacy_split(t))
+                else:
+                    n += sum(len(spans) for spans in segment_article(article))
+        rate = n / (time.perf_counter() - t0)
+
+        print(f"  {name:<10} {precision:>9.1%} {recall:>7.1%} {exact:>6.0%}  {rate:>9,.0f}")
+        if args.show_errors:
+            for g, p in errors:
+                print(f"      expected {g}\n      got      {p}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Translation service: micro-batching and caching under concurrent clients.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_service
+    python -m benchmarks.bench_service --clients 64 --requests 2000 --delay 0.2
+
+Runs the HTTP service in-process on the stub backend, whose every request
+(single text or batch) takes --delay seconds like a remote API call, and
+fires --requests single-text /translate requests from --clients threads,
+drawn from --distinct texts. Each configuration starts with an empty cache:
+
+  unbatched   window 0, batches of 1 — one backend call per distinct text
+  batched     the default window and batch size
+  warm        batched again on the same cache — all answers cached
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from crawler.service import MAX_BATCH, WINDOW_SECONDS, TranslationService, make_server
+from crawler.translator import StubTranslator
+
+
+def _run(service: TranslationService, texts: list[str], clients: int) -> tuple[float, list[float]]:
+    server = make_server(service, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/translate"
+    local = threading.local()
+
+    def call(text: str) -> float:
+        session = getattr(local, "session", None) or requests.Session()
+        local.session = session
+        t0 = time.perf_counter()
+        session.post(url, json={"text": text}).raise_for_status()
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        latencies = list(pool.map(call, texts))
+    elapsed = time.perf_counter() - t0
+    server.shutdown()
+    server.server_close()
+    return elapsed, sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--distinct", type=int, default=400, help="Distinct texts among the requests")
+    parser.add_argument("--delay", type=float, default=0.1, help="Stub backend latency per call (s)")
+    parser.add_argument("--workers", type=int, default=4, help="Backend calls in flight")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    texts = [f"Sentence {rng.randrange(args.distinct)} of the benchmark corpus." for _ in range(args.requests)]
+
+    print(f"{args.requests} requests, {len(set(texts))} distinct texts, {args.clients} clients, "
+          f"backend {args.delay * 1000:.0f} ms per call, {args.workers} calls in flight\n")
+    print(f"  {'mode':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'calls':>6} {'texts':>6} {'hit rate':>9}")
+    runs = [
+        ("unbatched", dict(window=0.0, max_batch=1), True),
+        ("batched", dict(window=WINDOW_SECONDS, max_batch=MAX_BATCH), True),
+        ("warm", dict(window=WINDOW_SECONDS, max_batch=MAX_BATCH), False),
+    ]
+    service = None
+    for label, options, fresh in runs:
+        if fresh:
+            service = TranslationService(StubTranslator(args.delay), cache_path=None,
+                                         workers=args.workers, **options)
+        before = dict(service.metrics.counters)
+        elapsed, latencies = _run(service, texts, args.clients)
+        counters = service.metrics.counters
+        calls = counters.get("translate.backend_calls", 0) - before.get("translate.backend_calls", 0)
+        sent = counters.get("translate.backend_texts", 0) - before.get("translate.backend_texts", 0)
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[int(0.95 * (len(latencies) - 1))] * 1000
+        print(f"  {label:<10} {len(texts) / elapsed:>8,.0f} {p50:>8.1f} {p95:>8.1f} "
+              f"{calls:>6} {sent:>6} {1 - sent / len(texts):>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
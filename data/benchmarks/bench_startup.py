@@ -0,0 +1,94 @@
+"""
+CLI startup: import time and wall time of each run_crawler.py command.
+
+Usage (from data/ directory):
+    python -m benchmarks.bench_startup              # best of 5 runs per command
+    python -m benchmarks.bench_startup --repeat 10
+
+Runs every command as its own process under `python -X importtime` against
+a small synthetic corpus, and reports the best wall time, the time spent
+importing modules and which heavy third-party packages were loaded. The
+"crawl" row imports what a one-source crawl imports before its first
+request (the crawler itself needs the network).
+"""
+import argparse
+import contextlib
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .synth import build_corpus_db
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+HEAVY = ("requests", "bs4", "lxml", "feedparser", "openai", "numpy", "pyarrow", "schedule")
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _commands(db: Path, out: Path) -> list[tuple[str, list[str]]]:
+    crawler = ["run_crawler.py"]
+    return [
+        ("--help", [*crawler, "--help"]),
+        ("crawl voa (imports)", ["-c", "import crawler.scheduler, crawler.main, crawler.sources as s; "
+                                        "s.get_sources(['voa'])"]),
+        ("--queue-stats", [*crawler, "--queue-stats"]),
+        ("search", [*crawler, "search", "climate", "--db", str(db)]),
+        ("export", [*crawler, "export", "--db", str(db), "--web", str(out)]),
+        ("archive --list", [*crawler, "archive", "--db", str(db), "--list"]),
+        ("normalize --status", [*crawler, "normalize", "--db", str(db), "--status"]),
+        ("thumbs --status", [*crawler, "thumbs", "--db", str(db), "--status"]),
+        ("backfill --dry-run", [*crawler, "backfill", "translate", "--db", str(db), "--dry-run"]),
+    ]
+
+
+def _run(args: list[str], env: dict) -> tuple[float, float, set[str]]:
+    """(wall seconds, import seconds, top-level packages imported) of one run."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=DATA_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{proc.stderr[-2000:]}")
+    imported = 0
+    packages: set[str] = set()
+    for line in proc.stderr.splitlines():
+        if m := _LINE.match(line):
+            imported += int(m.group(1))
+            packages.add(m.group(4).split(".")[0])
+    return wall, imported / 1e6, packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command (best is kept)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        db = root / "bench.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_corpus_db(db, 50)
+        # Keep --queue-stats away from the real articles.db
+        env = {**os.environ, "CRAWLER_QUEUE_DB": str(root / "queue.db")}
+        env.pop("TRANSLATION_SERVICE_URL", None)
+        # Python's own startup, for reference
+        base = min(_run(["-c", "pass"], env)[0] for _ in range(args.repeat))
+
+        print(f"Best of {args.repeat} runs; interpreter startup alone {base * 1000:.0f} ms\n")
+        print(f"  {'command':<20} {'wall ms':>8} {'imports ms':>11}  heavy packages loaded")
+        for label, command in _commands(db, root / "out"):
+            runs = [_run(command, env) for _ in range(args.repeat)]
+            wall = min(r[0] for r in runs)
+            imported = min(r[1] for r in runs)
+            heavy = [p for p in HEAVY if p in runs[0][2]]
+            print(f"  {label:<20} {wall * 1000:>8.0f} {imported * 1000:>11.0f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
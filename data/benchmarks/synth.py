@@ -0,0 +1,124 @@
+"""
+Synthetic corpus generator shared by the benchmark scripts.
+
+Articles look like real crawler output — 20-ish paragraphs of 3-5 sentences,
+Chinese translations, some complex sentences with analysis JSON — but are
+generated deterministically from a seed so runs are comparable.
+"""
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from crawler.db import ArticleDB
+from crawler.models import ParagraphData, RawArticle, SentenceData
+
+SOURCES = [
+    ("guardian", "kaoyan"),
+    ("bbc", "cet6"),
+    ("voa", "cet4"),
+    ("conversation", "ielts"),
+]
+
+_WORDS = (
+    "the government said on monday that climate scientists have warned about "
+    "rising temperatures across europe while researchers at the university "
+    "found evidence which suggests that economic growth could slow because "
+    "of higher energy prices although many analysts remain optimistic about "
+    "technology investment and public health policy in developing countries"
+).split()
+
+# Long tail of rarer words, so benchmark queries can hit a realistic handful
+# of sentences instead of every one
+_RARE = [f"{a}{b}{c}" for a in ("ana", "bio", "cryo", "geo", "neo", "para")
+         for b in ("morph", "lith", "phon", "graph", "scop", "therm", "kin")
+         for c in ("ic", "ous", "ism", "ate", "ity", "al", "ogy")]
+
+_CN = "政府周一表示气候科学家警告欧洲气温上升研究人员发现证据表明经济增长可能放缓"
+
+
+def _sentence(rng: random.Random, complex_: bool) -> str:
+    n = rng.randint(26, 40) if complex_ else rng.randint(8, 20)
+    words = [rng.choice(_WORDS) for _ in range(n)]
+    if rng.random() < 0.3:
+        words[rng.randrange(n)] = rng.choice(_RARE)
+    words[0] = words[0].capitalize()
+    return " ".join(words) + "."
+
+
+def make_article(
+    i: int,
+    rng: random.Random,
+    n_paragraphs: int = 20,
+) -> tuple[RawArticle, list[ParagraphData], str]:
+    """Return (raw, paragraphs, title_cn) for synthetic article number `i`."""
+    source, difficulty = SOURCES[i % len(SOURCES)]
+    paragraphs: list[ParagraphData] = []
+    for p in range(n_paragraphs):
+        sentences: list[SentenceData] = []
+        for s in range(rng.randint(3, 5)):
+            complex_ = rng.random() < 0.25
+            en = _sentence(rng, complex_)
+            start = rng.randrange(len(_CN) - 8)
+            cn = _CN[start:start + rng.randint(8, 24)] + "。"
+            analysis = ""
+            if complex_:
+                analysis = json.dumps(
+                    {"subject": "researchers", "predicate": "found",
+                     "clauses": [{"type": "relative", "text": en[:40]}],
+                     "structure_note": "主句 + 定语从句", "translation": cn},
+                    ensure_ascii=False,
+                )
+            sentences.append(SentenceData(s, en, cn, complex_, analysis))
+        paragraphs.append(ParagraphData(
+            seq=p,
+            en_text=" ".join(x.en_text for x in sentences),
+            cn_text=" ".join(x.cn_text for x in sentences),
+            sentences=sentences,
+        ))
+    raw = RawArticle(
+        source=source,
+        url=f"https://example.com/{source}/article-{i}",
+        title=f"Synthetic article {i}: " + _sentence(rng, False),
+        author="Bench Author",
+        published_at="",
+        category=rng.choice(["science", "society", "economy", "culture"]),
+        difficulty=difficulty,
+        image_url="",
+    )
+    return raw, paragraphs, f"合成文章 {i}"
+
+
+def build_corpus_db(
+    db_path: Path,
+    n_articles: int,
+    seed: int = 42,
+    days: int = 365,
+    n_paragraphs: int = 20,
+) -> None:
+    """
+    Fill `db_path` with `n_articles` synthetic articles.
+
+    crawled_at is spread evenly over the last `days` days so month/day
+    bucketing behaves like a long-running archive.
+    """
+    rng = random.Random(seed)
+    end = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    with ArticleDB(db_path, batch_size=200) as db:
+        for i in range(n_articles):
+            raw, paragraphs, title_cn = make_article(i, rng, n_paragraphs)
+            db.save_article(raw, paragraphs, title_cn)
+
+    step = timedelta(days=days) / max(n_articles, 1)
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.executemany(
+            "UPDATE articles SET crawled_at = ? WHERE url = ?",
+            [
+                ((end - step * (n_articles - i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                 f"https://example.com/{SOURCES[i % len(SOURCES)][0]}/article-{i}")
+                for i in range(n_articles)
+            ],
+        )
+    conn.close()
@@ -10,44 +10,22 @@ import re
 
 from . import config
 from .models import SentenceData
+from .segmenter import segment, segment_article
 
 
 # ── Sentence splitting ────────────────────────────────────────────────────────
 
-# Abbreviations that should NOT trigger a sentence split
-_ABBREVS = {
-    "Mr", "Mrs", "Ms", "Dr", "Prof", "Sr", "Jr", "vs", "etc", "e.g",
-    "i.e", "fig", "Jan", "Feb", "Mar", "Apr", "Jun", "Jul", "Aug",
-    "Sep", "Oct", "Nov", "Dec", "U.S", "U.K", "St",
-}
-
-_ABBREV_PAT = re.compile(
-    r"\b(" + "|".join(re.escape(a) for a in _ABBREVS) + r")\.$",
-    re.IGNORECASE,
-)
+def split_sentences(text: str) -> list[str]:
+    """Split a paragraph into sentences (see crawler/segmenter.py)."""
+    return [text[start:end] for start, end in segment(text)]
 
 
-def split_sentences(text: str) -> list[str]:
-    """Split a paragraph into sentences using a heuristic approach."""
-    # Split on '. ', '! ', '? ' when followed by a capital letter or quote
-    parts = re.split(r'(?<=[.!?])\s+(?=[A-Z"\u201c])', text)
-    sentences: list[str] = []
-    buf = ""
-    for part in parts:
-        if buf:
-            candidate = buf + " " + part
-        else:
-            candidate = part
-        # Check if the split point was inside an abbreviation
-        if buf and _ABBREV_PAT.search(buf.rstrip()):
-            buf = candidate
-            continue
-        if buf:
-            sentences.append(buf.strip())
-        buf = part
-    if buf:
-        sentences.append(buf.strip())
-    return [s for s in sentences if s]
+def split_article(paragraphs: list[str]) -> list[list[str]]:
+    """Split every paragraph of an article in one segmenter call."""
+    return [
+        [para[start:end] for start, end in spans]
+        for para, spans in zip(paragraphs, segment_article(paragraphs))
+    ]
 
 
 # ── Complexity detection ──────────────────────────────────────────────────────
@@ -80,6 +58,7 @@ def process_paragraph(
     para_text: str,
     translator,
     analyze: bool = False,
+    sentences: list[str] | None = None,
 ) -> tuple[str, list[SentenceData]]:
     """
     Translate a paragraph and build per-sentence data.
@@ -89,11 +68,14 @@ def process_paragraph(
         translator: A BaseTranslator instance.
         analyze:    If True and translator supports it, run structural analysis
                     on complex sentences (DeepSeek only).
+        sentences:  The paragraph already split (e.g. by split_article());
+                    split here if omitted.
 
     Returns:
         (cn_paragraph_text, list_of_SentenceData)
     """
-    sentences = split_sentences(para_text)
+    if sentences is None:
+        sentences = split_sentences(para_text)
     sentence_data: list[SentenceData] = []
 
     for i, sent in enumerate(sentences):
@@ -0,0 +1,316 @@
+"""
+Month-partitioned archive for articles.db.
+
+The hot database keeps only recent months, which is all the daily crawl
+writes to. Older months are moved into one SQLite file per month:
+
+  articles.db                       — hot DB (recent months)
+  archive/articles-YYYY-MM.db       — immutable monthly partitions
+
+Partitions have the same schema as the hot DB and keep their original row
+ids (AUTOINCREMENT never reuses them), so article ids stay stable across the
+move. Once written they are read-only and opened with `immutable=1`, which
+lets SQLite skip locking and change detection entirely.
+
+Readers go through Corpus, which ATTACHes a partition only while a query
+needs it — SQLite allows only ~10 attached databases at once.
+
+Usage (from data/ directory):
+    python run_crawler.py archive --keep-months 3   # archive everything older
+    python run_crawler.py archive --before 2026-01  # archive months < 2026-01
+    python run_crawler.py archive --list
+"""
+import argparse
+import os
+import re
+import sqlite3
+import stat
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import config
+from .migrations import migrate
+from .normalize import unpack_analysis
+
+_PARTITION_RE = re.compile(r"^articles-(\d{4}-\d{2})\.db$")
+_MONTH_EXPR = "substr(crawled_at, 1, 7)"
+
+
+def archive_dir_for(db_path: Path) -> Path:
+    """Partitions live in an `archive/` directory next to the hot DB."""
+    return db_path.parent / "archive"
+
+
+def partition_path(archive_dir: Path, month: str) -> Path:
+    return archive_dir / f"articles-{month}.db"
+
+
+def _ro_uri(path: Path, immutable: bool = False) -> str:
+    uri = path.resolve().as_uri() + "?mode=ro"
+    return uri + "&immutable=1" if immutable else uri
+
+
+def _shift_month(month: str, delta: int) -> str:
+    y, m = map(int, month.split("-"))
+    idx = y * 12 + (m - 1) + delta
+    return f"{idx // 12:04d}-{idx % 12 + 1:02d}"
+
+
+# ── Read side ─────────────────────────────────────────────────────────────────
+
+class Corpus:
+    """
+    Read-only view of the hot DB plus its archived month partitions.
+
+    Queries name tables with a schema prefix, e.g. f"{schema}.articles";
+    schemas() yields "main" for the hot DB and attaches partitions one at a
+    time as the caller iterates:
+
+        corpus = Corpus(db_path)
+        for schema in corpus.schemas():
+            rows = corpus.conn.execute(f"SELECT * FROM {schema}.articles")
+
+    The connection has the SQL function unpack_analysis(analysis), which
+    turns compressed analysis (normalized storage) back into JSON text.
+    """
+
+    def __init__(self, db_path: Path = config.DB_PATH, archive_dir: Path | None = None) -> None:
+        self.db_path = db_path
+        self.archive_dir = archive_dir or archive_dir_for(db_path)
+        self.conn = sqlite3.connect(_ro_uri(db_path), uri=True)
+        self.conn.create_function("unpack_analysis", 1, unpack_analysis, deterministic=True)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def archived_months(self) -> list[str]:
+        """Months with a partition file, newest first."""
+        if not self.archive_dir.is_dir():
+            return []
+        months = [
+            m.group(1) for p in self.archive_dir.iterdir()
+            if (m := _PARTITION_RE.match(p.name))
+        ]
+        return sorted(months, reverse=True)
+
+    def hot_months(self) -> list[str]:
+        """Months present in the hot DB, newest first."""
+        return [r[0] for r in self.conn.execute(
+            f"SELECT DISTINCT {_MONTH_EXPR} AS m FROM main.articles ORDER BY m DESC"
+        )]
+
+    def months(self) -> list[str]:
+        return sorted(set(self.hot_months()) | set(self.archived_months()), reverse=True)
+
+    @contextmanager
+    def attached(self, month: str) -> Iterator[str]:
+        """ATTACH the partition for `month` and yield its schema name."""
+        schema = "m_" + month.replace("-", "_")
+        self.conn.execute(
+            "ATTACH DATABASE ? AS " + schema,
+            (_ro_uri(partition_path(self.archive_dir, month), immutable=True),),
+        )
+        try:
+            yield schema
+        finally:
+            self.conn.execute("DETACH DATABASE " + schema)
+
+    def schemas(self, months: Iterable[str] | None = None) -> Iterator[str]:
+        """
+        Yield schema names covering `months` (all months if None), newest first.
+
+        The hot DB ("main") comes first; each partition stays attached only
+        until the caller advances the iterator, so consume each schema's
+        query results before moving on. A month that was archived and then
+        crawled into again (archive_months() now refuses the current month,
+        older trees may have done it) is in both, and both are yielded.
+        """
+        wanted = set(months) if months is not None else None
+        hot = set(self.hot_months())
+        if wanted is None or wanted & hot:
+            yield "main"
+        for month in self.archived_months():
+            if wanted is not None and month not in wanted:
+                continue
+            with self.attached(month) as schema:
+                yield schema
+
+
+# ── Write side ────────────────────────────────────────────────────────────────
+
+def _connect_rw(path: Path) -> sqlite3.Connection:
+    # uri=True so that partitions can be ATTACHed read-only / immutable
+    conn = sqlite3.connect(path.resolve().as_uri(), uri=True, isolation_level=None)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA busy_timeout = 30000")
+    return conn
+
+
+def _write_partition(hot: sqlite3.Connection, archive_dir: Path, month: str) -> int:
+    """Copy one month into a new partition file. Returns the article count."""
+    final = partition_path(archive_dir, month)
+    tmp = final.with_suffix(".db.tmp")
+    tmp.unlink(missing_ok=True)
+
+    part = _connect_rw(tmp)
+    migrate(part)
+    part.close()
+
+    hot.execute("ATTACH DATABASE ? AS part", (str(tmp),))
+    try:
+        hot.execute("BEGIN")
+        n = hot.execute(
+            f"INSERT INTO part.articles SELECT * FROM main.articles WHERE {_MONTH_EXPR} = ?",
+            (month,),
+        ).rowcount
+        hot.execute(
+            """INSERT INTO part.paragraphs SELECT * FROM main.paragraphs
+                WHERE article_id IN (SELECT id FROM part.articles)"""
+        )
+        hot.execute(
+            """INSERT INTO part.sentences SELECT s.* FROM main.sentences s
+                 JOIN part.paragraphs p ON p.id = s.paragraph_id"""
+        )
+        for table in ("word_index", "word_coverage", "glossary"):
+            hot.execute(
+                f"""INSERT INTO part.{table} SELECT * FROM main.{table}
+                     WHERE article_id IN (SELECT id FROM part.articles)"""
+            )
+        hot.execute("COMMIT")
+    except Exception:
+        hot.execute("ROLLBACK")
+        raise
+    finally:
+        hot.execute("DETACH DATABASE part")
+
+    # Compact into a single self-contained file before freezing it
+    part = _connect_rw(tmp)
+    part.execute("PRAGMA journal_mode = DELETE")
+    part.execute("ANALYZE")
+    part.execute("VACUUM")
+    part.close()
+
+    os.replace(tmp, final)
+    final.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    return n
+
+
+def _partition_covers(hot: sqlite3.Connection, archive_dir: Path, month: str) -> bool:
+    """True if an existing partition already holds every hot article of `month`."""
+    uri = _ro_uri(partition_path(archive_dir, month), immutable=True)
+    hot.execute("ATTACH DATABASE ? AS part", (uri,))
+    try:
+        missing = hot.execute(
+            f"""SELECT COUNT(*) FROM main.articles
+                 WHERE {_MONTH_EXPR} = ? AND id NOT IN (SELECT id FROM part.articles)""",
+            (month,),
+        ).fetchone()[0]
+    finally:
+        hot.execute("DETACH DATABASE part")
+    return missing == 0
+
+
+def archive_months(
+    db_path: Path = config.DB_PATH,
+    before: str | None = None,
+    keep_months: int = 3,
+    vacuum: bool = False,
+) -> list[tuple[str, int]]:
+    """
+    Move every month older than `before` (YYYY-MM) out of the hot DB.
+
+    Without `before`, the newest `keep_months` calendar months (counting the
+    current one) stay hot. The current month is never archived: the crawl
+    still writes to it, and a partition is frozen once written. Each month
+    is written and frozen before it is deleted from the hot DB, so an
+    interrupted run is safe to repeat. Returns (month, article_count) for
+    each month moved; raises ValueError for keep_months < 1 or a `before`
+    later than the current month.
+    """
+    this_month = datetime.now(timezone.utc).strftime("%Y-%m")
+    if before is None:
+        if keep_months < 1:
+            raise ValueError("keep_months must be at least 1 (the current month stays hot)")
+        before = _shift_month(this_month, -(keep_months - 1))
+    elif not re.fullmatch(r"\d{4}-\d{2}", before):
+        raise ValueError(f"before must be YYYY-MM, not {before!r}")
+    elif before > this_month:
+        raise ValueError(f"cannot archive {this_month} or later: the crawl still writes to it")
+
+    archive_dir = archive_dir_for(db_path)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    hot = _connect_rw(db_path)
+    moved: list[tuple[str, int]] = []
+    try:
+        migrate(hot)  # partitions are created at the latest schema; match it
+        months = [r[0] for r in hot.execute(
+            f"SELECT DISTINCT {_MONTH_EXPR} AS m FROM articles WHERE m < ? ORDER BY m",
+            (before,),
+        )]
+        for month in months:
+            final = partition_path(archive_dir, month)
+            if final.exists():
+                if not _partition_covers(hot, archive_dir, month):
+                    raise RuntimeError(
+                        f"{final.name} exists but lacks some of {month}'s articles; "
+                        "partitions are immutable — move it aside and re-run."
+                    )
+                n = 0
+            else:
+                n = _write_partition(hot, archive_dir, month)
+
+            hot.execute("BEGIN")
+            deleted = hot.execute(
+                f"DELETE FROM articles WHERE {_MONTH_EXPR} = ?", (month,)
+            ).rowcount
+            hot.execute("COMMIT")
+            moved.append((month, n or deleted))
+            print(f"  archived {month}: {n or deleted} articles → {final.name}")
+
+        if moved and vacuum:
+            hot.execute("VACUUM")
+    finally:
+        hot.close()
+    return moved
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--keep-months", type=int, default=3,
+                        help="Calendar months to keep hot, counting the current one (default: 3)")
+    parser.add_argument("--before", metavar="YYYY-MM",
+                        help="Archive every month strictly before this one")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="VACUUM the hot DB afterwards to return the space to the OS")
+    parser.add_argument("--list", action="store_true", help="List hot and archived months")
+
+
+def cli(args: argparse.Namespace) -> None:
+    if not args.db.exists():
+        print(f"  {args.db} not found.")
+        return
+    if args.list:
+        with Corpus(args.db) as corpus:
+            hot = corpus.hot_months()
+            for month in corpus.months():
+                where = "hot" if month in hot else partition_path(corpus.archive_dir, month).name
+                print(f"  {month}  {where}")
+        return
+    try:
+        moved = archive_months(args.db, before=args.before, keep_months=args.keep_months,
+                               vacuum=args.vacuum)
+    except ValueError as exc:
+        print(f"  {exc}")
+        return
+    if not moved:
+        print("  Nothing to archive.")
@@ -0,0 +1,386 @@
+"""
+Re-translate or re-analyze sentences already in articles.db, in place.
+
+Fills in what earlier crawls left out, and after switching translator
+backends (e.g. setting DEEPSEEK_API_KEY) upgrades the old translations,
+without re-crawling:
+
+    python run_crawler.py backfill translate --dry-run          # what would be sent
+    python run_crawler.py backfill translate --budget 2000000   # at most 2M characters
+    python run_crawler.py backfill translate --only-backend google
+    python run_crawler.py backfill analyze --source bbc --since 2026-01-01
+
+  translate  sentences without a translation, and titles stored without one
+             (`run_crawler.py --no-translate`). With --only-backend NAME,
+             instead the sentences translated by NAME (sentences.translated_by,
+             migration 9; "unknown" for those stored before it was
+             recorded) — replacing another backend's work is always asked
+             for by name, never a default. Sentences with an analysis are
+             left alone: their translation is the analysis's, and
+             re-translating them alone would make the two disagree
+  analyze    complex sentences without a structural analysis (DeepSeek);
+             the analysis translation replaces the sentence translation
+
+Sentences are sent in batches of --batch through translate_batch() (one API
+call per batch with DeepSeek), --workers batches at a time. Each finished
+batch is written in one transaction together with the translations of its
+paragraphs and the content hashes of its articles. Progress is the data
+itself — a written sentence no longer matches the selection — so an
+interrupted run is resumed by running the same command again. --budget caps
+the English characters sent per run and --limit the sentences, titles first
+and each counting as one sentence.
+"""
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .hashing import refresh_article_hashes
+from .normalize import CN_DERIVED, NORMALIZED, pack_analysis, storage_mode
+
+TASKS = ("translate", "analyze")
+BATCH_SENTENCES = 20
+WORKERS = 2
+
+
+@dataclass
+class BackfillStats:
+    selected: int = 0     # sentences sent to the translator
+    chars: int = 0        # English characters sent
+    updated: int = 0      # sentences written
+    failed: int = 0       # sentences left as they were (retried next run)
+    articles: int = 0
+    titles: int = 0       # untranslated titles translated
+    stopped: str = ""     # "budget" / "limit" / "interrupted" when cut short
+    seconds: float = 0.0
+
+
+def _article_filter(
+    sources: list[str] | None, since: str | None, until: str | None
+) -> tuple[list[str], list]:
+    """WHERE clauses (alias a) and parameters for --source / --since / --until."""
+    clauses: list[str] = []
+    params: list = []
+    if sources:
+        clauses.append(f"a.source IN ({','.join('?' * len(sources))})")
+        params += sources
+    # Same expression as the idx_articles_day index
+    if since:
+        clauses.append("substr(a.crawled_at, 1, 10) >= ?")
+        params.append(since)
+    if until:
+        clauses.append("substr(a.crawled_at, 1, 10) <= ?")
+        params.append(until)
+    return clauses, params
+
+
+def _selection(
+    task: str,
+    backend: str,
+    sources: list[str] | None,
+    since: str | None,
+    until: str | None,
+    only_backend: str | None,
+) -> tuple[str, list]:
+    """WHERE clause (aliases s / p / a) and parameters for the sentences of `task`."""
+    # Both tasks only touch sentences without an analysis
+    clauses: list[str] = ["(s.analysis = '' OR s.analysis IS NULL)"]
+    params: list = []
+    if task == "analyze":
+        clauses.append("s.is_complex = 1")
+    elif only_backend is not None:
+        clauses.append("s.translated_by IS NULL" if only_backend == "unknown" else "s.translated_by = ?")
+        params += [] if only_backend == "unknown" else [only_backend]
+        # Never what the current backend already did, so reruns resume
+        clauses.append("s.translated_by IS NOT ?")
+        params.append(backend)
+    else:
+        clauses.append("(s.cn_text = '' OR s.cn_text IS NULL)")
+    article_clauses, article_params = _article_filter(sources, since, until)
+    return " AND ".join(clauses + article_clauses), params + article_params
+
+
+def _translate_titles(
+    conn, translator, sources: list[str] | None, since: str | None, until: str | None,
+    budget: int | None, limit: int | None, dry_run: bool, stats: "BackfillStats",
+) -> int:
+    """
+    Translate the titles stored without a translation, in one batch, within
+    `budget` characters and `limit` titles. Returns the number of titles sent.
+    """
+    clauses, params = _article_filter(sources, since, until)
+    rows = []
+    for aid, title in conn.execute(
+        f"""SELECT a.id, a.title FROM articles a
+             WHERE {" AND ".join(["(a.title_cn = '' OR a.title_cn IS NULL)", *clauses])}
+             ORDER BY a.id""",
+        params,
+    ):
+        if limit is not None and len(rows) >= limit:
+            stats.stopped = "limit"
+            break
+        if budget is not None and stats.chars + len(title) > budget:
+            stats.stopped = "budget"
+            break
+        rows.append((aid, title))
+        stats.chars += len(title)
+    if dry_run or not rows:
+        stats.titles = len(rows)
+        return len(rows)
+    translated = _translate(translator, [(aid, None, aid, title) for aid, title in rows])
+    updates = [(cn, aid) for aid, _, cn in translated if cn]
+    conn.execute("BEGIN")
+    try:
+        conn.executemany("UPDATE articles SET title_cn = ? WHERE id = ?", updates)
+        for _, article_id in updates:
+            refresh_article_hashes(conn, article_id)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    stats.titles = len(updates)
+    return len(rows)
+
+
+def _translate(translator, rows: list[tuple]) -> list[tuple[int, str, str]]:
+    """(sentence_id, analysis, cn_text) for a batch via translate_batch()."""
+    texts = [en for _, _, _, en in rows]
+    try:
+        results = translator.translate_batch(texts)
+    except Exception as exc:
+        print(f"    [backfill] batch failed: {exc}")
+        results = []
+    if len(results) != len(texts) or not all(results):
+        # Lines lost or merged in a batched reply: do not trust the alignment
+        results = []
+        for text in texts:
+            try:
+                results.append(translator.translate(text))
+            except Exception as exc:
+                print(f"    [backfill] sentence failed: {exc}")
+                results.append("")
+    return [(sid, "", cn.strip()) for (sid, _, _, _), cn in zip(rows, results)]
+
+
+def _analyze(translator, rows: list[tuple]) -> list[tuple[int, str, str]]:
+    """(sentence_id, analysis_json, cn_text) for a batch via analyze_sentence()."""
+    out = []
+    for sid, _, _, en in rows:
+        result = translator.analyze_sentence(en)
+        if result:
+            out.append((sid, json.dumps(result, ensure_ascii=False), result.get("translation", "")))
+        else:
+            out.append((sid, "", ""))
+    return out
+
+
+def _write(
+    conn, task: str, backend: str, rows: list[tuple], results: list[tuple], packed: bool
+) -> tuple[int, list[int]]:
+    """Store one finished batch in one transaction. Returns (updated, article ids)."""
+    if task == "translate":
+        updates = [(cn, backend, sid) for sid, _, cn in results if cn]
+    else:
+        updates = [
+            (pack_analysis(analysis) if packed else analysis, cn, backend, sid)
+            for sid, analysis, cn in results if analysis
+        ]
+    done = {u[-1] for u in updates}
+    paragraph_ids = sorted({pid for sid, pid, _, _ in rows if sid in done})
+    article_ids = sorted({aid for sid, _, aid, _ in rows if sid in done})
+    if not updates:
+        return 0, []
+
+    conn.execute("BEGIN")
+    try:
+        if task == "translate":
+            # An analysis written since the batch was selected keeps its translation
+            conn.executemany(
+                """UPDATE sentences SET cn_text = ?, translated_by = ?
+                    WHERE id = ? AND (analysis = '' OR analysis IS NULL)""",
+                updates,
+            )
+        else:
+            conn.executemany(
+                """UPDATE sentences
+                      SET analysis = ?1,
+                          cn_text = CASE WHEN ?2 != '' THEN ?2 ELSE cn_text END,
+                          translated_by = CASE WHEN ?2 != '' THEN ?3 ELSE translated_by END
+                    WHERE id = ?4""",
+                updates,
+            )
+        # As save_analysis(): rebuild stored paragraph translations
+        conn.executemany(
+            """UPDATE paragraphs
+                  SET cn_text = (SELECT group_concat(cn_text, ' ') FROM
+                                   (SELECT cn_text FROM sentences
+                                     WHERE paragraph_id = paragraphs.id ORDER BY seq))
+                WHERE id = ? AND NOT derived & ?""",
+            [(pid, CN_DERIVED) for pid in paragraph_ids],
+        )
+        for article_id in article_ids:
+            refresh_article_hashes(conn, article_id)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return len(updates), article_ids
+
+
+def backfill(
+    conn,
+    translator,
+    task: str = "translate",
+    sources: list[str] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    only_backend: str | None = None,
+    budget: int | None = None,
+    limit: int | None = None,
+    workers: int = WORKERS,
+    batch_size: int = BATCH_SENTENCES,
+    dry_run: bool = False,
+) -> BackfillStats:
+    """
+    Re-translate or re-analyze the selected sentences in id order (see the
+    module docstring), at most `budget` English characters and `limit`
+    sentences, untranslated titles included. With dry_run=True only counts
+    what would be sent. `conn` must be in autocommit mode
+    (isolation_level=None).
+    """
+    if task not in TASKS:
+        raise ValueError(f"unknown backfill task {task!r}")
+    where, params = _selection(task, translator.name, sources, since, until, only_backend)
+    sql = f"""SELECT s.id, s.paragraph_id, p.article_id, s.en_text
+                FROM sentences s
+                JOIN paragraphs p ON p.id = s.paragraph_id
+                JOIN articles   a ON a.id = p.article_id
+               WHERE s.id > ? AND {where}
+               ORDER BY s.id
+               LIMIT ?"""
+    packed = storage_mode(conn) == NORMALIZED
+    work = _translate if task == "translate" else _analyze
+
+    stats = BackfillStats()
+    t0 = time.perf_counter()
+    titles = 0
+    if task == "translate":
+        titles = _translate_titles(conn, translator, sources, since, until, budget, limit, dry_run, stats)
+
+    def next_batch(last_id: int) -> list[tuple]:
+        """The next batch within budget / limit; sets stats.stopped when cut."""
+        if stats.stopped:
+            return []
+        rows = conn.execute(sql, (last_id, *params, batch_size)).fetchall()
+        batch = []
+        for row in rows:
+            if limit is not None and titles + stats.selected >= limit:
+                stats.stopped = "limit"
+                break
+            if budget is not None and stats.chars + len(row[3]) > budget:
+                stats.stopped = "budget"
+                break
+            batch.append(row)
+            stats.selected += 1
+            stats.chars += len(row[3])
+        return batch
+
+    if dry_run:
+        last_id = 0
+        while batch := next_batch(last_id):
+            last_id = batch[-1][0]
+        stats.seconds = time.perf_counter() - t0
+        return stats
+
+    last_id = 0
+    exhausted = False
+    touched: set[int] = set()
+    pending: deque[tuple[list, Future]] = deque()
+
+    def write_done() -> None:
+        for item in [item for item in pending if item[1].done() and not item[1].cancelled()]:
+            pending.remove(item)
+            batch, future = item
+            updated, article_ids = _write(conn, task, translator.name, batch, future.result(), packed)
+            stats.updated += updated
+            stats.failed += len(batch) - updated
+            touched.update(article_ids)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        while True:
+            # Keep every worker busy, plus one batch queued behind them
+            while not (stats.stopped or exhausted) and len(pending) <= workers:
+                batch = next_batch(last_id)
+                if not batch:
+                    exhausted = True
+                    break
+                last_id = batch[-1][0]
+                pending.append((batch, pool.submit(work, translator, batch)))
+            if not pending:
+                break
+            wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+            write_done()
+    except KeyboardInterrupt:
+        # Keep what already came back; the rest is selected again next run
+        stats.stopped = "interrupted"
+        for _, future in pending:
+            future.cancel()
+        write_done()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    stats.articles = len(touched)
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("task", choices=TASKS)
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--source", action="append", dest="sources", metavar="NAME",
+                        help="Only articles from this source (repeatable)")
+    parser.add_argument("--since", metavar="YYYY-MM-DD", help="Only articles crawled on or after")
+    parser.add_argument("--until", metavar="YYYY-MM-DD", help="Only articles crawled on or before")
+    parser.add_argument("--only-backend", metavar="NAME",
+                        help='translate: re-translate the sentences translated by NAME '
+                             '("unknown": not recorded) instead of the untranslated ones')
+    parser.add_argument("--budget", type=int, metavar="CHARS",
+                        help="Stop after sending this many English characters")
+    parser.add_argument("--limit", type=int, metavar="N",
+                        help="Stop after N sentences (untranslated titles count as sentences)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Batches in flight at once")
+    parser.add_argument("--batch", type=int, default=BATCH_SENTENCES, help="Sentences per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be sent")
+
+
+def cli(args: argparse.Namespace) -> None:
+    from .db import ArticleDB  # migrates the schema to include translated_by
+    from .translator import get_translator
+
+    if args.task == "analyze" and config.TRANSLATOR_BACKEND != "deepseek":
+        print("  Sentence analysis needs the DeepSeek backend (set DEEPSEEK_API_KEY).")
+        return
+    translator = get_translator()
+    with ArticleDB(args.db) as db:
+        stats = db.backfill(
+            translator, args.task, sources=args.sources, since=args.since, until=args.until,
+            only_backend=args.only_backend, budget=args.budget, limit=args.limit,
+            workers=args.workers, batch_size=args.batch, dry_run=args.dry_run,
+        )
+    if args.dry_run:
+        titles = f" and {stats.titles} title(s)" if stats.titles else ""
+        print(f"  Would {args.task} {stats.selected} sentence(s){titles}, {stats.chars:,} characters"
+              + (f" (stopped by --{stats.stopped})" if stats.stopped else ""))
+        return
+    titles = f" and {stats.titles} title(s)" if stats.titles else ""
+    print(f"  {args.task.capitalize()}d {stats.updated} of {stats.selected} sentence(s){titles} "
+          f"in {stats.articles} article(s), {stats.chars:,} characters, {stats.seconds:.1f}s "
+          f"({stats.failed} failed)")
+    if stats.stopped:
+        print(f"  Stopped ({stats.stopped}); run the same command again to continue.")
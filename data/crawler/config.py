@@ -14,6 +14,17 @@ from pathlib import Path
 CRAWLER_DIR = Path(__file__).parent
 DATA_DIR = CRAWLER_DIR.parent
 DB_PATH = DATA_DIR / "articles.db"
+# Dictionary built by build_db.py; its frequency ranks drive the rare-word rate
+VOCAB_DB_PATH = DATA_DIR.parent / "vocab.db"
+
+# Job queue used by `run_crawler.py --worker`. Defaults to a table inside
+# articles.db; point it elsewhere (e.g. a shared volume) with CRAWLER_QUEUE_DB.
+QUEUE_DB_PATH = Path(os.environ.get("CRAWLER_QUEUE_DB", "") or DB_PATH)
+
+# ── SQLite tuning ─────────────────────────────────────────────────────────────
+DB_CACHE_SIZE_KB: int = 65536           # page cache per connection (64 MB)
+DB_MMAP_SIZE: int = 256 * 1024 * 1024   # memory-map up to 256 MB of the DB file
+DB_BATCH_ARTICLES: int = 1              # translated articles written per transaction in run()
 
 # ── Translation ───────────────────────────────────────────────────────────────
 DEEPSEEK_API_KEY: str = os.environ.get("DEEPSEEK_API_KEY", "")
@@ -23,12 +34,36 @@ DEEPSEEK_MODEL: str = "deepseek-chat"
 # Auto-select backend based on whether API key is present
 TRANSLATOR_BACKEND: str = "deepseek" if DEEPSEEK_API_KEY else "google"
 
+# Shared translation service (`run_crawler.py serve`, see service.py). When
+# set, the crawler sends all translation / analysis requests there instead;
+# the web app's /api/translate routes read the same variable.
+TRANSLATION_SERVICE_URL: str = os.environ.get("TRANSLATION_SERVICE_URL", "")
+TRANSLATION_SERVICE_PORT: int = 8787
+# Translations and analyses the service has already paid for
+TRANSLATION_CACHE_PATH = DATA_DIR / "translation_cache.db"
+
 # ── Crawler behaviour ─────────────────────────────────────────────────────────
 ARTICLES_PER_SOURCE: int = 5     # max new articles to fetch per source per run
 MIN_WORD_COUNT: int = 200         # skip articles shorter than this
 MAX_WORD_COUNT: int = 1500        # skip articles longer than this
 CRAWL_DELAY_SECONDS: float = 2.0  # polite delay between HTTP requests (seconds)
 
+# ── Thumbnails ───────────────────────────────────────────────────────────────
+# Article images are downloaded once and served by the web app as small
+# thumbnails (see thumbnails.py). Next.js serves public/ as static files, so
+# THUMBNAIL_URL is THUMBNAIL_DIR's path on the site. Point CRAWLER_THUMBNAIL_DIR
+# at the web app's public/thumbs when the crawler runs from another checkout.
+THUMBNAIL_DIR = Path(os.environ.get("CRAWLER_THUMBNAIL_DIR", "") or DATA_DIR.parent / "public" / "thumbs")
+THUMBNAIL_URL: str = "/thumbs/"
+THUMBNAIL_SIZE: int = 480                    # longest side in pixels
+THUMBNAIL_FORMAT: str = "webp"               # or "avif" (needs a Pillow build with AVIF)
+THUMBNAIL_MAX_BYTES: int = 20 * 1024 * 1024  # do not download larger originals
+
+# ── Worker queue ─────────────────────────────────────────────────────────────
+JOB_LEASE_SECONDS: float = 300.0  # a job is re-claimable if not heartbeated for this long
+JOB_MAX_ATTEMPTS: int = 3         # give up on a job after this many failed / expired leases
+WORKER_POLL_SECONDS: float = 5.0  # idle sleep between claim attempts
+
 # ── Complex-sentence detection ────────────────────────────────────────────────
 COMPLEX_MIN_WORDS: int = 25       # flag sentences with >= this many words
 
@@ -5,146 +5,369 @@ Schema:
   articles   — one row per article
   paragraphs — N rows per article (ordered by seq)
   sentences  — N rows per paragraph (ordered by seq)
+  word_index / word_coverage — lemma index over the sentences (wordindex.py)
+  glossary   — translated out-of-list / rare words per article (glossary.py)
+  images     — thumbnail of each article image URL (thumbnails.py)
+  settings   — key / value; "storage" is the write layout (normalize.py)
+
+All access goes through an ArticleDB handle, which keeps one connection open
+for the whole run instead of reconnecting for every lookup and insert.
+The schema itself is defined and versioned in migrations.py.
 """
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
-from . import config
+from . import backfill, config, glossary, metrics, normalize, thumbnails, wordindex
+from .hashing import article_hash, refresh_article_hashes, text_hash
+from .migrations import migrate
 from .models import RawArticle, ParagraphData
 
-# ── Schema ────────────────────────────────────────────────────────────────────
-
-_SCHEMA = """
-PRAGMA journal_mode = WAL;
-PRAGMA foreign_keys = ON;
-
-CREATE TABLE IF NOT EXISTS articles (
-    id           INTEGER PRIMARY KEY AUTOINCREMENT,
-    source       TEXT    NOT NULL,
-    url          TEXT    UNIQUE NOT NULL,
-    title        TEXT    NOT NULL,
-    title_cn     TEXT    DEFAULT '',
-    author       TEXT    DEFAULT '',
-    published_at TEXT    DEFAULT '',
-    category     TEXT    DEFAULT '',
-    difficulty   TEXT    DEFAULT 'cet6',
-    image_url    TEXT    DEFAULT '',
-    crawled_at   TEXT    NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS paragraphs (
-    id         INTEGER PRIMARY KEY AUTOINCREMENT,
-    article_id INTEGER NOT NULL,
-    seq        INTEGER NOT NULL,
-    en_text    TEXT    NOT NULL,
-    cn_text    TEXT    DEFAULT '',
-    FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
-);
-
-CREATE TABLE IF NOT EXISTS sentences (
-    id           INTEGER PRIMARY KEY AUTOINCREMENT,
-    paragraph_id INTEGER NOT NULL,
-    seq          INTEGER NOT NULL,
-    en_text      TEXT    NOT NULL,
-    cn_text      TEXT    DEFAULT '',
-    is_complex   INTEGER DEFAULT 0,
-    analysis     TEXT    DEFAULT '',
-    FOREIGN KEY (paragraph_id) REFERENCES paragraphs(id) ON DELETE CASCADE
-);
-
-CREATE INDEX IF NOT EXISTS idx_articles_source   ON articles(source);
-CREATE INDEX IF NOT EXISTS idx_articles_crawled  ON articles(crawled_at DESC);
-CREATE INDEX IF NOT EXISTS idx_paragraphs_art    ON paragraphs(article_id, seq);
-CREATE INDEX IF NOT EXISTS idx_sentences_para    ON sentences(paragraph_id, seq);
-"""
+# ── Connection setup ─────────────────────────────────────────────────────────
+
+# Applied to every connection. WAL + synchronous=NORMAL is durable across
+# application crashes (only an OS crash / power loss can drop the last commits)
+# and avoids an fsync per transaction.
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 30000",
+    f"PRAGMA cache_size = -{config.DB_CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size = {config.DB_MMAP_SIZE}",
+    "PRAGMA temp_store = MEMORY",
+)
 
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
-def init_db(db_path: Path = config.DB_PATH) -> None:
-    """Create the database and schema if they don't already exist."""
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
-    conn.executescript(_SCHEMA)
-    conn.commit()
-    conn.close()
-    print(f"  DB ready: {db_path}")
+class ArticleDB:
+    """
+    Long-lived handle on articles.db.
+
+    Args:
+        db_path:    Database file; created if missing and migrated to the
+                    latest schema version on open.
+        batch_size: Number of saved articles grouped into one transaction.
+                    1 (the default) commits every article immediately, which
+                    queue workers need so other processes see it at once.
+                    Larger values trade the last few uncommitted articles on a
+                    crash (they are simply re-crawled) for fewer commits. The
+                    write transaction stays open between save_article() calls
+                    until the batch is full, blocking other writers, so save a
+                    batch back to back — never with network calls in between
+                    (main.run() buffers translated articles for this) — and
+                    commit() once done.
+
+    Use as a context manager, or call close(); both commit pending writes.
+    """
+
+    def __init__(self, db_path: Path = config.DB_PATH, batch_size: int = 1) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self._pending = 0
+        # isolation_level=None: transactions are managed explicitly below
+        self._conn = sqlite3.connect(str(db_path), isolation_level=None)
+        for pragma in _PRAGMAS:
+            self._conn.execute(pragma)
+        migrate(self._conn, verbose=True)
+        # Normalized storage: derived paragraph text, compressed analysis
+        self.normalized = normalize.storage_mode(self._conn) == normalize.NORMALIZED
+
+    def __enter__(self) -> "ArticleDB":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
 
+    # ── Transactions ──────────────────────────────────────────────────────────
 
-def url_exists(url: str, db_path: Path = config.DB_PATH) -> bool:
-    """Return True if the article URL is already in the database."""
-    conn = sqlite3.connect(str(db_path))
-    try:
-        row = conn.execute(
+    def _begin(self) -> None:
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    @contextmanager
+    def _atomic(self):
+        """All-or-nothing block nested in the current batch transaction."""
+        self._begin()
+        self._conn.execute("SAVEPOINT write")
+        try:
+            yield
+        except Exception:
+            self._conn.execute("ROLLBACK TO write")
+            self._conn.execute("RELEASE write")
+            raise
+        self._conn.execute("RELEASE write")
+
+    def commit(self) -> None:
+        """Commit the current batch, if any."""
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+        self._pending = 0
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def url_exists(self, url: str) -> bool:
+        """Return True if the article URL is already in the database."""
+        row = self._conn.execute(
             "SELECT 1 FROM articles WHERE url = ?", (url,)
         ).fetchone()
         return row is not None
-    finally:
-        conn.close()
 
+    def pending_analysis(self, article_id: int) -> list[tuple[int, str]]:
+        """Return (sentence_id, en_text) for complex sentences not yet analyzed."""
+        return self._conn.execute(
+            """
+            SELECT s.id, s.en_text
+              FROM sentences s JOIN paragraphs p ON p.id = s.paragraph_id
+             WHERE p.article_id = ? AND s.is_complex = 1 AND s.analysis = ''
+             ORDER BY p.seq, s.seq
+            """,
+            (article_id,),
+        ).fetchall()
 
-def save_article(
-    raw: RawArticle,
-    paragraphs: list[ParagraphData],
-    title_cn: str = "",
-    db_path: Path = config.DB_PATH,
-) -> int:
-    """
-    Insert an article with all its paragraphs and sentences.
+    # ── Writes ────────────────────────────────────────────────────────────────
 
-    Returns the new article id (or the existing id if the URL was already present).
-    """
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    conn = sqlite3.connect(str(db_path))
-    conn.execute("PRAGMA foreign_keys = ON")
-    try:
-        cur = conn.execute(
+    def save_article(
+        self,
+        raw: RawArticle,
+        paragraphs: list[ParagraphData],
+        title_cn: str = "",
+        translated_by: str = "",
+    ) -> int:
+        """
+        Insert an article with all its paragraphs and sentences.
+
+        `translated_by` names the translator backend (translator.name) that
+        produced the sentence translations. Returns the new article id (or
+        the existing id if the URL was already present). The article is
+        written atomically even inside a batch.
+        """
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        content_hash = article_hash(raw.title, title_cn, (
+            (para.seq, sent.en_text, sent.cn_text, sent.is_complex, sent.analysis)
+            for para in paragraphs
+            for sent in para.sentences
+        ))
+        with self._atomic():
+            cur = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO articles
+                    (source, url, title, title_cn, author, published_at,
+                     category, difficulty, image_url, crawled_at, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    raw.source, raw.url, raw.title, title_cn,
+                    raw.author, raw.published_at, raw.category,
+                    raw.difficulty, raw.image_url, now, content_hash,
+                ),
+            )
+
+            if cur.rowcount == 0:
+                # URL already existed — retrieve its id
+                existing_id = self._conn.execute(
+                    "SELECT id FROM articles WHERE url = ?", (raw.url,)
+                ).fetchone()[0]
+            else:
+                existing_id = None
+                article_id = cur.lastrowid
+                self._insert_body(article_id, paragraphs, translated_by)
+
+        if existing_id is not None:
+            if not self._pending:
+                self.commit()  # don't hold a read snapshot open between batches
+            return existing_id
+
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.commit()
+        return article_id
+
+    def _insert_body(self, article_id: int, paragraphs: list[ParagraphData], translated_by: str) -> None:
+        """Insert paragraphs, then all sentences of the article in one executemany."""
+        rows = []
+        for p in paragraphs:
+            derived = 0
+            if self.normalized:
+                derived = normalize.derived_flags(
+                    p.en_text, p.cn_text, [(s.en_text, s.cn_text) for s in p.sentences]
+                )
+            rows.append((
+                article_id, p.seq,
+                "" if derived & normalize.EN_DERIVED else p.en_text,
+                "" if derived & normalize.CN_DERIVED else p.cn_text,
+                derived,
+            ))
+        self._conn.executemany(
+            "INSERT INTO paragraphs (article_id, seq, en_text, cn_text, derived) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        para_ids = dict(self._conn.execute(
+            "SELECT seq, id FROM paragraphs WHERE article_id = ?", (article_id,)
+        ))
+        self._conn.executemany(
             """
-            INSERT OR IGNORE INTO articles
-                (source, url, title, title_cn, author, published_at,
-                 category, difficulty, image_url, crawled_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO sentences
+                (paragraph_id, seq, en_text, cn_text, is_complex, analysis, en_hash, translated_by)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                raw.source, raw.url, raw.title, title_cn,
-                raw.author, raw.published_at, raw.category,
-                raw.difficulty, raw.image_url, now,
-            ),
+            [
+                (
+                    para_ids[para.seq], sent.seq, sent.en_text, sent.cn_text,
+                    int(sent.is_complex), self._stored_analysis(sent.analysis), text_hash(sent.en_text),
+                    translated_by or None,
+                )
+                for para in paragraphs
+                for sent in para.sentences
+            ],
         )
-        article_id = cur.lastrowid
-
-        if article_id == 0:
-            # URL already existed — retrieve its id
-            row = conn.execute(
-                "SELECT id FROM articles WHERE url = ?", (raw.url,)
-            ).fetchone()
-            conn.close()
-            return row[0]
-
-        for para in paragraphs:
-            cur2 = conn.execute(
-                "INSERT INTO paragraphs (article_id, seq, en_text, cn_text) VALUES (?, ?, ?, ?)",
-                (article_id, para.seq, para.en_text, para.cn_text),
+
+    def _stored_analysis(self, analysis: str) -> str | bytes:
+        return normalize.pack_analysis(analysis) if self.normalized else analysis
+
+    def save_analysis(
+        self, article_id: int, results: list[tuple[int, str, str]], translated_by: str = ""
+    ) -> None:
+        """
+        Store (sentence_id, analysis_json, cn_text) triples for one article.
+
+        An empty cn_text keeps the existing translation (and its backend). Paragraph translations
+        are rebuilt from their sentences afterwards, as in process_paragraph();
+        derived ones (normalized storage) follow their sentences by themselves.
+        """
+        with self._atomic():
+            self._conn.executemany(
+                """
+                UPDATE sentences
+                   SET analysis = ?1,
+                       cn_text = CASE WHEN ?2 != '' THEN ?2 ELSE cn_text END,
+                       translated_by = CASE WHEN ?2 != '' THEN ?3 ELSE translated_by END
+                 WHERE id = ?4
+                """,
+                [(self._stored_analysis(analysis), cn, translated_by or None, sid) for sid, analysis, cn in results],
             )
-            para_id = cur2.lastrowid
-            for sent in para.sentences:
-                conn.execute(
-                    """
-                    INSERT INTO sentences
-                        (paragraph_id, seq, en_text, cn_text, is_complex, analysis)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        para_id, sent.seq, sent.en_text, sent.cn_text,
-                        int(sent.is_complex), sent.analysis,
-                    ),
-                )
+            self._conn.execute(
+                """
+                UPDATE paragraphs
+                   SET cn_text = (SELECT group_concat(cn_text, ' ') FROM
+                                    (SELECT cn_text FROM sentences
+                                      WHERE paragraph_id = paragraphs.id ORDER BY seq))
+                 WHERE article_id = ? AND NOT derived & ?
+                """,
+                (article_id, normalize.CN_DERIVED),
+            )
+            refresh_article_hashes(self._conn, article_id)
+        self.commit()
 
-        conn.commit()
-        return article_id
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+    def update_metrics(
+        self,
+        article_ids: list[int] | None = None,
+        recompute: bool = False,
+        common: frozenset[str] | None = None,
+    ) -> metrics.MetricsStats:
+        """Compute readability metrics (see metrics.py) after committing pending writes."""
+        self.commit()
+        return metrics.update_metrics(self._conn, article_ids, recompute=recompute, common=common)
+
+    def update_word_index(
+        self,
+        article_ids: list[int] | None = None,
+        rebuild: bool = False,
+        vocab: wordindex.Vocabulary | None = None,
+    ) -> wordindex.WordIndexStats:
+        """Index articles by lemma (see wordindex.py) after committing pending writes."""
+        self.commit()
+        return wordindex.index_articles(self._conn, article_ids, rebuild=rebuild, vocab=vocab)
+
+    def update_glossary(
+        self,
+        translator,
+        article_ids: list[int] | None = None,
+        rebuild: bool = False,
+        limit: int | None = None,
+        vocab: wordindex.Vocabulary | None = None,
+        common: frozenset[str] | None = None,
+    ) -> glossary.GlossaryStats:
+        """Build article glossaries (see glossary.py) after committing pending writes."""
+        self.commit()
+        return glossary.update_glossary(
+            self._conn, translator, article_ids, rebuild=rebuild, limit=limit,
+            vocab=vocab, common=common,
+        )
+
+    def update_thumbnails(
+        self,
+        article_ids: list[int] | None = None,
+        limit: int | None = None,
+        retry: bool = False,
+        out_dir: Path = config.THUMBNAIL_DIR,
+        size: int = config.THUMBNAIL_SIZE,
+        fmt: str = config.THUMBNAIL_FORMAT,
+    ) -> thumbnails.ThumbnailStats:
+        """Make article image thumbnails (see thumbnails.py) after committing pending writes."""
+        self.commit()
+        return thumbnails.update_thumbnails(
+            self._conn, article_ids, limit=limit, retry=retry, out_dir=out_dir, size=size, fmt=fmt,
+        )
+
+    def thumbnail_status(
+        self, size: int = config.THUMBNAIL_SIZE, fmt: str = config.THUMBNAIL_FORMAT
+    ) -> dict[str, int]:
+        return thumbnails.thumbnail_status(self._conn, size, fmt)
+
+    def backfill(
+        self,
+        translator,
+        task: str = "translate",
+        sources: list[str] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        only_backend: str | None = None,
+        budget: int | None = None,
+        limit: int | None = None,
+        workers: int = backfill.WORKERS,
+        batch_size: int = backfill.BATCH_SENTENCES,
+        dry_run: bool = False,
+    ) -> backfill.BackfillStats:
+        """Re-translate / re-analyze stored sentences (see backfill.py) after committing pending writes."""
+        self.commit()
+        return backfill.backfill(
+            self._conn, translator, task, sources=sources, since=since, until=until,
+            only_backend=only_backend, budget=budget, limit=limit, workers=workers,
+            batch_size=batch_size, dry_run=dry_run,
+        )
+
+    def normalize(self, expand: bool = False, vacuum: bool = True) -> normalize.NormalizeStats:
+        """
+        Switch to normalized storage, or back with expand=True (see
+        normalize.py), converting the stored rows; VACUUM to shrink the file.
+        """
+        self.commit()
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_before = self.db_path.stat().st_size
+        stats = normalize.normalize(self._conn, expand=expand)
+        self.normalized = not expand
+        if vacuum:
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        stats.bytes_before = size_before
+        stats.bytes_after = self.db_path.stat().st_size
+        return stats
+
+    def example_sentences(
+        self, word: str, limit: int = 10, vocab: wordindex.Vocabulary | None = None
+    ) -> tuple[str, list[tuple[int, str]]]:
+        return wordindex.example_sentences(self._conn, word, limit, vocab=vocab)
+
+
+def init_db(db_path: Path = config.DB_PATH) -> None:
+    """Create the database and schema if they don't already exist."""
+    ArticleDB(db_path).close()
+    print(f"  DB ready: {db_path}")
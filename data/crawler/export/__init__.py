@@ -0,0 +1 @@
+# Shared machinery for the JSON exporters (export_web_json.py / export_json.py)
@@ -0,0 +1,138 @@
+"""
+Delta feed between web exports.
+
+Every export that adds, changes or removes an article bumps the export
+version stored in index/root.json, and the web output carries
+
+  changes/{from}-{to}.json  — {"from", "to", "added": [entry], "updated":
+                              [entry], "removed": [id]}, entries being index
+                              entries (metadata + paragraph_count), newest
+                              first; `to` is always the current version
+
+for each of the last MAX_DELTAS versions a client may still be on, so a
+client at version v fetches one file, changes/{v}-{current}.json, and applies
+it. Deltas are cumulative: each run merges its own step into the previous
+run's files instead of rereading old exports. A delta touching more than
+MAX_DELTA_SHARE of the corpus is not written (nor any older one) — clients
+that far behind, or older than the window, reload the index instead.
+
+An export whose content did not change keeps its version and rewrites the
+same delta files, so the OutputTree leaves them untouched.
+"""
+import json
+from pathlib import Path
+
+# Client versions behind the current one that still get a delta file
+MAX_DELTAS = 20
+# Past this share of all articles, a full index reload is the cheaper sync
+MAX_DELTA_SHARE = 0.5
+
+
+def delta_path(from_version: int, to_version: int) -> str:
+    return f"changes/{from_version}-{to_version}.json"
+
+
+def _empty() -> dict:
+    return {"added": {}, "updated": {}, "removed": set()}
+
+
+def _load(root: Path, rel: str) -> dict | None:
+    try:
+        with open(root / rel, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return {
+        "added": {e["id"]: e for e in data["added"]},
+        "updated": {e["id"]: e for e in data["updated"]},
+        "removed": set(data["removed"]),
+    }
+
+
+def merge(older: dict, newer: dict) -> dict:
+    """Combine two consecutive deltas into one spanning both."""
+    added, updated = dict(older["added"]), dict(older["updated"])
+    removed = set(older["removed"])
+    for article_id, entry in newer["added"].items():
+        if article_id in removed:
+            # Removed, then back (e.g. restored from a backup): net change
+            removed.discard(article_id)
+            updated[article_id] = entry
+        else:
+            added[article_id] = entry
+    for article_id, entry in newer["updated"].items():
+        (added if article_id in added else updated)[article_id] = entry
+    for article_id in newer["removed"]:
+        if added.pop(article_id, None) is None:
+            updated.pop(article_id, None)
+            removed.add(article_id)
+    return {"added": added, "updated": updated, "removed": removed}
+
+
+def _size(delta: dict) -> int:
+    return len(delta["added"]) + len(delta["updated"]) + len(delta["removed"])
+
+
+def _newest_first(entries: dict) -> list[dict]:
+    return sorted(entries.values(), key=lambda e: (e["crawled_at"], e["id"]), reverse=True)
+
+
+class ChangeFeed:
+    """
+    Collects one export run's changes and writes the delta files.
+
+        feed = ChangeFeed(root, previous_root_json)
+        feed.added(entry) / feed.updated(entry) / feed.removed(id)
+        version, from_versions = feed.write(tree, total)
+    """
+
+    def __init__(self, root: Path, previous: dict | None) -> None:
+        self.root = root
+        previous = previous or {}
+        self.previous_version: int = previous.get("export_version", 0)
+        self.previous_from: list[int] = previous.get("changes_from", [])
+        self.step = _empty()
+
+    def added(self, entry: dict) -> None:
+        self.step["added"][entry["id"]] = entry
+
+    def updated(self, entry: dict) -> None:
+        self.step["updated"][entry["id"]] = entry
+
+    def removed(self, article_id: int) -> None:
+        self.step["removed"].add(article_id)
+
+    def write(self, tree, total: int) -> tuple[int, list[int]]:
+        """
+        Write this run's delta files into `tree`. Returns the new export
+        version and the versions that have a delta to it, newest first.
+        """
+        if not self.previous_version:
+            return 1, []  # first versioned export: nothing to diff against
+        if not _size(self.step):
+            version, chain = self.previous_version, self.previous_from
+        else:
+            version = self.previous_version + 1
+            chain = [self.previous_version] + self.previous_from
+
+        limit = total * MAX_DELTA_SHARE
+        written: list[int] = []
+        for from_version in chain[:MAX_DELTAS]:
+            if from_version == self.previous_version:
+                delta = self.step
+            else:
+                older = _load(self.root, delta_path(from_version, self.previous_version))
+                if older is None:
+                    break
+                delta = merge(older, self.step)
+            if _size(delta) > limit:
+                break  # older deltas only grow: stop here
+            tree.write_json(delta_path(from_version, version), {
+                "from": from_version,
+                "to": version,
+                "added": _newest_first(delta["added"]),
+                "updated": _newest_first(delta["updated"]),
+                "removed": sorted(delta["removed"]),
+            })
+            written.append(from_version)
+        return version, written
@@ -0,0 +1,225 @@
+"""
+Columnar sentence corpus for analytics: Parquet (or Arrow IPC) by crawl month.
+
+One row per sentence, with its paragraph position and the article's
+metadata repeated alongside, partitioned Hive-style so any Arrow-based tool
+reads the directory as one table with a `month` column:
+
+  {out}/month=YYYY-MM/sentences.parquet   (or sentences.arrow)
+  {out}/_state.json                       — what each month was built from
+
+    import pyarrow.dataset as ds
+    t = ds.dataset("corpus", format="parquet", partitioning="hive").to_table()
+
+    duckdb -c "SELECT source, avg(is_complex::INT) FROM 'corpus/*/*.parquet'
+               GROUP BY source"
+
+Each month is read with one streaming join and converted to Arrow a batch of
+rows at a time (no Python object per article or sentence), so memory stays
+bounded by the batch. Runs are incremental by month: archived partitions
+(see crawler/archive.py) are immutable, so a month exported from a partition
+is skipped while the partition file is unchanged; hot months, which the
+crawler still writes to, are rewritten on each run. Months that disappeared
+are deleted. Every file is written to a temp name and renamed into place.
+
+Needs pyarrow: pip install pyarrow
+
+Usage (from data/ directory):
+    python run_crawler.py export --columnar ../corpus
+    python run_crawler.py export --columnar ../corpus --columnar-format arrow
+"""
+import json
+import shutil
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+
+from ..archive import Corpus, partition_path
+from .files import atomic_stream, atomic_write_bytes
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+STATE_NAME = "_state.json"
+STATE_VERSION = 1
+
+# Sentences per Arrow record batch (and Parquet row group)
+BATCH_ROWS = 65_536
+
+# (column, SQL expression, Arrow type name). Repeated strings such as source
+# are dictionary-encoded by Parquet on disk. Word count is spaces + 1, which
+# matches str.split() for the single-spaced text the analyzer stores.
+COLUMNS = (
+    ("article_id", "a.id", "int64"),
+    ("source", "a.source", "string"),
+    ("difficulty", "a.difficulty", "string"),
+    ("category", "a.category", "string"),
+    ("title", "a.title", "string"),
+    ("author", "a.author", "string"),
+    ("published_at", "a.published_at", "string"),
+    ("crawled_at", "a.crawled_at", "string"),
+    ("paragraph_id", "p.id", "int64"),
+    ("paragraph_seq", "p.seq", "int32"),
+    ("sentence_id", "s.id", "int64"),
+    ("sentence_seq", "s.seq", "int32"),
+    ("en_text", "s.en_text", "string"),
+    ("cn_text", "coalesce(s.cn_text, '')", "string"),
+    ("is_complex", "s.is_complex != 0", "bool"),
+    ("analysis", "unpack_analysis(s.analysis)", "string"),
+    ("en_chars", "length(s.en_text)", "int32"),
+    ("cn_chars", "length(coalesce(s.cn_text, ''))", "int32"),
+    ("en_words", "length(s.en_text) - length(replace(s.en_text, ' ', '')) + 1", "int32"),
+)
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa  # type: ignore
+    except ImportError:
+        raise RuntimeError(
+            "The 'pyarrow' package is required for the columnar export.\n"
+            "Install it with: pip install pyarrow"
+        )
+    return pa
+
+
+def _schema(pa):
+    types = {
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "bool": pa.bool_(),
+        "string": pa.string(),
+    }
+    return pa.schema([(name, types[kind]) for name, _, kind in COLUMNS])
+
+
+def _month_sql(schema: str) -> str:
+    cols = ",\n               ".join(f"{expr} AS {name}" for name, expr, _ in COLUMNS)
+    # Range on crawled_at itself so idx_articles_crawled drives the join
+    return f"""SELECT {cols}
+          FROM {schema}.articles a
+          JOIN {schema}.paragraphs p ON p.article_id = a.id
+          JOIN {schema}.sentences  s ON s.paragraph_id = p.id
+         WHERE a.crawled_at >= ? AND a.crawled_at < ?
+         ORDER BY a.crawled_at DESC, a.id, p.seq, s.seq"""
+
+
+def _next_month(month: str) -> str:
+    y, m = map(int, month.split("-"))
+    return f"{y + m // 12:04d}-{m % 12 + 1:02d}"
+
+
+def _batches(conn, schema: str, month: str, pa, arrow_schema):
+    """Yield the month's sentences as Arrow record batches."""
+    cur = conn.execute(_month_sql(schema), (month, _next_month(month)))
+    while rows := cur.fetchmany(BATCH_ROWS):
+        columns = zip(*rows)
+        arrays = []
+        for (name, _, kind), values in zip(COLUMNS, columns):
+            if kind == "bool":
+                arrays.append(pa.array(values, pa.int8()).cast(pa.bool_()))
+            else:
+                arrays.append(pa.array(values, arrow_schema.field(name).type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+
+def _write_month(path: Path, batches, fmt: str, pa, arrow_schema) -> int:
+    """Stream batches into `path` atomically. Returns the row count."""
+    rows = 0
+    with atomic_stream(path) as f:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq  # type: ignore
+            writer = pq.ParquetWriter(f, arrow_schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_file(f, arrow_schema)
+        with writer:
+            for batch in batches:
+                if fmt == "parquet":
+                    writer.write_batch(batch, row_group_size=BATCH_ROWS)
+                else:
+                    writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+
+def _load_state(out_dir: Path) -> dict:
+    try:
+        with open(out_dir / STATE_NAME, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if state.get("version") == STATE_VERSION else {}
+
+
+@dataclass
+class ColumnarStats:
+    written: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    rows: int = 0
+
+
+def export_columnar(db_path: Path, out_dir: Path, fmt: str = "parquet") -> ColumnarStats:
+    """Write (or refresh) the sentence corpus under out_dir, one file per month."""
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"unknown columnar format {fmt!r} (expected one of {COLUMNAR_FORMATS})")
+    pa = _pyarrow()
+    arrow_schema = _schema(pa)
+    file_name = f"sentences.{fmt}"
+
+    old = _load_state(out_dir)
+    old_months = old.get("months", {}) if old.get("format") == fmt else {}
+    months: dict[str, dict] = {}
+    stats = ColumnarStats()
+
+    with Corpus(db_path) as corpus:
+        hot = corpus.hot_months()
+        archived = set(corpus.archived_months())
+        for month in corpus.months():
+            path = out_dir / f"month={month}" / file_name
+            if month in hot:
+                source = "hot"
+            else:
+                part = partition_path(corpus.archive_dir, month).stat()
+                source = f"partition:{part.st_size}:{part.st_mtime_ns}"
+                prev = old_months.get(month)
+                if prev and prev["source"] == source and path.exists():
+                    months[month] = prev
+                    stats.skipped.append(month)
+                    continue
+
+            with ExitStack() as stack:
+                # A month crawled into again after it was archived is in both
+                schemas = ["main"] if month in hot else []
+                if month in archived:
+                    schemas.append(stack.enter_context(corpus.attached(month)))
+                batches = chain.from_iterable(
+                    _batches(corpus.conn, schema, month, pa, arrow_schema) for schema in schemas
+                )
+                rows = _write_month(path, batches, fmt, pa, arrow_schema)
+            months[month] = {"source": source, "rows": rows}
+            stats.written.append(month)
+            stats.rows += rows
+
+    # Months gone from the corpus, and files left over from the other format
+    if out_dir.is_dir():
+        for d in sorted(out_dir.glob("month=*")):
+            month = d.name[len("month="):]
+            if month not in months:
+                shutil.rmtree(d)
+                stats.removed.append(month)
+                continue
+            for f in d.iterdir():
+                if f.name != file_name:
+                    f.unlink()
+
+    atomic_write_bytes(out_dir / STATE_NAME, json.dumps(
+        {"version": STATE_VERSION, "format": fmt, "months": dict(sorted(months.items(), reverse=True))},
+        indent=2,
+    ).encode("utf-8"))
+
+    total = sum(m["rows"] for m in months.values())
+    print(f"  Columnar corpus: {total} sentences in {len(months)} months → {out_dir}")
+    print(f"    Written  : {len(stats.written)} months ({stats.rows} sentences)")
+    print(f"    Unchanged: {len(stats.skipped)} archived months")
+    print(f"    Removed  : {len(stats.removed)} months")
+    return stats
@@ -0,0 +1,110 @@
+"""
+Precompressed siblings for exported files.
+
+precompress() writes `name.json.gz` and/or `name.json.br` next to every JSON
+file of an OutputTree, so a static host or CDN can serve them with
+`Content-Encoding` instead of compressing on each request. Siblings are
+tracked in the manifest like any other file:
+
+  - only files whose content changed this run (or whose sibling is missing)
+    are compressed; the others keep their existing siblings
+  - siblings of deleted files are pruned with them, and turning compression
+    off removes all siblings on the next run
+
+Compression runs in a thread pool — zlib and brotli release the GIL while
+compressing. Brotli is optional: pip install brotli
+"""
+import gzip
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .files import OutputTree
+
+FORMATS = ("gz", "br")
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps the output deterministic, so unchanged input → unchanged hash
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _compressor(fmt: str) -> Callable[[bytes], bytes]:
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown compression format {fmt!r} (expected one of {FORMATS})")
+    if fmt == "gz":
+        return _gzip
+    try:
+        import brotli  # type: ignore
+    except ImportError:
+        raise RuntimeError(
+            "The 'brotli' package is required for .br output.\n"
+            "Install it with: pip install brotli"
+        )
+    return lambda data: brotli.compress(data, quality=11)
+
+
+def check_formats(formats: tuple[str, ...]) -> None:
+    """Fail early (before an export starts) if a format is unknown or unavailable."""
+    for fmt in formats:
+        _compressor(fmt)
+
+
+@dataclass
+class CompressStats:
+    files: int = 0                     # source files compressed this run
+    kept: int = 0                      # siblings reused from the previous run
+    raw_bytes: int = 0
+    out_bytes: dict[str, int] = field(default_factory=dict)  # fmt → bytes
+
+    def summary(self) -> list[str]:
+        lines = [f"    Compressed: {self.files} files ({self.kept} siblings unchanged)"]
+        if not self.files:
+            return lines
+        for fmt, size in self.out_bytes.items():
+            saved = 1 - size / self.raw_bytes if self.raw_bytes else 0.0
+            lines.append(
+                f"      .{fmt}: {self.raw_bytes / 1024:.0f} KB → {size / 1024:.0f} KB ({saved:.0%} smaller)"
+            )
+        return lines
+
+
+def precompress(
+    tree: OutputTree,
+    formats: tuple[str, ...] = FORMATS,
+    workers: int | None = None,
+    suffix: str = ".json",
+) -> CompressStats:
+    """
+    Write compressed siblings for every `suffix` file written this run.
+    Call after all files are written and before tree.finish().
+    """
+    compressors = {fmt: _compressor(fmt) for fmt in formats}
+    changed = set(tree.changed)
+    stats = CompressStats(out_bytes={fmt: 0 for fmt in formats})
+
+    todo: list[str] = []
+    for rel in tree.files():
+        if not rel.endswith(suffix):
+            continue
+        siblings = [f"{rel}.{fmt}" for fmt in formats]
+        if rel not in changed and all(tree.is_tracked(s) for s in siblings):
+            for s in siblings:
+                tree.keep(s)
+            stats.kept += len(siblings)
+        else:
+            todo.append(rel)
+
+    def compress(rel: str) -> tuple[str, int, dict[str, bytes]]:
+        data = (tree.root / rel).read_bytes()
+        return rel, len(data), {fmt: fn(data) for fmt, fn in compressors.items()}
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for rel, raw_len, outputs in pool.map(compress, todo):
+            stats.files += 1
+            stats.raw_bytes += raw_len
+            for fmt, data in outputs.items():
+                stats.out_bytes[fmt] += len(data)
+                tree.write(f"{rel}.{fmt}", data)
+    return stats
@@ -0,0 +1,116 @@
+"""
+Streaming export engine.
+
+run_export() walks the hot DB and every archived partition once, newest
+first, reading full articles in batches (see queries.py), and hands each
+article to every layout (see layouts.py). Several layouts therefore share one
+pass over the database, and peak memory is one batch of articles regardless
+of corpus size.
+
+Usage (from data/ directory):
+    python run_crawler.py export --web ../article-data               # web app only
+    python run_crawler.py export --db ../articles.db --web ../article-data --daily .
+    python run_crawler.py export --web ../article-data --packs ../article-packs
+    python run_crawler.py export --web ../article-data --workers 4   # see parallel.py
+    python run_crawler.py export --columnar ../corpus                 # see columnar.py
+
+With --web, the word-list shards of the lemma index (see words.py) are
+written to DIR/words/ as well when vocab.db is available.
+"""
+import argparse
+import sqlite3
+from contextlib import ExitStack
+from pathlib import Path
+
+from .. import config
+from ..archive import Corpus
+from ..wordindex import load_vocabulary
+from .columnar import COLUMNAR_FORMATS, export_columnar
+from .layouts import DETAIL_FORMATS, DailyLayout, Layout, PackLayout, WebLayout
+from .parallel import print_worker_stats, run_parallel_web
+from .queries import iter_articles
+from .words import export_words
+
+
+def run_export(db_path: Path, layouts: list[Layout], workers: int = 1, threads: bool = False) -> int:
+    """
+    Feed every article in db_path (and its archive) to `layouts`. Returns the count.
+
+    With workers > 1, web layouts are exported by a worker pool (see
+    parallel.py), each on its own; the other layouts then share one
+    sequential pass.
+    """
+    if workers > 1:
+        n = 0
+        for layout in layouts:
+            if isinstance(layout, WebLayout):
+                n, per_worker = run_parallel_web(db_path, layout, workers, threads)
+                print_worker_stats(per_worker)
+        rest = [layout for layout in layouts if not isinstance(layout, WebLayout)]
+        return run_export(db_path, rest) if rest else n
+
+    n = 0
+    with Corpus(db_path) as corpus, ExitStack() as stack:
+        corpus.conn.row_factory = sqlite3.Row
+        for layout in layouts:
+            stack.enter_context(layout)
+
+        def skip_body(article: dict) -> bool:
+            return not any(layout.needs_body(article) for layout in layouts)
+
+        # Hot DB first, then partitions newest month first: crawled_at DESC overall
+        for schema in corpus.schemas():
+            for article in iter_articles(corpus.conn, schema, skip_body=skip_body):
+                for layout in layouts:
+                    layout.add(article)
+                n += 1
+    return n
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--web", type=Path, metavar="DIR",
+                        help="Write the web app layout (index/ + detail/) into DIR")
+    parser.add_argument("--daily", type=Path, metavar="DIR",
+                        help="Write the per-date layout (articles/YYYY/MM/DD.json) into DIR")
+    parser.add_argument("--packs", type=Path, metavar="DIR",
+                        help="Write detail JSON into monthly pack files in DIR (see packs.py)")
+    parser.add_argument("--columnar", type=Path, metavar="DIR",
+                        help="Write the sentence corpus as Parquet files by month into DIR (needs pyarrow)")
+    parser.add_argument("--columnar-format", choices=COLUMNAR_FORMATS, default="parquet",
+                        help="--columnar file format: parquet (default) or arrow (Arrow IPC)")
+    parser.add_argument("--detail-format", choices=DETAIL_FORMATS, default="compact",
+                        help="Web detail files: compact (default) or the original full format")
+    parser.add_argument("--compress", default="", metavar="gz,br",
+                        help="Also write precompressed .gz and/or .br siblings of web files")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Write web detail files with N worker processes (output is identical)")
+    parser.add_argument("--threads", action="store_true",
+                        help="With --workers: use threads instead of processes")
+    parser.add_argument("--vocab", type=Path, default=config.VOCAB_DB_PATH,
+                        help="vocab.db for the --web word-list shards (skipped if missing)")
+
+
+def cli(args: argparse.Namespace) -> None:
+    if not args.db.exists():
+        print(f"  {args.db} not found.")
+        return
+    layouts: list[Layout] = []
+    if args.web:
+        compress = tuple(f.strip() for f in args.compress.split(",") if f.strip())
+        layouts.append(WebLayout(args.web, detail_format=args.detail_format, compress=compress))
+    if args.packs:
+        layouts.append(PackLayout(args.packs, detail_format=args.detail_format))
+    if args.daily:
+        layouts.append(DailyLayout(args.daily))
+    if not layouts and not args.columnar:
+        print("  Nothing to export: pass --web, --packs, --daily and/or --columnar DIR.")
+        return
+    if layouts:
+        run_export(args.db, layouts, workers=args.workers, threads=args.threads)
+    if args.web:
+        export_words(args.db, args.web / "words", load_vocabulary(args.vocab))
+    if args.columnar:
+        export_columnar(args.db, args.columnar, args.columnar_format)
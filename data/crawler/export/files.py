@@ -0,0 +1,236 @@
+"""
+Incrementally maintained export directories.
+
+An OutputTree tracks every file it owns in `manifest.json` (path → SHA-1 of
+the content) and, for files built from a database row, the key of what they
+were built from (path → source key, e.g. the article's content_hash). On
+each export run:
+
+  - source_unchanged() tells a caller that a file's source key is the same
+    as last run, so it can keep() the file without building it at all
+  - write() skips files whose content hash is unchanged, and replaces the
+    others atomically (temp file + rename), so readers never see a partial
+    file and unchanged files keep their mtime
+  - finish() deletes owned files that were not written this run (articles
+    removed from the DB) and saves the new manifest
+
+A daily export therefore touches only new or changed articles, which keeps
+the git diff and the deploy upload proportional to the day's changes.
+"""
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+MANIFEST_NAME = "manifest.json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def encode_json(obj, indent: int | None = None) -> bytes:
+    """The exact bytes OutputTree.write_json() writes for `obj`."""
+    return json.dumps(obj, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write `data` to `path` via a temp file in the same directory + rename."""
+    with atomic_stream(path) as f:
+        f.write(data)
+
+
+@contextmanager
+def atomic_stream(path: Path) -> Iterator[BinaryIO]:
+    """
+    Yield a binary file that replaces `path` when the block exits cleanly.
+    On an exception the temp file is removed and `path` is left untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class _HashingWriter:
+    """Binary file wrapper that hashes everything written through it."""
+
+    def __init__(self, f: BinaryIO) -> None:
+        self._f = f
+        self._hash = hashlib.sha1()
+
+    def write(self, data: bytes) -> int:
+        self._hash.update(data)
+        return self._f.write(data)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+@dataclass
+class ExportStats:
+    written: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+
+class OutputTree:
+    """
+    A directory of generated files plus its manifest.
+
+    Args:
+        root:       Output directory (e.g. article-data/).
+        prune_dirs: Sub-directories owned entirely by the exporter. Files in
+                    them that are neither in the manifest nor written this run
+                    are deleted too, so a first run without a manifest still
+                    cleans up stale output.
+    """
+
+    def __init__(self, root: Path, prune_dirs: tuple[str, ...] = ()) -> None:
+        self.root = root
+        self.prune_dirs = prune_dirs
+        self.stats = ExportStats()
+        self.changed: list[str] = []
+        self._old, self._old_sources = self._load_manifest()
+        self._new: dict[str, str] = {}
+        self._new_sources: dict[str, str] = {}
+
+    def _load_manifest(self) -> tuple[dict[str, str], dict[str, str]]:
+        try:
+            with open(self.root / MANIFEST_NAME, encoding="utf-8") as f:
+                manifest = json.load(f)
+            return manifest["files"], manifest.get("sources", {})
+        except (OSError, ValueError, KeyError):
+            return {}, {}
+
+    def _unchanged(self, rel: str, digest: str) -> bool:
+        self._new[rel] = digest
+        path = self.root / rel
+        old = self._old.get(rel)
+        if old is None and path.exists():
+            # No manifest entry (first incremental run): compare with the file itself
+            old = content_hash(path.read_bytes())
+        if old == digest and path.exists():
+            self.stats.unchanged += 1
+            return True
+        self.stats.written += 1
+        self.changed.append(rel)
+        return False
+
+    def write(self, rel: str, data: bytes, digest: str | None = None, source: str | None = None) -> bool:
+        """
+        Write `data` to root/rel unless identical. Returns True if written.
+        `digest` may pass content_hash(data) if the caller already has it;
+        `source` is the key of what `data` was built from (see
+        source_unchanged()).
+        """
+        if source:
+            self._new_sources[rel] = source
+        if self._unchanged(rel, digest or content_hash(data)):
+            return False
+        atomic_write_bytes(self.root / rel, data)
+        return True
+
+    def record(self, rel: str, digest: str, written: bool, source: str | None = None) -> None:
+        """Account for a file another process wrote (or left unchanged) this run."""
+        self._new[rel] = digest
+        if source:
+            self._new_sources[rel] = source
+        if written:
+            self.stats.written += 1
+            self.changed.append(rel)
+        else:
+            self.stats.unchanged += 1
+
+    @contextmanager
+    def stream(self, rel: str) -> Iterator[BinaryIO]:
+        """
+        Like write(), for content produced piecemeal: yields a binary file
+        backed by a temp file, which replaces root/rel on exit unless the
+        finished content hashes the same as the current file.
+        """
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_path(path)
+        try:
+            with open(tmp, "wb") as f:
+                writer = _HashingWriter(f)
+                yield writer
+            if self._unchanged(rel, writer.hexdigest()):
+                tmp.unlink()
+            else:
+                os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def files(self) -> list[str]:
+        """Paths written or confirmed unchanged so far this run."""
+        return list(self._new)
+
+    def is_tracked(self, rel: str) -> bool:
+        """True if root/rel exists and is in the previous run's manifest."""
+        return rel in self._old and (self.root / rel).exists()
+
+    def previous_files(self) -> list[str]:
+        """Paths in the previous run's manifest."""
+        return list(self._old)
+
+    def previous_digest(self, rel: str) -> str:
+        """Content hash of root/rel in the previous run's manifest."""
+        return self._old[rel]
+
+    def source_unchanged(self, rel: str, source: str | None) -> bool:
+        """
+        True if root/rel is tracked and was built from the same `source` key
+        last run, so building it again would give the same bytes.
+        """
+        return bool(source) and self._old_sources.get(rel) == source and self.is_tracked(rel)
+
+    def keep(self, rel: str, source: str | None = None) -> None:
+        """Keep a tracked file from the previous run without rewriting it."""
+        self._new[rel] = self._old[rel]
+        if source:
+            self._new_sources[rel] = source
+        self.stats.unchanged += 1
+
+    def write_json(self, rel: str, obj, indent: int | None = None) -> bool:
+        return self.write(rel, encode_json(obj, indent))
+
+    def finish(self) -> ExportStats:
+        """Delete files that were not written this run and save the manifest."""
+        stale = set(self._old) - set(self._new)
+        for d in self.prune_dirs:
+            base = self.root / d
+            if base.is_dir():
+                stale |= {
+                    p.relative_to(self.root).as_posix()
+                    for p in base.iterdir()
+                    if p.is_file() and not p.name.startswith(".")
+                } - set(self._new)
+
+        for rel in sorted(stale):
+            (self.root / rel).unlink(missing_ok=True)
+            self.stats.deleted += 1
+
+        manifest = {"files": dict(sorted(self._new.items()))}
+        if self._new_sources:
+            manifest["sources"] = dict(sorted(self._new_sources.items()))
+        atomic_write_bytes(
+            self.root / MANIFEST_NAME,
+            json.dumps(manifest, ensure_ascii=False, indent=0).encode("utf-8"),
+        )
+        return self.stats
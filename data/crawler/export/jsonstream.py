@@ -0,0 +1,67 @@
+"""
+Incremental JSON writer for documents of the form {..., "items": [ ... ]}.
+
+JsonArrayWriter writes the scalar head fields, then each array item as it is
+appended, so the whole array never has to be in memory. The bytes produced
+are identical to json.dump() of the complete object with the same indent,
+which keeps existing exports and their content hashes stable.
+"""
+import json
+from typing import Any, BinaryIO
+
+
+class JsonArrayWriter:
+    """
+    Stream `{**head, array_key: [items...]}` to a binary file.
+
+    The array must be the last key of a top-level object, which is the shape
+    of every export file (index.json, YYYY/MM/DD.json, ...).
+
+        with open(path, "wb") as f:
+            w = JsonArrayWriter(f, {"date": "2026-01-05"}, "articles", indent=2)
+            for article in articles:
+                w.append(article)
+            w.close()
+    """
+
+    def __init__(
+        self,
+        fp: BinaryIO,
+        head: dict[str, Any],
+        array_key: str,
+        indent: int | None = None,
+    ) -> None:
+        self._fp = fp
+        self._indent = indent
+        self._count = 0
+
+        # Render the object with an empty array and split around it, so the
+        # head is formatted exactly as json.dumps would format it
+        text = json.dumps({**head, array_key: []}, ensure_ascii=False, indent=indent)
+        cut = text.rindex("[]")
+        self._prefix, self._suffix = text[:cut] + "[", text[cut + 2:]
+        if indent is None:
+            self._item_sep, self._item_pad, self._close = ", ", "", "]"
+        else:
+            pad = "\n" + " " * (2 * indent)
+            self._item_sep, self._item_pad, self._close = ",", pad, "\n" + " " * indent + "]"
+
+        self._fp.write(self._prefix.encode("utf-8"))
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def append(self, item: Any) -> None:
+        text = json.dumps(item, ensure_ascii=False, indent=self._indent)
+        if self._item_pad:
+            # Nest the item two levels deep (object → array)
+            text = text.replace("\n", self._item_pad)
+        sep = self._item_sep if self._count else ""
+        self._fp.write((sep + self._item_pad + text).encode("utf-8"))
+        self._count += 1
+
+    def close(self) -> None:
+        """Terminate the array and the object. Does not close the file."""
+        close = self._close if self._count else "]"
+        self._fp.write((close + self._suffix).encode("utf-8"))
@@ -0,0 +1,501 @@
+"""
+Output layouts for the export engine.
+
+A layout receives every article once, newest first, and writes it out as it
+arrives, holding at most one day's or month's index entries at a time.
+Layouts are context managers: entering opens their streamed files, a clean
+exit finalizes them, and an exception leaves the previous output in place.
+
+  WebLayout    article-data/ for the Next.js app: index/ shards + detail/{id}.json
+  PackLayout   detail JSON packed into one append-only file per month
+  DailyLayout  data/articles/YYYY/MM/DD.json + data/index.json (date index)
+"""
+import json
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .changes import ChangeFeed
+from .compress import check_formats, precompress
+from .files import OutputTree, atomic_stream, content_hash, encode_json
+from .jsonstream import JsonArrayWriter
+from .packs import PackWriter
+
+
+class Layout(ABC):
+    """Base class: subclasses implement open(), add() and finish()."""
+
+    def __enter__(self) -> "Layout":
+        self._stack = ExitStack()
+        self._stack.__enter__()
+        self.open(self._stack)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Close streamed files first (committing them, or discarding their
+        # temp files on error), then finalize
+        self._stack.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.finish()
+
+    def open(self, stack: ExitStack) -> None:
+        """Open files that stay open for the whole run; register them on `stack`."""
+
+    def needs_body(self, article: dict) -> bool:
+        """
+        Whether add() needs the article's "paragraphs" (see iter_articles()'s
+        `skip_body`); without them it gets "paragraph_count" instead.
+        """
+        return True
+
+    @abstractmethod
+    def add(self, article: dict) -> None:
+        """Write one article (columns + "paragraphs" → "sentences")."""
+
+    @abstractmethod
+    def finish(self) -> None:
+        """Called once after every article was added and streams are closed."""
+
+
+# ── Web app layout ────────────────────────────────────────────────────────────
+
+METRIC_FIELDS = ("word_count", "fk_grade", "ttr", "rare_rate")
+
+
+def article_meta(article: dict) -> dict:
+    """Metadata fields shared by index entries and detail files."""
+    meta = {
+        "id": article["id"],
+        "source": article["source"],
+        "url": article["url"],
+        "title": article["title"],
+        "title_cn": article["title_cn"] or "",
+        "author": article["author"] or "",
+        "published_at": article["published_at"] or "",
+        "category": article["category"] or "",
+        "difficulty": article["difficulty"] or "cet6",
+        # The local thumbnail (crawler/thumbnails.py) rather than the original
+        "image_url": article.get("thumbnail") or article["image_url"] or "",
+        "crawled_at": article["crawled_at"],
+    }
+    # Readability metrics (crawler/metrics.py), once computed; partitions
+    # archived before migration 5 have no such columns
+    for key in METRIC_FIELDS:
+        if article.get(key) is not None:
+            meta[key] = article[key]
+    return meta
+
+
+def _glossary(article: dict) -> dict:
+    """{"glossary": {term: cn}} for detail files, if the article has one."""
+    glossary = article.get("glossary")
+    return {"glossary": glossary} if glossary else {}
+
+
+def article_detail(article: dict) -> dict:
+    """Full article for detail/{id}.json."""
+    paragraphs = [
+        {
+            "id": para["id"],
+            "article_id": para["article_id"],
+            "seq": para["seq"],
+            "en_text": para["en_text"],
+            "cn_text": para["cn_text"] or "",
+            "sentences": [
+                {
+                    "id": sent["id"],
+                    "paragraph_id": sent["paragraph_id"],
+                    "seq": sent["seq"],
+                    "en_text": sent["en_text"],
+                    "cn_text": sent["cn_text"] or "",
+                    "is_complex": bool(sent["is_complex"]),
+                    "analysis": sent["analysis"] or "",
+                }
+                for sent in para["sentences"]
+            ],
+        }
+        for para in article["paragraphs"]
+    ]
+    return {**article_meta(article), **_glossary(article), "paragraphs": paragraphs}
+
+
+def index_entry(article: dict) -> dict:
+    """One article in an index shard: metadata plus its paragraph count."""
+    if "paragraphs" in article:
+        count = len(article["paragraphs"])
+    else:
+        count = article["paragraph_count"]
+    return {**article_meta(article), "paragraph_count": count}
+
+
+def detail_rel(article_id: int) -> str:
+    return f"detail/{article_id}.json"
+
+
+def detail_key(article: dict, detail_format: str) -> str | None:
+    """
+    Key of everything a detail file is built from: articles.content_hash
+    covers the title and the sentences (and the paragraph text written with
+    them), the rest is the metadata and glossary from the article row. None
+    for rows without a content hash, which are always rebuilt.
+    """
+    if not article.get("content_hash"):
+        return None
+    return content_hash(encode_json([
+        detail_format, COMPACT_DETAIL_VERSION, article["content_hash"],
+        article_meta(article), article.get("glossary") or {},
+    ]))
+
+
+# Detail file formats. "full" is the original one-object-per-row layout;
+# "compact" (format 2) stores each sentence once with short keys, omits ids,
+# seq and empty values, and leaves paragraph text to be rebuilt by the
+# reader — expandDetail() in src/lib/article-actions.ts.
+DETAIL_FORMATS = ("compact", "full")
+COMPACT_DETAIL_VERSION = 2
+
+
+def article_detail_compact(article: dict) -> dict:
+    """
+    Compact detail: {"format": 2, ...meta, "paragraphs": [{"sentences": [...]}]}.
+
+    A sentence is {"en", "cn"?, "complex"?, "analysis"?}. Paragraph "en" /
+    "cn" are only stored when they differ from the sentences joined by a
+    space, which is how the crawler builds them; paragraphs without
+    sentences always store their text.
+    """
+    paragraphs = []
+    for para in article["paragraphs"]:
+        sentences = []
+        for sent in para["sentences"]:
+            compact = {"en": sent["en_text"]}
+            if sent["cn_text"]:
+                compact["cn"] = sent["cn_text"]
+            if sent["is_complex"]:
+                compact["complex"] = True
+            if sent["analysis"]:
+                compact["analysis"] = sent["analysis"]
+            sentences.append(compact)
+
+        entry: dict = {}
+        en_text, cn_text = para["en_text"], para["cn_text"] or ""
+        if en_text != " ".join(s["en_text"] for s in para["sentences"]):
+            entry["en"] = en_text
+        if cn_text != " ".join(s["cn_text"] or "" for s in para["sentences"]):
+            entry["cn"] = cn_text
+        entry["sentences"] = sentences
+        paragraphs.append(entry)
+
+    return {
+        "format": COMPACT_DETAIL_VERSION,
+        **article_meta(article),
+        **_glossary(article),
+        "paragraphs": paragraphs,
+    }
+
+
+# detail_format → function building the detail object
+DETAIL_ENCODERS = {"compact": article_detail_compact, "full": article_detail}
+
+
+def build_month_shard(month: str, entries: list[dict]) -> tuple[dict, dict]:
+    """
+    Build index/{month}.json from that month's index entries (newest first)
+    and the month's summary for index/root.json.
+    """
+    ids: dict[str, dict[str, list[int]]] = {"source": {}, "difficulty": {}, "day": {}}
+    counts: dict[str, dict[str, int]] = {}
+    for e in entries:
+        day = e["crawled_at"][:10]
+        ids["source"].setdefault(e["source"], []).append(e["id"])
+        ids["difficulty"].setdefault(e["difficulty"], []).append(e["id"])
+        ids["day"].setdefault(day, []).append(e["id"])
+        by_diff = counts.setdefault(e["source"], {})
+        by_diff[e["difficulty"]] = by_diff.get(e["difficulty"], 0) + 1
+
+    shard = {"month": month, "articles": entries, "ids": ids}
+    summary = {
+        "month": month,
+        "count": len(entries),
+        "counts": counts,  # source → difficulty → articles
+        "days": [{"date": d, "count": len(v)} for d, v in ids["day"].items()],
+    }
+    return shard, summary
+
+
+class WebLayout(Layout):
+    """
+    article-data/index/root.json      — article counts per month and day, and
+                                        per source × difficulty within each month
+    article-data/index/YYYY-MM.json   — that month's article metadata, newest
+                                        first, plus ordered id lists per source,
+                                        difficulty and day
+    article-data/detail/{id}.json     — full article (compact format unless
+                                        detail_format="full")
+    article-data/changes/{v}-{n}.json — what changed since export version v,
+                                        for clients syncing to version n (see
+                                        changes.py)
+    article-data/**.json.gz / .br     — optional precompressed siblings
+    article-data/manifest.json        — see OutputTree
+
+    The root grows with the number of months only, so the web app's cold
+    start and list pages stay cheap however large the archive gets; a list
+    page opens just the shards its page window falls into.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(
+        self,
+        output_dir: Path,
+        detail_format: str = "compact",
+        compress: tuple[str, ...] = (),
+        compress_workers: int | None = None,
+    ) -> None:
+        if detail_format not in DETAIL_FORMATS:
+            raise ValueError(f"unknown detail format {detail_format!r}")
+        check_formats(compress)
+        self.compress = compress
+        self.compress_workers = compress_workers
+        self.output_dir = output_dir
+        self.detail_format = detail_format
+        self.tree = OutputTree(output_dir, prune_dirs=("changes", "detail", "index"))
+        self.changes = ChangeFeed(output_dir, self._load_root())
+        self._detail = DETAIL_ENCODERS[detail_format]
+        self._month: str | None = None
+        self._entries: list[dict] = []
+        self._months: list[dict] = []
+
+    def _load_root(self) -> dict | None:
+        try:
+            with open(self.output_dir / "index" / "root.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _flush_month(self) -> None:
+        if not self._entries:
+            return
+        shard, summary = build_month_shard(self._month, self._entries)
+        self.tree.write_json(f"index/{self._month}.json", shard)
+        self._months.append(summary)
+        self._entries = []
+
+    def _add_entry(self, entry: dict) -> None:
+        month = entry["crawled_at"][:7]
+        if month != self._month:
+            self._flush_month()
+            if any(m["month"] == month for m in self._months):
+                raise RuntimeError(f"articles for {month} arrived out of order")
+            self._month = month
+        self._entries.append(entry)
+
+    def _note_change(self, entry: dict, existed: bool, written: bool) -> None:
+        # The detail holds all of the entry's fields, so this catches metadata changes too
+        if written:
+            if existed:
+                self.changes.updated(entry)
+            else:
+                self.changes.added(entry)
+
+    def needs_body(self, article: dict) -> bool:
+        # An article whose content hash, metadata and glossary are as last run
+        # keeps its detail file without being read or serialized again
+        key = detail_key(article, self.detail_format)
+        return not self.tree.source_unchanged(detail_rel(article["id"]), key)
+
+    def add(self, article: dict) -> None:
+        entry = index_entry(article)
+        self._add_entry(entry)
+        rel = detail_rel(article["id"])
+        key = detail_key(article, self.detail_format)
+        if self.tree.source_unchanged(rel, key):
+            self.tree.keep(rel, key)
+            return
+        existed = self.tree.is_tracked(rel)
+        written = self.tree.write(rel, encode_json(self._detail(article)), source=key)
+        self._note_change(entry, existed, written)
+
+    def add_written(
+        self, entry: dict, digest: str, written: bool, existed: bool, source: str | None = None,
+    ) -> None:
+        """
+        Like add(), for an article whose detail file a worker already wrote
+        (see parallel.py): `digest` is the file's content hash, `written`
+        whether it changed, `existed` whether it was tracked before and
+        `source` its detail_key().
+        """
+        self._add_entry(entry)
+        self.tree.record(detail_rel(entry["id"]), digest, written, source)
+        self._note_change(entry, existed, written)
+
+    def finish(self) -> None:
+        self._flush_month()
+        sources: dict[str, int] = defaultdict(int)
+        difficulties: dict[str, int] = defaultdict(int)
+        for m in self._months:
+            for source, by_diff in m["counts"].items():
+                for difficulty, n in by_diff.items():
+                    sources[source] += n
+                    difficulties[difficulty] += n
+        total = sum(m["count"] for m in self._months)
+
+        exported = set(self.tree.files())
+        for rel in self.tree.previous_files():
+            if rel.startswith("detail/") and rel.endswith(".json") and rel not in exported:
+                self.changes.removed(int(rel[len("detail/"):-len(".json")]))
+        version, changes_from = self.changes.write(self.tree, total)
+
+        self.tree.write_json("index/root.json", {
+            "version": self.INDEX_VERSION,
+            "export_version": version,
+            "changes_from": changes_from,  # newest first; see changes.py
+            "total": total,
+            "sources": dict(sorted(sources.items())),
+            "difficulties": dict(sorted(difficulties.items())),
+            "months": self._months,
+        })
+        # Siblings for changed files only; must run before finish() saves the manifest
+        compressed = precompress(self.tree, self.compress, self.compress_workers) if self.compress else None
+
+        stats = self.tree.finish()
+        print(f"  Exported {total} articles in {len(self._months)} month shards → {self.output_dir}")
+        print(f"    Written  : {stats.written}")
+        print(f"    Unchanged: {stats.unchanged}")
+        print(f"    Deleted  : {stats.deleted}")
+        print(f"    Version  : {version} ({len(changes_from)} delta files)")
+        if compressed:
+            for line in compressed.summary():
+                print(line)
+
+
+# ── Packed detail archive ─────────────────────────────────────────────────────
+
+class PackLayout(Layout):
+    """
+    {output_dir}/YYYY-MM.pack + index.json — every article's detail JSON in one
+    append-only file per month (see packs.py). Records are byte-identical to
+    WebLayout's detail/{id}.json for the same detail_format.
+    """
+
+    def __init__(self, output_dir: Path, detail_format: str = "compact") -> None:
+        if detail_format not in DETAIL_FORMATS:
+            raise ValueError(f"unknown detail format {detail_format!r}")
+        self.output_dir = output_dir
+        self.writer = PackWriter(output_dir)
+        self._detail = DETAIL_ENCODERS[detail_format]
+
+    def open(self, stack: ExitStack) -> None:
+        stack.callback(self.writer.close)
+
+    def add(self, article: dict) -> None:
+        data = json.dumps(self._detail(article), ensure_ascii=False).encode("utf-8")
+        self.writer.add(article["crawled_at"][:7], article["id"], data)
+
+    def finish(self) -> None:
+        stats = self.writer.finish()
+        print(f"  Packed {stats.appended + stats.unchanged} articles → {self.output_dir}")
+        print(f"    Appended : {stats.appended}")
+        print(f"    Unchanged: {stats.unchanged}")
+        print(f"    Compacted: {stats.compacted} packs, removed {stats.removed}")
+        print(f"    Size     : {stats.bytes_total / 1024:.0f} KB")
+
+
+# ── Per-date layout ───────────────────────────────────────────────────────────
+
+def build_date_index(counts: dict[str, int]) -> dict:
+    """Build the master date index from {YYYY-MM-DD: article_count}."""
+    by_month: dict[str, list] = defaultdict(list)
+    for date_str in sorted(counts, reverse=True):
+        month = date_str[:7]  # YYYY-MM
+        by_month[month].append({"date": date_str, "count": counts[date_str]})
+
+    return {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "total_articles": sum(counts.values()),
+        "months": [
+            {"month": month, "days": days}
+            for month, days in sorted(by_month.items(), reverse=True)
+        ],
+    }
+
+
+# The per-date files keep the columns of the original schema: rows of a
+# migrated DB also carry hashes, metrics and bookkeeping that are not part of it
+DAILY_ARTICLE_COLUMNS = (
+    "id", "source", "url", "title", "title_cn", "author", "published_at",
+    "category", "difficulty", "image_url", "crawled_at",
+)
+DAILY_PARAGRAPH_COLUMNS = ("id", "article_id", "seq", "en_text", "cn_text")
+DAILY_SENTENCE_COLUMNS = ("id", "paragraph_id", "seq", "en_text", "cn_text", "is_complex", "analysis")
+
+
+def daily_article(article: dict) -> dict:
+    """An article as export_json.py has always written it into DD.json."""
+    out = {key: article[key] for key in DAILY_ARTICLE_COLUMNS}
+    out["paragraphs"] = [
+        {
+            **{key: para[key] for key in DAILY_PARAGRAPH_COLUMNS},
+            "sentences": [{key: s[key] for key in DAILY_SENTENCE_COLUMNS} for s in para["sentences"]],
+        }
+        for para in article["paragraphs"]
+    ]
+    return out
+
+
+class DailyLayout(Layout):
+    """
+    {data_dir}/articles/YYYY/MM/DD.json — full articles crawled that day
+    {data_dir}/index.json               — dates and counts, by month
+
+    Articles arrive newest first, so each day's articles are contiguous and
+    its file is streamed and closed before the next day starts.
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = data_dir
+        self.articles_dir = data_dir / "articles"
+        self.counts: dict[str, int] = {}
+        self._day: str | None = None
+        self._day_stack: ExitStack | None = None
+        self._writer: JsonArrayWriter | None = None
+
+    def open(self, stack: ExitStack) -> None:
+        # Registered first so it runs last: close the open day on exit / error
+        stack.push(self._close_day)
+
+    def _close_day(self, exc_type=None, exc=None, tb=None) -> None:
+        if self._day_stack is None:
+            return
+        if exc_type is None:
+            self._writer.close()
+        stack, self._day_stack = self._day_stack, None
+        stack.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            y, m, d = self._day.split("-")
+            print(f"  → {self.articles_dir / y / m / f'{d}.json'}  ({self._writer.count} articles)")
+            self.counts[self._day] = self._writer.count
+
+    def add(self, article: dict) -> None:
+        day = article["crawled_at"][:10]
+        if day != self._day:
+            self._close_day()
+            if day in self.counts:
+                raise RuntimeError(f"articles for {day} arrived out of order")
+            y, m, d = day.split("-")
+            self._day = day
+            self._day_stack = ExitStack()
+            f = self._day_stack.enter_context(atomic_stream(self.articles_dir / y / m / f"{d}.json"))
+            self._writer = JsonArrayWriter(f, {"date": day}, "articles", indent=2)
+        self._writer.append(daily_article(article))
+
+    def finish(self) -> None:
+        index_file = self.data_dir / "index.json"
+        index = build_date_index(self.counts)
+        with atomic_stream(index_file) as f:
+            f.write(json.dumps(index, ensure_ascii=False, indent=2).encode("utf-8"))
+        print(f"\n  Total: {sum(self.counts.values())} articles across {len(self.counts)} days")
+        print(f"  Index → {index_file}")
+
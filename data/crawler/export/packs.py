@@ -0,0 +1,331 @@
+"""
+Packed article archive: one append-only file per month plus an offset index.
+
+An alternative to one detail file per article (see PackLayout in layouts.py):
+
+  packs/YYYY-MM[.N].pack — detail JSON records, each followed by a newline
+  packs/index.json       — {"packs": {month: file name},
+                            "articles": {id: [month, offset, length, hash]}}
+
+Any article is one seek + read (or a slice of an mmap) with no per-file
+overhead, and the file count grows by one per month instead of one per
+article.
+
+Packs are append-only: an unchanged article keeps its record, a new or
+changed one is appended and the index repointed. Bytes already referenced by
+an index are never moved, so a reader holding an older index keeps working.
+When less than half of a pack is still referenced it is rewritten compactly
+to a new file, YYYY-MM.N.pack with the next generation N, that only the new
+index refers to. The index is replaced only after the packs are flushed to
+disk, and packs it no longer refers to are deleted only after that, so an
+interrupted run leaves the old index pointing at intact files plus, at
+worst, unreferenced bytes and files that the next run cleans up.
+
+Usage (from data/ directory):
+    python -m crawler.export.packs get 123 --packs ../article-packs
+    python -m crawler.export.packs verify --packs ../article-packs --detail ../article-data/detail
+    python -m crawler.export.packs stats --packs ../article-packs
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .files import atomic_stream, content_hash
+
+INDEX_NAME = "index.json"
+INDEX_VERSION = 2
+_PACK_RE = re.compile(r"^(\d{4}-\d{2})(?:\.(\d+))?\.pack$")
+
+# Rewrite a pack once less than this share of its bytes is still referenced
+MIN_LIVE_RATIO = 0.5
+
+
+def pack_name(month: str, generation: int = 0) -> str:
+    return f"{month}.{generation}.pack" if generation else f"{month}.pack"
+
+
+def _read_index(root: Path) -> dict:
+    try:
+        with open(root / INDEX_NAME, encoding="utf-8") as f:
+            index = json.load(f)
+        return {"packs": index.get("packs", {}), "articles": index["articles"]}
+    except (OSError, ValueError, KeyError, AttributeError):
+        return {"packs": {}, "articles": {}}
+
+
+def load_index(root: Path) -> dict[str, list]:
+    """id (as str) → [month, offset, length, hash]; empty if there is no index yet."""
+    return _read_index(root)["articles"]
+
+
+def load_pack_names(root: Path) -> dict[str, str]:
+    """month → pack file name the index refers to (version 1 indexes: YYYY-MM.pack)."""
+    index = _read_index(root)
+    months = {entry[0] for entry in index["articles"].values()}
+    return {month: index["packs"].get(month, pack_name(month)) for month in months}
+
+
+def _write_synced(path: Path, data: bytes) -> None:
+    """atomic_write_bytes, with the data on disk before the rename."""
+    with atomic_stream(path) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# ── Writer ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class PackStats:
+    appended: int = 0
+    unchanged: int = 0
+    compacted: int = 0     # packs rewritten to drop unreferenced records
+    removed: int = 0       # packs deleted (compacted away, or month no longer exported)
+    bytes_total: int = 0
+
+
+class PackWriter:
+    """
+    Feed it every article, grouped by month (any month order), then finish().
+    Articles not added this run drop out of the index.
+    """
+
+    def __init__(self, root: Path, min_live_ratio: float = MIN_LIVE_RATIO) -> None:
+        self.root = root
+        self.min_live_ratio = min_live_ratio
+        self.stats = PackStats()
+        self._old = load_index(root)
+        self._old_packs = load_pack_names(root)
+        self._new: dict[str, list] = {}
+        self._packs: dict[str, str] = {}   # month → pack file the new index refers to
+        self._months: list[str] = []
+        self._month: str | None = None
+        self._fh = None
+        self._size = 0
+
+    def add(self, month: str, article_id: int, data: bytes) -> None:
+        if month != self._month:
+            self._close_month()
+            if month in self._months:
+                raise RuntimeError(f"articles for {month} arrived out of order")
+            self._open_month(month)
+
+        key = str(article_id)
+        digest = content_hash(data)[:16]
+        old = self._old.get(key)
+        if old and old[0] == month and old[3] == digest and old[1] + old[2] <= self._size:
+            self._new[key] = old
+            self.stats.unchanged += 1
+            return
+
+        self._fh.write(data + b"\n")
+        self._new[key] = [month, self._size, len(data), digest]
+        self._size += len(data) + 1
+        self.stats.appended += 1
+
+    def _open_month(self, month: str) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._month = month
+        self._months.append(month)
+        self._packs[month] = self._old_packs.get(month, pack_name(month))
+        self._fh = open(self.root / self._packs[month], "ab")
+        self._size = self._fh.tell()
+
+    def _close_month(self) -> None:
+        if self._fh is None:
+            return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        self._fh = None
+
+        entries = [e for e in self._new.values() if e[0] == self._month]
+        live = sum(e[2] + 1 for e in entries)
+        if self._size and live < self._size * self.min_live_ratio:
+            self._compact(self._month, entries)
+            self._size = live
+        self.stats.bytes_total += self._size
+
+    def _compact(self, month: str, entries: list[list]) -> None:
+        """
+        Copy the referenced records, in offset order, into the month's next
+        generation of pack. The current pack stays as it is: the index on
+        disk still refers to it until finish() replaces the index.
+        """
+        current = self._packs[month]
+        generation = int(_PACK_RE.match(current).group(2) or 0) + 1
+        with open(self.root / current, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            chunks, offset = [], 0
+            for entry in sorted(entries, key=lambda e: e[1]):
+                chunks.append(mm[entry[1]:entry[1] + entry[2] + 1])
+                entry[1] = offset
+                offset += entry[2] + 1
+        self._packs[month] = pack_name(month, generation)
+        _write_synced(self.root / self._packs[month], b"".join(chunks))
+        self.stats.compacted += 1
+
+    def close(self) -> None:
+        """Release the open pack without touching the index (e.g. on error)."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def finish(self) -> PackStats:
+        """
+        Flush the last pack, save the index, then delete the packs it no
+        longer refers to (replaced by compaction, or months no longer exported).
+        """
+        self._close_month()
+        index = {
+            "version": INDEX_VERSION,
+            "packs": dict(sorted(self._packs.items())),
+            "articles": dict(sorted(self._new.items(), key=lambda kv: int(kv[0]))),
+        }
+        _write_synced(
+            self.root / INDEX_NAME,
+            json.dumps(index, separators=(",", ":")).encode("utf-8"),
+        )
+
+        referenced = set(self._packs.values())
+        if self.root.is_dir():
+            for p in self.root.iterdir():
+                if _PACK_RE.match(p.name) and p.name not in referenced:
+                    p.unlink()
+                    self.stats.removed += 1
+        return self.stats
+
+
+# ── Reader ────────────────────────────────────────────────────────────────────
+
+class PackReader:
+    """
+    Read articles from a pack directory.
+
+        with PackReader(root) as packs:
+            detail = packs.read(123)
+
+    With use_mmap=True (default) each pack is mapped once and records are
+    slices of the mapping; otherwise every read is one seek + read.
+    """
+
+    def __init__(self, root: Path, use_mmap: bool = True) -> None:
+        self.root = root
+        self.use_mmap = use_mmap
+        self.index = load_index(root)
+        self.pack_names = load_pack_names(root)
+        self._files: dict[str, object] = {}
+        self._maps: dict[str, mmap.mmap] = {}
+
+    def __enter__(self) -> "PackReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for mm in self._maps.values():
+            mm.close()
+        for f in self._files.values():
+            f.close()
+        self._maps.clear()
+        self._files.clear()
+
+    def __contains__(self, article_id: int) -> bool:
+        return str(article_id) in self.index
+
+    def ids(self) -> list[int]:
+        return [int(k) for k in self.index]
+
+    def _file(self, month: str):
+        f = self._files.get(month)
+        if f is None:
+            f = self._files[month] = open(self.root / self.pack_names[month], "rb")
+        return f
+
+    def read_bytes(self, article_id: int) -> bytes:
+        month, offset, length, _ = self.index[str(article_id)]
+        if self.use_mmap:
+            mm = self._maps.get(month)
+            if mm is None:
+                mm = self._maps[month] = mmap.mmap(self._file(month).fileno(), 0, access=mmap.ACCESS_READ)
+            return mm[offset:offset + length]
+        f = self._file(month)
+        f.seek(offset)
+        return f.read(length)
+
+    def read(self, article_id: int) -> dict:
+        return json.loads(self.read_bytes(article_id))
+
+
+def verify(pack_root: Path, detail_dir: Path) -> list[str]:
+    """
+    Compare every detail/{id}.json byte-for-byte with its packed record.
+    Returns a list of problems (empty when both outputs agree exactly).
+    """
+    problems: list[str] = []
+    with PackReader(pack_root) as packs:
+        file_ids = set()
+        for path in sorted(detail_dir.glob("*.json")):
+            article_id = int(path.stem)
+            file_ids.add(article_id)
+            if article_id not in packs:
+                problems.append(f"{path.name}: not in packs")
+            elif packs.read_bytes(article_id) != path.read_bytes():
+                problems.append(f"{path.name}: packed bytes differ")
+            if packs.use_mmap:
+                # Check the seek + read path too
+                packs.use_mmap = False
+                if packs.read_bytes(article_id) != path.read_bytes():
+                    problems.append(f"{path.name}: seek/read bytes differ")
+                packs.use_mmap = True
+        for article_id in sorted(set(packs.ids()) - file_ids):
+            problems.append(f"{article_id}: packed but no detail file")
+    return problems
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read and check packed article archives")
+    parser.add_argument("action", choices=["get", "verify", "stats"])
+    parser.add_argument("article_id", nargs="?", type=int, help="Article id (for get)")
+    parser.add_argument("--packs", type=Path, required=True, help="Pack directory")
+    parser.add_argument("--detail", type=Path, help="Per-file detail/ directory (for verify)")
+    args = parser.parse_args()
+
+    if args.action == "get":
+        if args.article_id is None:
+            parser.error("get needs an article id")
+        with PackReader(args.packs) as packs:
+            if args.article_id not in packs:
+                raise SystemExit(f"  Article {args.article_id} is not in {args.packs}")
+            print(packs.read_bytes(args.article_id).decode("utf-8"))
+
+    elif args.action == "verify":
+        if args.detail is None:
+            parser.error("verify needs --detail")
+        problems = verify(args.packs, args.detail)
+        for p in problems:
+            print(f"  {p}")
+        if problems:
+            raise SystemExit(f"  {len(problems)} problem(s)")
+        print(f"  OK — packs match {args.detail}")
+
+    else:
+        index = load_index(args.packs)
+        names = load_pack_names(args.packs)
+        by_month: dict[str, list[int]] = {}
+        for month, _, length, _ in index.values():
+            by_month.setdefault(month, []).append(length + 1)
+        for month in sorted(by_month, reverse=True):
+            live, size = sum(by_month[month]), (args.packs / names[month]).stat().st_size
+            print(f"  {month}  {len(by_month[month]):>6} articles  {size / 1024:>9.0f} KB  "
+                  f"{live / size:>4.0%} live")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Parallel web export: detail files serialized and written by a worker pool.
+
+Building and writing detail/{id}.json dominates a web export. Here each
+month is split into chunks of up to CHUNK_ARTICLES consecutive article ids,
+and each chunk is a job for a pool of worker processes (or threads), so a
+corpus of one or two months still keeps every worker busy:
+
+  - a worker opens its own read-only connection to the corpus (readers never
+    block each other or the crawler on a WAL database) and reads its chunk
+    with iter_articles()
+  - it serializes every detail file whose detail_key() changed since the
+    manifest was written (the others are not even read) and writes it
+    through its own OutputTree — atomically, and only if the content hash
+    differs from the manifest
+  - it returns the chunk's index entries and file hashes
+
+The main process gathers the chunks of each month, puts their entries back
+into the sequential export's order (crawled_at DESC, id) and replays them
+into WebLayout.add_written(), which builds the index shards,
+root, change deltas and manifest exactly as add() would, so the output is
+byte-identical to a sequential run.
+
+Threads only help as far as json.dumps and hashing release the GIL (they
+don't, much); processes are the default.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import groupby
+from pathlib import Path
+
+from ..archive import Corpus
+from .files import OutputTree, content_hash, encode_json
+from .layouts import DETAIL_ENCODERS, WebLayout, detail_key, detail_rel, index_entry
+from .queries import iter_articles
+
+# Articles per job. Small enough that a single month spreads over the pool,
+# large enough that a job amortizes its query round trips.
+CHUNK_ARTICLES = 250
+
+
+@dataclass
+class ChunkResult:
+    month: str
+    archived: bool
+    worker: str
+    entries: list[dict] = field(default_factory=list)
+    # digest, written, existed, detail_key()
+    files: list[tuple[str, bool, bool, str | None]] = field(default_factory=list)
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class WorkerStats:
+    chunks: int = 0
+    articles: int = 0
+    written: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+
+# One corpus connection + manifest per worker thread (or process) and run
+_local = threading.local()
+
+
+def _worker_state(db_path: Path, output_dir: Path, run: int) -> tuple[Corpus, OutputTree]:
+    state = getattr(_local, "state", None)
+    if state is None or state[0].db_path != db_path:
+        corpus = Corpus(db_path)
+        corpus.conn.row_factory = sqlite3.Row
+        state = _local.state = (corpus, OutputTree(output_dir), run)
+    elif state[1].root != output_dir or state[2] != run:
+        # A pooled thread outlives its run: reload the manifest the run started from
+        state = _local.state = (state[0], OutputTree(output_dir), run)
+    return state[0], state[1]
+
+
+def _chunk_articles(
+    corpus: Corpus, month: str, archived: bool, id_range: tuple[int, int],
+    skip_body: Callable[[dict], bool],
+) -> Iterator[dict]:
+    if archived:
+        with corpus.attached(month) as schema:
+            yield from iter_articles(corpus.conn, schema, skip_body=skip_body, id_range=id_range)
+    else:
+        yield from iter_articles(corpus.conn, "main", since=f"{month}-01", until=f"{month}-31",
+                                 skip_body=skip_body, id_range=id_range)
+
+
+def _export_chunk(job: tuple[Path, Path, str, str, bool, tuple[int, int], int]) -> ChunkResult:
+    db_path, output_dir, detail_format, month, archived, id_range, run = job
+    corpus, tree = _worker_state(db_path, output_dir, run)
+    encode = DETAIL_ENCODERS[detail_format]
+    result = ChunkResult(month, archived, f"{os.getpid()}/{threading.current_thread().name}")
+
+    def unchanged(article: dict) -> bool:
+        return tree.source_unchanged(detail_rel(article["id"]), detail_key(article, detail_format))
+
+    t0 = time.perf_counter()
+    for article in _chunk_articles(corpus, month, archived, id_range, unchanged):
+        rel = detail_rel(article["id"])
+        key = detail_key(article, detail_format)
+        result.entries.append(index_entry(article))
+        if "paragraphs" not in article:
+            result.files.append((tree.previous_digest(rel), False, True, key))
+            continue
+        data = encode_json(encode(article))
+        digest = content_hash(data)
+        existed = tree.is_tracked(rel)
+        written = tree.write(rel, data, digest, key)
+        result.files.append((digest, written, existed, key))
+        if written:
+            result.bytes_out += len(data)
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+def _id_ranges(conn: sqlite3.Connection, sql: str, params: tuple, size: int) -> list[tuple[int, int]]:
+    """(first, last) id of each run of `size` consecutive ids that `sql` returns."""
+    ids = [r[0] for r in conn.execute(sql, params)]
+    return [(ids[i], ids[min(i + size, len(ids)) - 1]) for i in range(0, len(ids), size)]
+
+
+def chunk_jobs(db_path: Path, size: int = CHUNK_ARTICLES) -> list[tuple[str, bool, tuple[int, int]]]:
+    """
+    (month, archived, id range) chunks, months in the order the sequential
+    export visits them and each month's chunks together.
+    """
+    jobs = []
+    with Corpus(db_path) as corpus:
+        hot = corpus.hot_months()
+        for month in hot:
+            for id_range in _id_ranges(
+                corpus.conn,
+                "SELECT id FROM main.articles WHERE substr(crawled_at, 1, 7) = ? ORDER BY id",
+                (month,), size,
+            ):
+                jobs.append((month, False, id_range))
+        # A month both hot and archived gets jobs for both, as Corpus.schemas() yields both
+        for month in corpus.archived_months():
+            with corpus.attached(month) as schema:
+                for id_range in _id_ranges(
+                    corpus.conn, f"SELECT id FROM {schema}.articles ORDER BY id", (), size,
+                ):
+                    jobs.append((month, True, id_range))
+    return jobs
+
+
+def run_parallel_web(
+    db_path: Path,
+    layout: WebLayout,
+    workers: int,
+    threads: bool = False,
+) -> tuple[int, dict[str, WorkerStats]]:
+    """
+    Export `layout` with `workers` processes (or threads). Returns the
+    article count and per-worker statistics.
+    """
+    run = time.monotonic_ns()
+    jobs = [
+        (db_path, layout.output_dir, layout.detail_format, month, archived, id_range, run)
+        for month, archived, id_range in chunk_jobs(db_path)
+    ]
+    pool_cls = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    per_worker: dict[str, WorkerStats] = {}
+    n = 0
+    with layout, pool_cls(max_workers=workers) as pool:
+        # map() yields in job order: newest month first, a month's chunks together
+        results = pool.map(_export_chunk, jobs)
+        for _, chunks in groupby(results, key=lambda r: (r.month, r.archived)):
+            rows = []
+            for result in chunks:
+                rows.extend(zip(result.entries, result.files))
+
+                stats = per_worker.setdefault(result.worker, WorkerStats())
+                stats.chunks += 1
+                stats.articles += len(result.entries)
+                stats.written += sum(1 for _, written, _, _ in result.files if written)
+                stats.bytes_out += result.bytes_out
+                stats.seconds += result.seconds
+
+            # Chunks split by id; the index lists by crawled_at DESC, then id
+            rows.sort(key=lambda r: r[0]["id"])
+            rows.sort(key=lambda r: r[0]["crawled_at"], reverse=True)
+            for entry, (digest, written, existed, key) in rows:
+                layout.add_written(entry, digest, written, existed, key)
+            n += len(rows)
+    return n, per_worker
+
+
+def print_worker_stats(per_worker: dict[str, WorkerStats]) -> None:
+    print(f"    {'worker':<28} {'chunks':>6} {'articles':>8} {'written':>7} {'MB':>6} {'art/s':>7}")
+    for name, s in sorted(per_worker.items()):
+        rate = s.articles / s.seconds if s.seconds else 0.0
+        print(f"    {name:<28} {s.chunks:>6} {s.articles:>8} {s.written:>7} "
+              f"{s.bytes_out / 2**20:>6.1f} {rate:>7.0f}")
@@ -0,0 +1,191 @@
+"""
+Set-based reads of full articles for the exporters.
+
+iter_articles() fetches a whole schema — or a crawl-date range of it — with
+one query for the article rows and then, per batch of articles, one query for
+their paragraphs and one for their sentences (served by idx_paragraphs_art
+and idx_sentences_para), instead of one paragraph query per article and one
+sentence query per paragraph. Rows are grouped in a single pass over each
+result set. Glossary terms (crawler/glossary.py) come with one more query
+per batch, and so do image thumbnails (crawler/thumbnails.py), looked up in
+the hot database's `images` table for partitions too.
+
+Normalized storage (crawler/normalize.py) is undone here: derived paragraph
+text is rebuilt from the sentences just read, and compressed analysis is
+unpacked, so every exporter sees the same rows either way.
+
+Articles come out newest first, the order every export layout lists them in,
+so callers can write them out as they arrive.
+"""
+import sqlite3
+from collections.abc import Callable, Iterator
+
+from .. import config
+from ..normalize import CN_DERIVED, EN_DERIVED, joined, unpack_analysis
+
+# Articles whose paragraphs / sentences are fetched per round trip. Bounds
+# memory to one batch and keeps the IN (...) list well under SQLite's
+# host-parameter limit.
+BATCH_ARTICLES = 500
+
+
+def _date_filter(since: str | None, until: str | None) -> tuple[str, list]:
+    """WHERE clause on the crawl date (YYYY-MM-DD, inclusive) of alias `a`."""
+    clauses: list[str] = []
+    params: list = []
+    # Same expression as the idx_articles_day index, so the range is indexed
+    if since:
+        clauses.append("substr(a.crawled_at, 1, 10) >= ?")
+        params.append(since)
+    if until:
+        clauses.append("substr(a.crawled_at, 1, 10) <= ?")
+        params.append(until)
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _has_table(conn: sqlite3.Connection, schema: str, table: str) -> bool:
+    return conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def iter_articles(
+    conn: sqlite3.Connection,
+    schema: str = "main",
+    since: str | None = None,
+    until: str | None = None,
+    batch_size: int = BATCH_ARTICLES,
+    skip_body: Callable[[dict], bool] | None = None,
+    id_range: tuple[int, int] | None = None,
+) -> Iterator[dict]:
+    """
+    Yield every article in `schema` (optionally limited to a crawl-date range
+    and to ids lo <= id <= hi of `id_range`)
+    as a dict of its columns plus "paragraphs", each paragraph a dict of its
+    columns plus "sentences", and "glossary" ({term: cn}, empty for
+    partitions archived before glossaries existed). Articles whose image has
+    a thumbnail also get "thumbnail", its path on the web site. Articles come
+    newest first (crawled_at DESC).
+
+    `skip_body`, if given, is called with each article before its body is
+    read — its columns, "glossary" and "thumbnail" — and articles it returns
+    True for come with "paragraph_count" instead of "paragraphs" (see
+    WebLayout.needs_body()).
+
+    `conn` must use row_factory = sqlite3.Row.
+    """
+    where, params = _date_filter(since, until)
+    if id_range is not None:
+        where += (" AND " if where else "WHERE ") + "a.id BETWEEN ? AND ?"
+        params += list(id_range)
+    # Newest first, as the index lists them; ties keep id order. Rows are
+    # pulled a batch at a time so memory stays bounded by batch_size.
+    art_cur = conn.execute(
+        f"SELECT a.* FROM {schema}.articles a {where} ORDER BY a.crawled_at DESC, a.id",
+        params,
+    )
+
+    with_glossary = _has_table(conn, schema, "glossary")
+    with_thumbnails = _has_table(conn, "main", "images")
+
+    while batch := art_cur.fetchmany(batch_size):
+        ids = [a["id"] for a in batch]
+        marks = ",".join("?" * len(ids))
+
+        glossaries: dict[int, dict[str, str]] = {aid: {} for aid in ids}
+        if with_glossary:
+            for g in conn.execute(
+                f"""
+                SELECT article_id, term, cn FROM {schema}.glossary
+                 WHERE article_id IN ({marks})
+                 ORDER BY article_id, term
+                """,
+                ids,
+            ):
+                glossaries[g["article_id"]][g["term"]] = g["cn"]
+
+        thumbnails: dict[str, str] = {}
+        image_urls = sorted({a["image_url"] for a in batch if a["image_url"]})
+        if with_thumbnails and image_urls:
+            thumbnails = dict(conn.execute(
+                f"""SELECT url, thumb FROM main.images
+                     WHERE url IN ({",".join("?" * len(image_urls))}) AND thumb != ''""",
+                image_urls,
+            ))
+
+        articles = []
+        for art in batch:
+            article = dict(art)
+            article["glossary"] = glossaries[article["id"]]
+            if thumb := thumbnails.get(article["image_url"] or ""):
+                article["thumbnail"] = config.THUMBNAIL_URL + thumb
+            articles.append(article)
+
+        body_ids = [a["id"] for a in articles if skip_body is None or not skip_body(a)]
+        paragraphs = _read_bodies(conn, schema, body_ids)
+        counts = _paragraph_counts(conn, schema, [aid for aid in ids if aid not in paragraphs])
+
+        for article in articles:
+            if article["id"] in paragraphs:
+                article["paragraphs"] = paragraphs[article["id"]]
+            else:
+                article["paragraph_count"] = counts.get(article["id"], 0)
+            yield article
+
+
+def _read_bodies(conn: sqlite3.Connection, schema: str, ids: list[int]) -> dict[int, list[dict]]:
+    """article id → its paragraphs, each with its "sentences"."""
+    paragraphs: dict[int, list[dict]] = {aid: [] for aid in ids}
+    if not ids:
+        return paragraphs
+    marks = ",".join("?" * len(ids))
+
+    sentences: dict[int, list[dict]] = {}
+    derived: list[tuple[dict, int]] = []
+    for p in conn.execute(
+        f"""
+        SELECT * FROM {schema}.paragraphs
+         WHERE article_id IN ({marks})
+         ORDER BY article_id, seq
+        """,
+        ids,
+    ):
+        para = dict(p)
+        para["sentences"] = sentences[para["id"]] = []
+        paragraphs[para["article_id"]].append(para)
+        if flags := para.pop("derived", 0):
+            derived.append((para, flags))
+
+    for s in conn.execute(
+        f"""
+        SELECT s.* FROM {schema}.paragraphs p
+          JOIN {schema}.sentences s ON s.paragraph_id = p.id
+         WHERE p.article_id IN ({marks})
+         ORDER BY s.paragraph_id, s.seq
+        """,
+        ids,
+    ):
+        sent = dict(s)
+        if sent["analysis"] and not isinstance(sent["analysis"], str):
+            sent["analysis"] = unpack_analysis(sent["analysis"])
+        sentences[s["paragraph_id"]].append(sent)
+
+    for para, flags in derived:
+        # As the paragraph_texts view: group_concat(text, ' ') in seq order
+        if flags & EN_DERIVED:
+            para["en_text"] = joined([s["en_text"] for s in para["sentences"]]) or ""
+        if flags & CN_DERIVED:
+            para["cn_text"] = joined([s["cn_text"] for s in para["sentences"]]) or ""
+    return paragraphs
+
+
+def _paragraph_counts(conn: sqlite3.Connection, schema: str, ids: list[int]) -> dict[int, int]:
+    """article id → number of paragraphs, from idx_paragraphs_art alone."""
+    if not ids:
+        return {}
+    return dict(conn.execute(
+        f"""SELECT article_id, count(*) FROM {schema}.paragraphs
+             WHERE article_id IN ({",".join("?" * len(ids))}) GROUP BY article_id""",
+        ids,
+    ))
+
@@ -0,0 +1,158 @@
+"""
+Word-list shards of the lemma index (see crawler/wordindex.py).
+
+    article-data/words/index.json           levels with their list size, the
+                                            words seen and the shard letters
+    article-data/words/{level}/{a-z}.json   list words by first letter:
+                                            {"n": articles containing it,
+                                             "a": article ids, newest first,
+                                             "ex": example sentences}
+    article-data/words/{level}/articles.json
+                                            [id, list words, token coverage]
+                                            per article, most list words first
+    article-data/words/manifest.json        see OutputTree
+
+"Example sentences for this word" reads one letter shard; "articles that
+practise my CET-6 words" counts the user's words over the "a" lists of the
+shards they fall into, with articles.json as the fallback ranking. Words
+keep at most MAX_ARTICLES ids and MAX_EXAMPLES sentences, so shard size is
+bounded by the word lists rather than the corpus.
+
+Written by `run_crawler.py export --web DIR` after the web layout, through
+its own OutputTree so unchanged shards are not rewritten. Needs vocab.db
+for the lists; partitions archived before the index existed are skipped.
+"""
+import sqlite3
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from ..archive import Corpus
+from ..wordindex import LEVELS, Vocabulary, load_vocabulary
+from .files import OutputTree
+
+WORDS_VERSION = 1
+MAX_ARTICLES = 100
+MAX_EXAMPLES = 3
+_CHUNK = 500  # sentence ids per IN (...) lookup
+
+
+@dataclass
+class WordExportStats:
+    words: int = 0
+    articles: int = 0
+    skipped_schemas: int = 0
+
+
+def _has_index(conn: sqlite3.Connection, schema: str) -> bool:
+    return conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'word_index'"
+    ).fetchone() is not None
+
+
+def _letter(lemma: str) -> str:
+    return lemma[0] if "a" <= lemma[0] <= "z" else "_"
+
+
+def export_words(db_path: Path, out_dir: Path, vocab: Vocabulary | None = None) -> WordExportStats | None:
+    """Write the word-list shards for db_path (and its archive) into out_dir."""
+    vocab = vocab or load_vocabulary()
+    if vocab is None:
+        print("  vocab.db not found — word-list shards not exported.")
+        return None
+    listed = set().union(*vocab.levels.values())
+
+    stats = WordExportStats()
+    # lemma → [article count, newest article ids, [(article_id, sentence_id)]]
+    words: dict[str, list] = {}
+    texts: dict[int, tuple[str, str]] = {}
+    # level → [(words, coverage, rank, article_id)]
+    coverage: dict[str, list[tuple]] = defaultdict(list)
+    rank = 0
+
+    with Corpus(db_path) as corpus:
+        conn = corpus.conn
+        for schema in corpus.schemas():
+            if not _has_index(conn, schema):
+                stats.skipped_schemas += 1
+                continue
+            order = {}
+            for (article_id,) in conn.execute(
+                f"SELECT id FROM {schema}.articles ORDER BY crawled_at DESC, id"
+            ):
+                order[article_id] = rank
+                rank += 1
+
+            # First sentence per (lemma, article): one pass in primary-key order
+            wanted: list[int] = []
+            rows = conn.execute(
+                f"""SELECT lemma, article_id, min(sentence_id) FROM {schema}.word_index
+                     GROUP BY lemma, article_id ORDER BY lemma, article_id"""
+            )
+            for lemma, hits in groupby(rows, key=itemgetter(0)):
+                if lemma not in listed:
+                    continue
+                hits = sorted(hits, key=lambda r: order[r[1]])
+                entry = words.setdefault(lemma, [0, [], []])
+                entry[0] += len(hits)
+                entry[1].extend(r[1] for r in hits[:MAX_ARTICLES - len(entry[1])])
+                for _, article_id, sentence_id in hits[:MAX_EXAMPLES - len(entry[2])]:
+                    entry[2].append((article_id, sentence_id))
+                    wanted.append(sentence_id)
+
+            for i in range(0, len(wanted), _CHUNK):
+                chunk = wanted[i:i + _CHUNK]
+                for sentence_id, en, cn in conn.execute(
+                    f"""SELECT id, en_text, cn_text FROM {schema}.sentences
+                         WHERE id IN ({",".join("?" * len(chunk))})""",
+                    chunk,
+                ):
+                    texts[sentence_id] = (en, cn or "")
+
+            for article_id, level, n, share in conn.execute(
+                f"SELECT article_id, level, words, coverage FROM {schema}.word_coverage WHERE words > 0"
+            ):
+                coverage[level].append((n, share, order[article_id], article_id))
+
+    tree = OutputTree(out_dir, prune_dirs=LEVELS)
+    index = {}
+    for level in LEVELS:
+        shards: dict[str, dict] = defaultdict(dict)
+        for lemma in sorted(vocab.levels[level] & words.keys()):
+            n, ids, examples = words[lemma]
+            ex = []
+            for article_id, sentence_id in examples:
+                en, cn = texts[sentence_id]
+                ex.append({"id": article_id, "en": en, **({"cn": cn} if cn else {})})
+            shards[_letter(lemma)][lemma] = {"n": n, "a": ids, "ex": ex}
+        for letter, shard in shards.items():
+            tree.write_json(f"{level}/{letter}.json", {"level": level, "words": shard})
+
+        ranked = sorted(coverage[level], key=lambda r: (-r[0], -r[1], r[2]))
+        tree.write_json(f"{level}/articles.json", {
+            "level": level,
+            "articles": [[article_id, n, share] for n, share, _, article_id in ranked],
+        })
+        index[level] = {
+            "size": len(vocab.levels[level]),
+            "words": sum(len(s) for s in shards.values()),
+            "letters": sorted(shards),
+        }
+    tree.write_json("index.json", {
+        "version": WORDS_VERSION,
+        "max_articles": MAX_ARTICLES,
+        "levels": index,
+    })
+    tree_stats = tree.finish()
+
+    stats.words = len(words)
+    stats.articles = len({r[3] for rows in coverage.values() for r in rows})
+    print(f"  Exported {stats.words} list words over {stats.articles} articles → {out_dir}")
+    print(f"    Written  : {tree_stats.written}")
+    print(f"    Unchanged: {tree_stats.unchanged}")
+    print(f"    Deleted  : {tree_stats.deleted}")
+    if stats.skipped_schemas:
+        print(f"    Skipped  : {stats.skipped_schemas} partition(s) archived before the word index")
+    return stats
@@ -0,0 +1,193 @@
+"""
+Per-article glossary of the words a reader is likely to look up.
+
+For each article, pick_terms() selects the words outside the app's word
+lists or outside the RARE_WORD_RANK most frequent English words (see
+metrics.py), as they appear in the text ("ramifications", not the lemma),
+skipping names — words that never occur in lower case. Up to MAX_TERMS are
+kept, out-of-list words first, then by how often they occur.
+
+The terms are translated with one translator call per article
+(translate_terms()); any term already in the glossary of an earlier
+article is reused instead, since the `glossary` table (migration 7) doubles
+as the translation cache. The web export puts the glossary into each detail
+file. The reader's word popup shows the vocab.db entry for a list word
+(phonetic, part of speech, level tags); for a word vocab.db does not have it
+answers from the glossary instead of calling /api/translate.
+
+The crawler builds the glossary of each new article after saving it;
+
+    python run_crawler.py glossary --limit 200   # older articles, newest first
+    python run_crawler.py glossary --rebuild     # all articles again
+
+backfills the hot database. Needs vocab.db.
+"""
+import argparse
+import re
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .metrics import load_common_words
+from .wordindex import Vocabulary, load_vocabulary, require_vocabulary
+
+MAX_TERMS = 30
+MIN_TERM_LENGTH = 4
+
+_WORD = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+
+
+def pick_terms(
+    sentences: list[str],
+    vocab: Vocabulary,
+    common: frozenset[str] | None = None,
+    limit: int = MAX_TERMS,
+) -> list[str]:
+    """Glossary terms of an article given as its sentences, most useful first."""
+    listed = set().union(*vocab.levels.values())
+    counts: Counter = Counter()
+    lower_case: set[str] = set()
+    for sentence in sentences:
+        for m in _WORD.finditer(sentence):
+            token = m.group().lower().replace("’", "'").removesuffix("'s")
+            if len(token) < MIN_TERM_LENGTH or "'" in token:
+                continue
+            counts[token] += 1
+            if m.group()[0].islower():
+                lower_case.add(token)
+
+    candidates = []
+    for first, token in enumerate(counts):  # insertion order: first occurrence
+        if token not in lower_case:
+            continue  # names, places, sentence-initial-only words
+        lemma = vocab.lemma(token)
+        out_of_list = lemma not in listed
+        rare = common is not None and (lemma or token) not in common
+        if out_of_list or rare:
+            candidates.append((not out_of_list, -counts[token], first, token))
+    return [token for *_, token in sorted(candidates)[:limit]]
+
+
+# ── Database ──────────────────────────────────────────────────────────────────
+
+@dataclass
+class GlossaryStats:
+    articles: int = 0
+    terms: int = 0
+    cached: int = 0
+    translated: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+
+def _cached(conn: sqlite3.Connection, terms: list[str]) -> dict[str, str]:
+    if not terms:
+        return {}
+    return dict(conn.execute(
+        f"""SELECT term, min(cn) FROM glossary
+             WHERE term IN ({",".join("?" * len(terms))}) AND cn != ''
+             GROUP BY term""",
+        terms,
+    ))
+
+
+def update_glossary(
+    conn: sqlite3.Connection,
+    translator,
+    article_ids: list[int] | None = None,
+    rebuild: bool = False,
+    limit: int | None = None,
+    vocab: Vocabulary | None = None,
+    common: frozenset[str] | None = None,
+) -> GlossaryStats:
+    """
+    Build the glossary of `article_ids`, or of every article without one
+    (all articles with rebuild=True), newest first and at most `limit`.
+    Each article is committed on its own; one whose translation fails is
+    left without a glossary and retried next time. `conn` must be in
+    autocommit mode (isolation_level=None). Raises RuntimeError if vocab.db
+    is unavailable.
+    """
+    vocab = require_vocabulary(vocab)
+    if common is None:
+        common = load_common_words()
+    if article_ids is None:
+        where = "" if rebuild else "WHERE glossary_terms IS NULL"
+        article_ids = [r[0] for r in conn.execute(f"SELECT id FROM articles {where} ORDER BY id DESC")]
+    article_ids = article_ids[:limit]
+
+    stats = GlossaryStats()
+    t0 = time.perf_counter()
+    for article_id in article_ids:
+        sentences = [r[0] for r in conn.execute(
+            """SELECT s.en_text FROM paragraphs p JOIN sentences s ON s.paragraph_id = p.id
+                WHERE p.article_id = ? ORDER BY p.seq, s.seq""",
+            (article_id,),
+        )]
+        terms = pick_terms(sentences, vocab, common)
+        known = _cached(conn, terms)
+        missing = [t for t in terms if t not in known]
+        if missing:
+            try:
+                translated = translator.translate_terms(missing)
+            except Exception as exc:
+                print(f"    [glossary] article {article_id}: translation failed: {exc}")
+                stats.failed += 1
+                continue
+            fresh = {t: cn.strip().rstrip("。.") for t, cn in zip(missing, translated) if cn.strip()}
+            if not fresh:
+                # Backends such as Google return "" instead of raising
+                print(f"    [glossary] article {article_id}: no term came back translated")
+                stats.failed += 1
+                continue
+            known.update(fresh)
+            stats.translated += len(fresh)
+        stats.cached += len(terms) - len(missing)
+
+        entries = [(article_id, t, known[t]) for t in terms if known.get(t)]
+        conn.execute("BEGIN")
+        try:
+            conn.execute("DELETE FROM glossary WHERE article_id = ?", (article_id,))
+            conn.executemany("INSERT INTO glossary (article_id, term, cn) VALUES (?, ?, ?)", entries)
+            conn.execute("UPDATE articles SET glossary_terms = ? WHERE id = ?", (len(entries), article_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        stats.articles += 1
+        stats.terms += len(entries)
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild every article's glossary")
+    parser.add_argument("--limit", type=int, metavar="N",
+                        help="At most N articles, newest first (each one is a translator call)")
+    parser.add_argument("--vocab", type=Path, default=config.VOCAB_DB_PATH,
+                        help="vocab.db with the word lists and frequency ranks")
+
+
+def cli(args: argparse.Namespace) -> None:
+    from .db import ArticleDB  # migrates the schema to include the glossary table
+    from .translator import get_translator
+
+    vocab = load_vocabulary(args.vocab)
+    if vocab is None:
+        print(f"  {args.vocab} not found — the glossary needs its word lists.")
+        return
+    translator = get_translator()
+    with ArticleDB(args.db) as db:
+        stats = db.update_glossary(
+            translator, rebuild=args.rebuild, limit=args.limit,
+            vocab=vocab, common=load_common_words(args.vocab),
+        )
+    print(f"  Glossary for {stats.articles} articles: {stats.terms} terms "
+          f"({stats.cached} cached, {stats.translated} translated, {stats.failed} failed) "
+          f"in {stats.seconds:.1f}s")
@@ -0,0 +1,76 @@
+"""
+Content hashes stored alongside articles and sentences.
+
+  text_hash()    — short key for one sentence's English text (translation
+                   reuse, duplicate detection)
+  article_hash() — changes whenever anything a reader sees in the article
+                   body changes (titles, sentence text, translations, analysis)
+"""
+import hashlib
+import sqlite3
+from collections.abc import Iterable
+from itertools import chain, groupby
+from operator import itemgetter
+
+from .normalize import unpack_analysis
+
+_SEP = "\x1f"  # unit separator: cannot occur in crawled text
+
+
+def text_hash(text: str) -> str:
+    """Return a 16-hex-digit SHA-1 prefix of `text`."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def article_hash(
+    title: str,
+    title_cn: str,
+    sentences: Iterable[tuple[int, str, str, int, str]],
+) -> str:
+    """
+    Hash an article from its titles and its sentences.
+
+    `sentences` yields (paragraph_seq, en_text, cn_text, is_complex, analysis)
+    in reading order.
+    """
+    h = hashlib.sha1()
+    h.update((title + _SEP + (title_cn or "")).encode("utf-8"))
+    for para_seq, en, cn, complex_flag, analysis in sentences:
+        h.update(
+            f"\n{para_seq}{_SEP}{en}{_SEP}{cn or ''}{_SEP}{int(complex_flag or 0)}{_SEP}{analysis or ''}"
+            .encode("utf-8")
+        )
+    return h.hexdigest()
+
+
+def refresh_article_hashes(conn: sqlite3.Connection, article_id: int | None = None) -> int:
+    """
+    Recompute articles.content_hash from the stored rows.
+
+    Refreshes one article, or every article when `article_id` is None, in a
+    single ordered pass. Compressed analysis is hashed as its JSON text, so
+    normalizing a database leaves the hashes unchanged. Returns the number
+    of articles updated.
+    """
+    where = "WHERE a.id = ?" if article_id is not None else ""
+    rows = conn.execute(
+        f"""
+        SELECT a.id, a.title, a.title_cn, p.seq, s.en_text, s.cn_text,
+               s.is_complex, s.analysis
+          FROM articles a
+          LEFT JOIN paragraphs p ON p.article_id = a.id
+          LEFT JOIN sentences  s ON s.paragraph_id = p.id
+          {where}
+         ORDER BY a.id, p.seq, s.seq
+        """,
+        (article_id,) if article_id is not None else (),
+    )
+    updates: list[tuple[str, int]] = []
+    for aid, group in groupby(rows, key=itemgetter(0)):
+        first = next(group)
+        sentences = [
+            (*r[3:7], unpack_analysis(r[7])) for r in chain([first], group) if r[4] is not None
+        ]
+        updates.append((article_hash(first[1], first[2], sentences), aid))
+    conn.executemany("UPDATE articles SET content_hash = ? WHERE id = ?", updates)
+    return len(updates)
@@ -0,0 +1,247 @@
+"""
+SQLite-backed job queue with atomic leases.
+
+Lets any number of worker processes (`run_crawler.py --worker`) share the
+fetch → translate → analyze pipeline without doing the same work twice:
+
+  - enqueue() is idempotent per (kind, key), so two producers that discover
+    the same article URL create one job, not two
+  - claim() leases a job inside a BEGIN IMMEDIATE transaction, so exactly one
+    worker gets it
+  - a worker holding a job calls heartbeat() to extend its lease; jobs whose
+    lease runs out (crashed or killed worker) become claimable again
+
+Schema:
+  jobs — one row per unit of work, unique on (kind, key)
+
+The queue lives in articles.db by default (see config.QUEUE_DB_PATH). Workers
+on several machines can share it only through a filesystem with working
+POSIX locks; SQLite must never be used over plain SMB/NFS shares.
+"""
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+
+# The pipeline's job kinds, in order (handled by worker.py)
+JOB_KINDS = ("fetch", "translate", "analyze")
+
+# ── Schema ────────────────────────────────────────────────────────────────────
+
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind             TEXT    NOT NULL,
+    key              TEXT    NOT NULL,
+    payload          TEXT    NOT NULL DEFAULT '{}',
+    status           TEXT    NOT NULL DEFAULT 'pending',
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    max_attempts     INTEGER NOT NULL DEFAULT 3,
+    run_after        REAL    NOT NULL DEFAULT 0,
+    lease_owner      TEXT    DEFAULT NULL,
+    lease_expires_at REAL    DEFAULT NULL,
+    last_error       TEXT    DEFAULT '',
+    created_at       REAL    NOT NULL,
+    updated_at       REAL    NOT NULL,
+    UNIQUE (kind, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, kind, run_after);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_expires_at);
+"""
+
+
+@dataclass
+class Job:
+    """A leased unit of work."""
+    id: int
+    kind: str           # 'fetch' | 'translate' | 'analyze'
+    key: str            # de-duplication key, usually the article URL
+    payload: dict
+    attempts: int       # including the current lease
+    lease_owner: str
+
+
+class JobQueue:
+    """
+    A handle on the jobs table.
+
+    One instance holds one connection, so each thread (e.g. a heartbeat
+    thread) must open its own JobQueue on the same path.
+    """
+
+    def __init__(self, db_path: Path = config.QUEUE_DB_PATH) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: we issue BEGIN IMMEDIATE ourselves so that the
+        # write lock is taken *before* we look for a claimable row.
+        self._conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA busy_timeout = 30000")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def enqueue(
+        self,
+        kind: str,
+        key: str,
+        payload: dict | None = None,
+        max_attempts: int = config.JOB_MAX_ATTEMPTS,
+    ) -> bool:
+        """
+        Add a job unless one with the same (kind, key) already exists.
+
+        Returns True if a new job was created. Finished and failed jobs keep
+        their row, so re-discovering an old URL is a no-op.
+        """
+        now = time.time()
+        cur = self._conn.execute(
+            """
+            INSERT OR IGNORE INTO jobs
+                (kind, key, payload, max_attempts, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (kind, key, json.dumps(payload or {}, ensure_ascii=False),
+             max_attempts, now, now),
+        )
+        return cur.rowcount == 1
+
+    # ── Worker side ───────────────────────────────────────────────────────────
+
+    def claim(
+        self,
+        worker_id: str,
+        kinds: list[str] | None = None,
+        lease_seconds: float = config.JOB_LEASE_SECONDS,
+    ) -> Job | None:
+        """
+        Atomically lease the oldest runnable job, or return None if idle.
+
+        Runnable means pending and due, or leased with an expired lease.
+        Expired jobs that have used up their attempts are marked failed.
+        """
+        now = time.time()
+        kind_sql = ""
+        params: list = [now, now]
+        if kinds:
+            kind_sql = f"AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                """
+                UPDATE jobs
+                   SET status = 'failed', lease_owner = NULL,
+                       last_error = 'lease expired', updated_at = ?
+                 WHERE status = 'leased' AND lease_expires_at < ?
+                   AND attempts >= max_attempts
+                """,
+                (now, now),
+            )
+            row = self._conn.execute(
+                f"""
+                SELECT id, kind, key, payload, attempts FROM jobs
+                 WHERE ((status = 'pending' AND run_after <= ?)
+                     OR (status = 'leased' AND lease_expires_at < ?))
+                   {kind_sql}
+                 ORDER BY id
+                 LIMIT 1
+                """,
+                params,
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+
+            job_id, kind, key, payload, attempts = row
+            self._conn.execute(
+                """
+                UPDATE jobs
+                   SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                       attempts = attempts + 1, updated_at = ?
+                 WHERE id = ?
+                """,
+                (worker_id, now + lease_seconds, now, job_id),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        return Job(
+            id=job_id,
+            kind=kind,
+            key=key,
+            payload=json.loads(payload),
+            attempts=attempts + 1,
+            lease_owner=worker_id,
+        )
+
+    def heartbeat(
+        self,
+        job: Job,
+        lease_seconds: float = config.JOB_LEASE_SECONDS,
+    ) -> bool:
+        """Extend the lease. Returns False if the job is no longer ours."""
+        now = time.time()
+        cur = self._conn.execute(
+            """
+            UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+             WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            """,
+            (now + lease_seconds, now, job.id, job.lease_owner),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job: Job) -> bool:
+        """Mark the job done. Returns False if our lease was lost meanwhile."""
+        cur = self._conn.execute(
+            """
+            UPDATE jobs
+               SET status = 'done', lease_owner = NULL, lease_expires_at = NULL,
+                   last_error = '', updated_at = ?
+             WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            """,
+            (time.time(), job.id, job.lease_owner),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job: Job, error: str, retry_delay: float = 60.0) -> None:
+        """
+        Release the job after an error.
+
+        It is retried after `retry_delay` × 2^(attempts-1) seconds, or marked
+        failed once it has used all its attempts.
+        """
+        now = time.time()
+        self._conn.execute(
+            """
+            UPDATE jobs
+               SET status = CASE WHEN attempts >= max_attempts
+                                 THEN 'failed' ELSE 'pending' END,
+                   run_after = ?, lease_owner = NULL, lease_expires_at = NULL,
+                   last_error = ?, updated_at = ?
+             WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            """,
+            (now + retry_delay * 2 ** (job.attempts - 1), error[:500], now,
+             job.id, job.lease_owner),
+        )
+
+    # ── Introspection ─────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return {kind: {status: count}}."""
+        out: dict[str, dict[str, int]] = {}
+        for kind, status, n in self._conn.execute(
+            "SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status"
+        ):
+            out.setdefault(kind, {})[status] = n
+        return out
@@ -3,101 +3,196 @@ Main crawler orchestrator.
 
 Usage (from data/ directory):
     python -m crawler.main
-    python -m crawler.scheduler --once
+    python run_crawler.py --sources guardian,bbc --limit 2 --no-translate
 """
 import time
+from pathlib import Path
 
 from . import config
-from .analyzer import process_paragraph, word_count
-from .db import init_db, save_article, url_exists
-from .models import ParagraphData
-from .sources.bbc import BBCSource
-from .sources.conversation import ConversationSource
-from .sources.guardian import GuardianSource
-from .sources.voa import VOASource
-from .translator import get_translator
-
-SOURCES = [
-    GuardianSource(),
-    BBCSource(),
-    VOASource(),
-    ConversationSource(),
-]
-
-
-def run() -> None:
+from .analyzer import process_paragraph, split_article, word_count
+from .db import ArticleDB
+from .models import ParagraphData, RawArticle
+from .sources import get_sources
+from .timing import StageTimer
+from .translator import BaseTranslator, NullTranslator, get_translator
+
+
+def word_count_skip_reason(raw: RawArticle) -> str | None:
+    """Return e.g. 'short 120w' if the article fails the word-count filter."""
+    total_words = sum(word_count(p) for p in raw.paragraphs)
+    if total_words < config.MIN_WORD_COUNT:
+        return f"short {total_words}w"
+    if total_words > config.MAX_WORD_COUNT:
+        return f"long {total_words}w"
+    return None
+
+
+def build_paragraphs(
+    raw: RawArticle,
+    translator,
+    analyze: bool = False,
+    pause: float = config.CRAWL_DELAY_SECONDS,
+) -> list[ParagraphData]:
+    """
+    Split, translate (and optionally analyze) every paragraph of `raw`,
+    waiting `pause` seconds between paragraphs to pace the translator.
+    """
+    paragraph_data: list[ParagraphData] = []
+    split = split_article(raw.paragraphs)
+    for i, para_text in enumerate(raw.paragraphs):
+        cn_text, sentences = process_paragraph(
+            para_text, translator, analyze=analyze, sentences=split[i]
+        )
+        paragraph_data.append(
+            ParagraphData(
+                seq=i,
+                en_text=para_text,
+                cn_text=cn_text,
+                sentences=sentences,
+            )
+        )
+        if pause and i < len(raw.paragraphs) - 1:
+            time.sleep(pause)
+    return paragraph_data
+
+
+def run(
+    sources: list[str] | None = None,
+    limit: int = config.ARTICLES_PER_SOURCE,
+    translate: bool = True,
+    *,
+    db_path: Path = config.DB_PATH,
+    translator: BaseTranslator | None = None,
+    analyze: bool | None = None,
+    thumbnail_dir: Path = config.THUMBNAIL_DIR,
+    timer: StageTimer | None = None,
+) -> StageTimer:
+    """
+    Crawl `sources` (names, see sources/__init__.py; default all), at most
+    `limit` new articles each. With translate=False the articles are stored
+    untranslated, to be filled in by `run_crawler.py backfill translate`.
+
+    `translator` replaces the configured backend and `analyze` overrides
+    whether complex sentences are analyzed (default: with DeepSeek only).
+    Returns the timer holding how long each stage took.
+    """
     print("=" * 60)
     print("OpenWords Article Crawler")
-    print(f"  Backend    : {config.TRANSLATOR_BACKEND}")
-    print(f"  Articles   : up to {config.ARTICLES_PER_SOURCE} per source")
+    print(f"  Backend    : {config.TRANSLATOR_BACKEND if translate else 'none (--no-translate)'}")
+    print(f"  Sources    : {', '.join(sources) if sources else 'all'}")
+    print(f"  Articles   : up to {limit} per source")
     print(f"  Word range : {config.MIN_WORD_COUNT}–{config.MAX_WORD_COUNT}")
     print("=" * 60)
 
-    init_db()
-    translator = get_translator()
-    do_analysis = config.TRANSLATOR_BACKEND == "deepseek"
-
-    saved = 0
+    timer = timer or StageTimer()
+    if not translate:
+        translator = NullTranslator()
+    elif translator is None:
+        translator = get_translator()
+    if analyze is None:
+        analyze = config.TRANSLATOR_BACKEND == "deepseek"
+    do_analysis = translate and analyze
+    pause = config.CRAWL_DELAY_SECONDS if translate else 0.0
+
+    saved_ids: list[int] = []
     skipped = 0
+    # Translated articles waiting to be written: up to DB_BATCH_ARTICLES go
+    # into one transaction, written together so that no write lock is held
+    # while the next article is fetched and translated
+    pending: list[tuple[RawArticle, list[ParagraphData], str]] = []
+
+    def save_pending() -> None:
+        for raw, paragraph_data, title_cn in pending:
+            with timer.stage("save"):
+                article_id = db.save_article(raw, paragraph_data, title_cn, translator.name)
+            print(f"  ✓ Saved (id={article_id}): {raw.title[:60]}")
+            saved_ids.append(article_id)
+        pending.clear()
+        db.commit()
 
-    for source in SOURCES:
-        print(f"\n▶ {source.name.upper()}")
+    # Closing the handle commits whatever a failing source or translator left
+    with ArticleDB(db_path, batch_size=config.DB_BATCH_ARTICLES) as db:
+        print(f"  DB ready: {db.db_path}")
         try:
-            articles = source.get_articles(limit=config.ARTICLES_PER_SOURCE)
-        except Exception as exc:
-            print(f"  ERROR: {exc}")
-            continue
-
-        print(f"  Candidates: {len(articles)}")
-
-        for raw in articles:
-            # Skip articles already in DB
-            if url_exists(raw.url):
-                print(f"  SKIP (exists) : {raw.title[:60]}")
-                skipped += 1
-                continue
-
-            # Word-count filter
-            total_words = sum(word_count(p) for p in raw.paragraphs)
-            if total_words < config.MIN_WORD_COUNT:
-                print(f"  SKIP (short {total_words}w) : {raw.title[:60]}")
-                skipped += 1
-                continue
-            if total_words > config.MAX_WORD_COUNT:
-                print(f"  SKIP (long {total_words}w)  : {raw.title[:60]}")
-                skipped += 1
-                continue
-
-            print(f"  → Processing ({total_words}w): {raw.title[:60]}")
-
-            # Translate title
-            title_cn = translator.translate(raw.title)
-            time.sleep(0.5)
-
-            # Build paragraph data with per-sentence translation
-            paragraph_data: list[ParagraphData] = []
-            for i, para_text in enumerate(raw.paragraphs):
-                cn_text, sentences = process_paragraph(
-                    para_text, translator, analyze=do_analysis
-                )
-                paragraph_data.append(
-                    ParagraphData(
-                        seq=i,
-                        en_text=para_text,
-                        cn_text=cn_text,
-                        sentences=sentences,
-                    )
-                )
-                if i < len(raw.paragraphs) - 1:
-                    time.sleep(config.CRAWL_DELAY_SECONDS)
-
-            article_id = save_article(raw, paragraph_data, title_cn)
-            print(f"  ✓ Saved (id={article_id}): {raw.title[:60]}")
-            saved += 1
+            for source in get_sources(sources):
+                print(f"\n▶ {source.name.upper()}")
+                try:
+                    articles = source.get_articles(limit=limit, timer=timer)
+                except Exception as exc:
+                    print(f"  ERROR: {exc}")
+                    continue
+
+                print(f"  Candidates: {len(articles)}")
+
+                for raw in articles:
+                    # Skip articles already in DB (or translated, not yet written)
+                    if db.url_exists(raw.url) or any(p[0].url == raw.url for p in pending):
+                        print(f"  SKIP (exists) : {raw.title[:60]}")
+                        skipped += 1
+                        continue
+
+                    # Word-count filter
+                    reason = word_count_skip_reason(raw)
+                    if reason:
+                        print(f"  SKIP ({reason}) : {raw.title[:60]}")
+                        skipped += 1
+                        continue
+
+                    total_words = sum(word_count(p) for p in raw.paragraphs)
+                    print(f"  → Processing ({total_words}w): {raw.title[:60]}")
+
+                    with timer.stage("translate"):
+                        # Translate title
+                        title_cn = translator.translate(raw.title)
+                        if pause:
+                            time.sleep(0.5)
+
+                        # Build paragraph data with per-sentence translation
+                        paragraph_data = build_paragraphs(raw, translator, analyze=do_analysis, pause=pause)
+
+                    pending.append((raw, paragraph_data, title_cn))
+                    if len(pending) >= config.DB_BATCH_ARTICLES:
+                        save_pending()
+        finally:
+            # Keep the articles translated before an error
+            save_pending()
+
+        saved = len(saved_ids)
+        if saved:
+            try:
+                with timer.stage("metrics"):
+                    stats = db.update_metrics()
+                print(f"\n  Readability metrics: {stats.articles} article(s)")
+            except RuntimeError as exc:
+                print(f"\n  Readability metrics skipped: {exc.args[0].splitlines()[0]}")
+            try:
+                with timer.stage("word_index"):
+                    stats = db.update_word_index()
+                print(f"  Word index: {stats.articles} article(s)")
+            except RuntimeError as exc:
+                print(f"  Word index skipped: {exc.args[0].splitlines()[0]}")
+            if not translate:
+                print("  Glossary skipped: --no-translate (`run_crawler.py glossary` backfills later)")
+            else:
+                try:
+                    with timer.stage("glossary"):
+                        stats = db.update_glossary(translator, saved_ids)
+                    print(f"  Glossary: {stats.terms} term(s), {stats.cached} from cache, "
+                          f"{stats.translated} translated")
+                except RuntimeError as exc:
+                    print(f"  Glossary skipped: {exc.args[0].splitlines()[0]}")
+            try:
+                with timer.stage("thumbnails"):
+                    stats = db.update_thumbnails(saved_ids, out_dir=thumbnail_dir)
+                print(f"  Thumbnails: {stats.written} written, {stats.reused} reused, {stats.failed} failed")
+            except RuntimeError as exc:
+                print(f"  Thumbnails skipped: {exc.args[0].splitlines()[0]}")
 
     print(f"\n{'=' * 60}")
     print(f"  Saved: {saved}   Skipped: {skipped}")
+    print(f"  Time : {timer}")
     print("=" * 60)
+    return timer
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+"""
+Readability and lexical metrics, computed in bulk with NumPy.
+
+Per sentence:  word_count, syllables, fk_grade, rare_rate
+Per article:   word_count, fk_grade, ttr, rare_rate
+
+  fk_grade   Flesch-Kincaid grade level,
+             0.39 × words/sentences + 11.8 × syllables/words − 15.59
+  ttr        type-token ratio: distinct words / words (lower-cased)
+  rare_rate  share of words outside the RARE_WORD_RANK most frequent English
+             words, ranked by vocab.db (NULL when vocab.db is absent)
+
+Tokenizing is one regex call per sentence; everything after that works on
+whole batches of articles at once. Syllables are counted once per distinct
+word on a fixed-width byte matrix (vowel groups, minus a silent final "e" /
+"-ed"), and per-sentence and per-article sums are bincounts over token
+arrays.
+
+The columns are added by migration 5 and stay NULL until computed; the
+crawler fills them for new articles after each run, and
+
+    python run_crawler.py metrics            # articles without metrics
+    python run_crawler.py metrics --all      # recompute everything
+
+backfills the hot database in one pass. Archived partitions are immutable
+and keep whatever metrics they were archived with.
+
+Needs numpy: pip install numpy
+"""
+import argparse
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+
+from . import config
+
+RARE_WORD_RANK = 5000
+BATCH_ARTICLES = 500
+
+# Longer words are truncated for syllable counting only
+_MAX_WORD_BYTES = 24
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+
+def _numpy():
+    try:
+        import numpy as np  # type: ignore
+    except ImportError:
+        raise RuntimeError(
+            "The 'numpy' package is required for readability metrics.\n"
+            "Install it with: pip install numpy"
+        )
+    return np
+
+
+@lru_cache(maxsize=2)
+def load_common_words(vocab_db: Path = config.VOCAB_DB_PATH, rank: int = RARE_WORD_RANK) -> frozenset[str] | None:
+    """The `rank` most frequent words in vocab.db (by frq, else bnc), or None."""
+    if not vocab_db.exists():
+        return None
+    uri = vocab_db.resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        rows = conn.execute(
+            "SELECT lower(word) FROM words WHERE (frq > 0 AND frq <= ?) OR (bnc > 0 AND bnc <= ?)",
+            (rank, rank),
+        ).fetchall()
+    except sqlite3.DatabaseError:
+        return None
+    finally:
+        conn.close()
+    return frozenset(r[0] for r in rows)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case word tokens of a sentence."""
+    return _TOKEN.findall(text.lower().replace("’", "'"))
+
+
+def count_syllables(words, np):
+    """Estimated syllables for each word of a 1-D array of lower-case words."""
+    if len(words) == 0:
+        return np.zeros(0, dtype=np.int64)
+    raw = words.astype(f"S{_MAX_WORD_BYTES}")  # tokens are ASCII (see _TOKEN)
+    m = raw.view(np.uint8).reshape(len(raw), _MAX_WORD_BYTES)
+    vowels = np.isin(m, np.frombuffer(b"aeiouy", dtype=np.uint8))
+    # A syllable per run of vowels
+    starts = vowels & ~np.pad(vowels, ((0, 0), (1, 0)))[:, :-1]
+    count = starts.sum(axis=1)
+
+    length = (m != 0).sum(axis=1)
+    rows = np.arange(len(m))
+
+    def char_at(back: int):
+        idx = np.maximum(length - back, 0)
+        return np.where(length >= back, m[rows, idx], 0)
+
+    last, prev, prev2 = char_at(1), char_at(2), char_at(3)
+    e, d, l = ord("e"), ord("d"), ord("l")
+    # Silent final "e" (make, hope) but not "-le" after a consonant (table)
+    silent_e = (last == e) & ~((prev == l) & ~np.isin(prev2, np.frombuffer(b"aeiouy", dtype=np.uint8)))
+    # Silent "-ed" (jumped) except after t / d (wanted, ended)
+    silent_ed = (last == d) & (prev == e) & ~np.isin(prev2, np.frombuffer(b"td", dtype=np.uint8))
+    count = count - ((silent_e | silent_ed) & (count > 1))
+    return np.maximum(count, 1)
+
+
+def _fk_grade(words, sentences, syllables, np):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grade = 0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59
+    return np.where(words > 0, grade, np.nan)
+
+
+def compute(articles: list[list[str]], common: frozenset[str] | None = None) -> tuple[list, list]:
+    """
+    Metrics for a batch of articles, each given as its list of sentences.
+
+    Returns (sentence_rows, article_rows): per sentence, in input order,
+    (word_count, syllables, fk_grade, rare_rate); per article
+    (word_count, fk_grade, ttr, rare_rate). Undefined values are None.
+    """
+    np = _numpy()
+    sentences = list(chain.from_iterable(articles))
+    n_sent, n_art = len(sentences), len(articles)
+
+    tokens = [tokenize(s) for s in sentences]
+    words = np.fromiter(map(len, tokens), dtype=np.int64, count=n_sent)
+    flat = np.array(list(chain.from_iterable(tokens)) or [""], dtype=str)[: int(words.sum())]
+    uniq, inverse = np.unique(flat, return_inverse=True)
+
+    syl_of_word = count_syllables(uniq, np)
+    sent_of_token = np.repeat(np.arange(n_sent), words)
+    art_of_sent = np.repeat(np.arange(n_art), [len(a) for a in articles])
+    art_of_token = art_of_sent[sent_of_token]
+
+    sent_syl = np.bincount(sent_of_token, weights=syl_of_word[inverse], minlength=n_sent)
+    sent_fk = _fk_grade(words, 1, sent_syl, np)
+
+    art_words = np.bincount(art_of_sent, weights=words, minlength=n_art)
+    art_syl = np.bincount(art_of_token, weights=syl_of_word[inverse], minlength=n_art)
+    art_sents = np.bincount(art_of_sent, weights=words > 0, minlength=n_art)
+    art_fk = _fk_grade(art_words, np.maximum(art_sents, 1), art_syl, np)
+    # Distinct (article, word) pairs per article
+    distinct = np.unique(art_of_token * max(len(uniq), 1) + inverse) // max(len(uniq), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        art_ttr = np.where(art_words > 0, np.bincount(distinct, minlength=n_art) / art_words, np.nan)
+
+    if common is not None:
+        rare_word = np.fromiter((w not in common for w in uniq.tolist()), dtype=bool, count=len(uniq))
+        rare_tok = rare_word[inverse]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sent_rare = np.bincount(sent_of_token, weights=rare_tok, minlength=n_sent) / words
+            art_rare = np.bincount(art_of_token, weights=rare_tok, minlength=n_art) / art_words
+    else:
+        sent_rare = np.full(n_sent, np.nan)
+        art_rare = np.full(n_art, np.nan)
+
+    def value(x, digits: int):
+        return None if np.isnan(x) else round(float(x), digits)
+
+    sentence_rows = [
+        (int(w), int(s), value(fk, 2), value(r, 4))
+        for w, s, fk, r in zip(words, sent_syl, sent_fk, sent_rare)
+    ]
+    article_rows = [
+        (int(w), value(fk, 2), value(t, 4), value(r, 4))
+        for w, fk, t, r in zip(art_words, art_fk, art_ttr, art_rare)
+    ]
+    return sentence_rows, article_rows
+
+
+# ── Database ──────────────────────────────────────────────────────────────────
+
+@dataclass
+class MetricsStats:
+    articles: int = 0
+    sentences: int = 0
+    seconds: float = 0.0
+
+
+def update_metrics(
+    conn: sqlite3.Connection,
+    article_ids: list[int] | None = None,
+    recompute: bool = False,
+    common: frozenset[str] | None = None,
+    batch_size: int = BATCH_ARTICLES,
+) -> MetricsStats:
+    """
+    Compute and store metrics for `article_ids`, or for every article without
+    them (all articles with recompute=True). Each batch is one transaction.
+    `conn` must be in autocommit mode (isolation_level=None).
+    """
+    _numpy()  # fail before touching the database
+    if common is None:
+        common = load_common_words()
+    if article_ids is None:
+        where = "" if recompute else "WHERE word_count IS NULL"
+        article_ids = [r[0] for r in conn.execute(f"SELECT id FROM articles {where} ORDER BY id")]
+
+    stats = MetricsStats()
+    t0 = time.perf_counter()
+    for i in range(0, len(article_ids), batch_size):
+        ids = article_ids[i:i + batch_size]
+        marks = ",".join("?" * len(ids))
+        by_article: dict[int, list[tuple[int, str]]] = {a: [] for a in ids}
+        for article_id, sentence_id, en_text in conn.execute(
+            f"""SELECT p.article_id, s.id, s.en_text
+                  FROM paragraphs p JOIN sentences s ON s.paragraph_id = p.id
+                 WHERE p.article_id IN ({marks})
+                 ORDER BY p.article_id, p.seq, s.seq""",
+            ids,
+        ):
+            by_article[article_id].append((sentence_id, en_text))
+
+        sentence_rows, article_rows = compute(
+            [[text for _, text in sents] for sents in by_article.values()], common
+        )
+        sentence_ids = [sid for sents in by_article.values() for sid, _ in sents]
+
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "UPDATE sentences SET word_count = ?, syllables = ?, fk_grade = ?, rare_rate = ? WHERE id = ?",
+                [(*row, sid) for row, sid in zip(sentence_rows, sentence_ids)],
+            )
+            conn.executemany(
+                "UPDATE articles SET word_count = ?, fk_grade = ?, ttr = ?, rare_rate = ? WHERE id = ?",
+                [(*row, aid) for row, aid in zip(article_rows, by_article)],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        stats.articles += len(ids)
+        stats.sentences += len(sentence_ids)
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--all", action="store_true", help="Recompute articles that already have metrics")
+    parser.add_argument("--vocab", type=Path, default=config.VOCAB_DB_PATH,
+                        help="vocab.db for word frequency ranks (rare-word rate)")
+
+
+def cli(args: argparse.Namespace) -> None:
+    from .db import ArticleDB  # migrates the schema to include the metric columns
+
+    common = load_common_words(args.vocab)
+    if common is None:
+        print(f"  {args.vocab} not found — rare-word rate left empty.")
+    with ArticleDB(args.db) as db:
+        stats = db.update_metrics(recompute=args.all, common=common)
+    rate = stats.sentences / stats.seconds if stats.seconds else 0.0
+    print(f"  Metrics for {stats.articles} articles / {stats.sentences} sentences "
+          f"in {stats.seconds:.1f}s ({rate:,.0f} sentences/s)")
@@ -0,0 +1,386 @@
+"""
+Versioned schema migrations for articles.db.
+
+The schema version is stored in `PRAGMA user_version`. Every ArticleDB open
+calls migrate(), which applies the pending steps in order, each in its own
+transaction together with the version bump, and reports how long each took.
+Databases created before versioning (user_version = 0) start at step 1,
+which is written with IF NOT EXISTS so it is a no-op for them.
+
+To change the schema, append a Migration with the next version number.
+Never edit a migration that has already shipped.
+
+Usage (from data/ directory):
+    python -m crawler.migrations                 # migrate config.DB_PATH
+    python -m crawler.migrations --status
+    python -m crawler.migrations --db ../articles.db
+"""
+import argparse
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .hashing import refresh_article_hashes, text_hash
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: tuple[str, ...] = ()
+    # Optional Python step, run after `statements` in the same transaction
+    apply: Callable[[sqlite3.Connection], None] | None = None
+
+
+# ── Steps ─────────────────────────────────────────────────────────────────────
+
+_V1_BASE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        id           INTEGER PRIMARY KEY AUTOINCREMENT,
+        source       TEXT    NOT NULL,
+        url          TEXT    UNIQUE NOT NULL,
+        title        TEXT    NOT NULL,
+        title_cn     TEXT    DEFAULT '',
+        author       TEXT    DEFAULT '',
+        published_at TEXT    DEFAULT '',
+        category     TEXT    DEFAULT '',
+        difficulty   TEXT    DEFAULT 'cet6',
+        image_url    TEXT    DEFAULT '',
+        crawled_at   TEXT    NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS paragraphs (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id INTEGER NOT NULL,
+        seq        INTEGER NOT NULL,
+        en_text    TEXT    NOT NULL,
+        cn_text    TEXT    DEFAULT '',
+        FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sentences (
+        id           INTEGER PRIMARY KEY AUTOINCREMENT,
+        paragraph_id INTEGER NOT NULL,
+        seq          INTEGER NOT NULL,
+        en_text      TEXT    NOT NULL,
+        cn_text      TEXT    DEFAULT '',
+        is_complex   INTEGER DEFAULT 0,
+        analysis     TEXT    DEFAULT '',
+        FOREIGN KEY (paragraph_id) REFERENCES paragraphs(id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_articles_source   ON articles(source)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_crawled  ON articles(crawled_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_paragraphs_art    ON paragraphs(article_id, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_sentences_para    ON sentences(paragraph_id, seq)",
+)
+
+# Indexes for the queries the exporters and web listing actually run:
+#   - per-day bucketing uses substr(crawled_at, 1, 10); only an index on that
+#     exact expression lets SQLite group / filter by day without a table scan
+#   - listing filters on source and difficulty and orders by crawled_at DESC;
+#     the composite index answers that from the index alone and makes the
+#     single-column source index redundant
+_V2_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_articles_day ON articles(substr(crawled_at, 1, 10))",
+    """
+    CREATE INDEX IF NOT EXISTS idx_articles_facets
+        ON articles(source, difficulty, crawled_at DESC)
+    """,
+    "DROP INDEX IF EXISTS idx_articles_source",
+    "ANALYZE",
+)
+
+_V3_HASH_COLUMNS = (
+    "ALTER TABLE articles  ADD COLUMN content_hash TEXT DEFAULT ''",
+    "ALTER TABLE sentences ADD COLUMN en_hash      TEXT DEFAULT ''",
+)
+
+
+def _backfill_hashes(conn: sqlite3.Connection) -> None:
+    conn.create_function("text_hash", 1, text_hash, deterministic=True)
+    conn.execute("UPDATE sentences SET en_hash = text_hash(en_text)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sentences_en_hash ON sentences(en_hash)")
+    refresh_article_hashes(conn)
+
+
+# Full-text search over sentences (see search.py). Two external-content FTS5
+# tables share the sentences rows, so no text is stored twice:
+#   - sentences_fts    English, porter stemming ("studies" finds "study")
+#   - sentences_fts_cn Chinese, trigram tokenizer (no word segmentation needed)
+# Triggers keep both in sync with every insert / update / delete on sentences.
+_FTS_STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS sentences_fts USING fts5(
+        en_text, content='sentences', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS sentences_fts_cn USING fts5(
+        cn_text, content='sentences', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sentences_fts_ai AFTER INSERT ON sentences BEGIN
+        INSERT INTO sentences_fts(rowid, en_text) VALUES (new.id, new.en_text);
+        INSERT INTO sentences_fts_cn(rowid, cn_text) VALUES (new.id, new.cn_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sentences_fts_ad AFTER DELETE ON sentences BEGIN
+        INSERT INTO sentences_fts(sentences_fts, rowid, en_text)
+            VALUES ('delete', old.id, old.en_text);
+        INSERT INTO sentences_fts_cn(sentences_fts_cn, rowid, cn_text)
+            VALUES ('delete', old.id, old.cn_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sentences_fts_au AFTER UPDATE OF en_text, cn_text
+    ON sentences BEGIN
+        INSERT INTO sentences_fts(sentences_fts, rowid, en_text)
+            VALUES ('delete', old.id, old.en_text);
+        INSERT INTO sentences_fts_cn(sentences_fts_cn, rowid, cn_text)
+            VALUES ('delete', old.id, old.cn_text);
+        INSERT INTO sentences_fts(rowid, en_text) VALUES (new.id, new.en_text);
+        INSERT INTO sentences_fts_cn(rowid, cn_text) VALUES (new.id, new.cn_text);
+    END
+    """,
+    "INSERT INTO sentences_fts(sentences_fts) VALUES ('rebuild')",
+    "INSERT INTO sentences_fts_cn(sentences_fts_cn) VALUES ('rebuild')",
+)
+
+
+def fts_available(conn: sqlite3.Connection) -> bool:
+    """True if this SQLite build has FTS5 with the trigram tokenizer (3.34+)."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts_probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp._fts_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def create_fts_index(conn: sqlite3.Connection) -> bool:
+    """
+    Create (or rebuild) the sentence full-text index and its triggers.
+
+    Returns False without touching the schema when FTS5 is unavailable, so
+    an old SQLite build can still open the database; search then falls back
+    to LIKE scans until `python -m crawler.search --rebuild` is run on a
+    build that has it.
+    """
+    if not fts_available(conn):
+        print("  WARNING: SQLite lacks FTS5/trigram — full-text index not created.")
+        return False
+    for stmt in _FTS_STATEMENTS:
+        conn.execute(stmt)
+    return True
+
+
+# Readability metrics (see metrics.py); NULL until computed, which the
+# crawler does for new articles and `run_crawler.py metrics` backfills
+_V5_METRIC_COLUMNS = (
+    "ALTER TABLE articles  ADD COLUMN word_count INTEGER",
+    "ALTER TABLE articles  ADD COLUMN fk_grade   REAL",
+    "ALTER TABLE articles  ADD COLUMN ttr        REAL",
+    "ALTER TABLE articles  ADD COLUMN rare_rate  REAL",
+    "ALTER TABLE sentences ADD COLUMN word_count INTEGER",
+    "ALTER TABLE sentences ADD COLUMN syllables  INTEGER",
+    "ALTER TABLE sentences ADD COLUMN fk_grade   REAL",
+    "ALTER TABLE sentences ADD COLUMN rare_rate  REAL",
+)
+
+# Lemma-level word index and per-word-list coverage (see wordindex.py).
+# Keyed by article so that archiving a month (DELETE FROM articles) cascades.
+_V6_WORD_INDEX = (
+    """
+    CREATE TABLE IF NOT EXISTS word_index (
+        lemma       TEXT    NOT NULL,
+        article_id  INTEGER NOT NULL,
+        sentence_id INTEGER NOT NULL,
+        PRIMARY KEY (lemma, article_id, sentence_id),
+        FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_word_index_article ON word_index(article_id)",
+    """
+    CREATE TABLE IF NOT EXISTS word_coverage (
+        article_id INTEGER NOT NULL,
+        level      TEXT    NOT NULL,
+        words      INTEGER NOT NULL,
+        coverage   REAL    NOT NULL,
+        PRIMARY KEY (article_id, level),
+        FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """,
+)
+
+# Per-article glossary (see glossary.py). glossary_terms is NULL until the
+# glossary is built; the term index serves the translation cache lookups.
+_V7_GLOSSARY = (
+    "ALTER TABLE articles ADD COLUMN glossary_terms INTEGER",
+    """
+    CREATE TABLE IF NOT EXISTS glossary (
+        article_id INTEGER NOT NULL,
+        term       TEXT    NOT NULL,
+        cn         TEXT    NOT NULL,
+        PRIMARY KEY (article_id, term),
+        FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_glossary_term ON glossary(term)",
+)
+
+# Optional normalized storage (see normalize.py): per-paragraph flags for
+# text that is derived from the sentences instead of stored, the view that
+# puts it back together, and the settings table recording the write mode.
+# The data is only converted by `run_crawler.py normalize`.
+_V8_NORMALIZED_STORAGE = (
+    "ALTER TABLE paragraphs ADD COLUMN derived INTEGER NOT NULL DEFAULT 0",
+    """
+    CREATE TABLE IF NOT EXISTS settings (
+        key   TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS paragraph_texts AS
+    SELECT p.id, p.article_id, p.seq,
+           CASE WHEN p.derived & 1
+                THEN (SELECT group_concat(en_text, ' ') FROM
+                        (SELECT en_text FROM sentences WHERE paragraph_id = p.id ORDER BY seq))
+                ELSE p.en_text END AS en_text,
+           CASE WHEN p.derived & 2
+                THEN (SELECT group_concat(cn_text, ' ') FROM
+                        (SELECT cn_text FROM sentences WHERE paragraph_id = p.id ORDER BY seq))
+                ELSE p.cn_text END AS cn_text
+      FROM paragraphs p
+    """,
+)
+
+# Which translator backend produced each sentence's cn_text (translator.name),
+# so `run_crawler.py backfill` can find what an earlier backend translated.
+# NULL for sentences stored before it was recorded.
+_V9_TRANSLATED_BY = (
+    "ALTER TABLE sentences ADD COLUMN translated_by TEXT",
+)
+
+# Article image thumbnails (see thumbnails.py), one row per distinct
+# articles.image_url. thumb is the file under THUMBNAIL_DIR ('' until one was
+# made); attempts counts the failed downloads since the last success.
+_V10_IMAGES = (
+    """
+    CREATE TABLE IF NOT EXISTS images (
+        url         TEXT PRIMARY KEY,
+        thumb       TEXT    NOT NULL DEFAULT '',
+        digest      TEXT,
+        width       INTEGER,
+        height      INTEGER,
+        bytes       INTEGER,
+        thumb_bytes INTEGER,
+        attempts    INTEGER NOT NULL DEFAULT 0,
+        error       TEXT    NOT NULL DEFAULT '',
+        fetched_at  TEXT
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_images_thumb ON images(thumb)",
+)
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "base schema (articles / paragraphs / sentences)", _V1_BASE_SCHEMA),
+    Migration(2, "day-bucket expression index + (source, difficulty, crawled_at) index", _V2_INDEXES),
+    Migration(3, "content_hash / en_hash columns with backfill", _V3_HASH_COLUMNS, _backfill_hashes),
+    Migration(4, "FTS5 full-text index over sentences (en + cn)", apply=create_fts_index),
+    Migration(5, "readability metric columns on articles / sentences", _V5_METRIC_COLUMNS),
+    Migration(6, "word_index / word_coverage tables (lemma index over word lists)", _V6_WORD_INDEX),
+    Migration(7, "per-article glossary table + articles.glossary_terms", _V7_GLOSSARY),
+    Migration(8, "paragraphs.derived flags + paragraph_texts view + settings table", _V8_NORMALIZED_STORAGE),
+    Migration(9, "sentences.translated_by (translator backend per sentence)", _V9_TRANSLATED_BY),
+    Migration(10, "images table (article image thumbnails)", _V10_IMAGES),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(
+    conn: sqlite3.Connection,
+    target: int = LATEST_VERSION,
+    verbose: bool = False,
+) -> list[tuple[int, str, float]]:
+    """
+    Apply pending migrations up to `target`.
+
+    `conn` must be in autocommit mode (isolation_level=None) and not inside a
+    transaction. Returns (version, description, seconds) for each step run.
+    """
+    if conn.in_transaction:
+        raise RuntimeError("migrate() must not be called inside a transaction")
+
+    current = schema_version(conn)
+    if current > LATEST_VERSION:
+        raise RuntimeError(
+            f"Database schema v{current} is newer than this crawler (v{LATEST_VERSION}). "
+            "Update the crawler code before opening it."
+        )
+
+    timings: list[tuple[int, str, float]] = []
+    for m in MIGRATIONS:
+        if m.version <= current or m.version > target:
+            continue
+        t0 = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for stmt in m.statements:
+                conn.execute(stmt)
+            if m.apply:
+                m.apply(conn)
+            conn.execute(f"PRAGMA user_version = {m.version}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        elapsed = time.perf_counter() - t0
+        timings.append((m.version, m.description, elapsed))
+        if verbose:
+            print(f"  migrated → v{m.version} ({elapsed:.2f}s): {m.description}")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate an articles.db schema")
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--status", action="store_true", help="Only print the schema version")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        parser.error(f"{args.db} not found")
+    conn = sqlite3.connect(str(args.db), isolation_level=None)
+    try:
+        current = schema_version(conn)
+        print(f"  {args.db}: schema v{current} (latest v{LATEST_VERSION})")
+        if args.status:
+            return
+        timings = migrate(conn, verbose=True)
+        if not timings:
+            print("  Already up to date.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Optional normalized storage: paragraph text derived from sentences, and
+compressed sentence analysis.
+
+The analyzer builds every paragraph translation by joining its sentence
+translations, and the paragraph English is the joined sentences too, so a
+plain articles.db stores nearly all of its text twice. In normalized mode:
+
+  paragraphs.derived   bit 1: en_text is the sentences' English joined by
+                       " ", bit 2: likewise cn_text; a derived column is
+                       stored as '' and rebuilt on read
+  paragraph_texts      view with the full paragraph text, stored or derived
+                       (migration 8), for ad-hoc queries; the exporters
+                       rebuild it from the sentences they read anyway
+  sentences.analysis   zlib-compressed BLOB (pack_analysis), with a preset
+                       dictionary of the analysis JSON keys; readers call
+                       unpack_analysis(), which passes plain text through
+
+A paragraph is only marked derived when its stored text equals the join
+exactly, so reads are byte-identical to the plain layout. Rows describe
+themselves (the flags, BLOB vs TEXT), so plain and normalized rows can mix,
+and archived partitions keep whatever layout they were copied with. The mode
+is recorded in the `settings` table; ArticleDB writes new articles in it.
+
+    python run_crawler.py normalize            # deduplicate + compress, VACUUM
+    python run_crawler.py normalize --expand   # back to the plain layout
+    python run_crawler.py normalize --status   # mode and table sizes only
+"""
+import argparse
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+
+EN_DERIVED = 1
+CN_DERIVED = 2
+
+PLAIN = "plain"
+NORMALIZED = "normalized"
+_MODE_KEY = "storage"
+
+# Packed analysis: one version byte, then raw deflate with _ZDICT preset.
+# Changing the dictionary needs a new version byte (old rows keep theirs).
+_PACK_V1 = b"\x01"
+_ZDICT = (
+    '{"type": "adverbial", "text": "{"type": "nominal", "text": "'
+    '{"type": "relative", "text": "", "object": "", "clauses": [], '
+    '"structure_note": "主句 + 定语从句，从句", "translation": "'
+    '{"subject": "", "predicate": "'
+).encode("utf-8")
+_BATCH_ROWS = 2000
+
+
+def pack_analysis(analysis: str) -> str | bytes:
+    """Compressed form of an analysis JSON string, or the string if not smaller."""
+    if not analysis:
+        return analysis
+    c = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=_ZDICT)
+    packed = _PACK_V1 + c.compress(analysis.encode("utf-8")) + c.flush()
+    return packed if len(packed) < len(analysis.encode("utf-8")) else analysis
+
+
+def unpack_analysis(value: str | bytes | None) -> str:
+    """The analysis JSON string of a stored value, packed or not."""
+    if not value:
+        return ""
+    if isinstance(value, str):
+        return value
+    if value[:1] != _PACK_V1:
+        raise ValueError(f"unknown analysis encoding {value[:1]!r}")
+    d = zlib.decompressobj(-15, zdict=_ZDICT)
+    return (d.decompress(value[1:]) + d.flush()).decode("utf-8")
+
+
+def joined(parts: list[str | None]) -> str | None:
+    """Paragraph text from its sentence texts: group_concat(text, ' ') in Python."""
+    parts = [p for p in parts if p is not None]
+    return " ".join(parts) if parts else None
+
+
+def derived_flags(en_text: str, cn_text: str, sentences) -> int:
+    """`derived` bits for a paragraph given its (en_text, cn_text) sentences."""
+    flags = 0
+    if en_text and en_text == joined([en for en, _ in sentences]):
+        flags |= EN_DERIVED
+    if cn_text and cn_text == joined([cn for _, cn in sentences]):
+        flags |= CN_DERIVED
+    return flags
+
+
+def storage_mode(conn: sqlite3.Connection) -> str:
+    row = conn.execute("SELECT value FROM settings WHERE key = ?", (_MODE_KEY,)).fetchone()
+    return row[0] if row else PLAIN
+
+
+def _set_mode(conn: sqlite3.Connection, mode: str) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (_MODE_KEY, mode)
+    )
+
+
+# ── Conversion ────────────────────────────────────────────────────────────────
+
+# Same expression as the paragraph_texts view
+_JOINED = """(SELECT group_concat({col}, ' ') FROM
+                (SELECT {col} FROM sentences WHERE paragraph_id = paragraphs.id ORDER BY seq))"""
+
+
+@dataclass
+class NormalizeStats:
+    en_paragraphs: int = 0   # paragraph texts converted, per language
+    cn_paragraphs: int = 0
+    analyses: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    seconds: float = 0.0
+
+
+def _recode_analysis(conn: sqlite3.Connection, where: str, convert) -> int:
+    """Rewrite the analysis of the sentences matching `where`, in id order."""
+    n, last = 0, 0
+    while rows := conn.execute(
+        f"SELECT id, analysis FROM sentences WHERE id > ? AND {where} ORDER BY id LIMIT ?",
+        (last, _BATCH_ROWS),
+    ).fetchall():
+        updates = [(new, sid) for sid, old in rows if (new := convert(old)) != old]
+        conn.executemany("UPDATE sentences SET analysis = ? WHERE id = ?", updates)
+        n += len(updates)
+        last = rows[-1][0]
+    return n
+
+
+def normalize(conn: sqlite3.Connection, expand: bool = False) -> NormalizeStats:
+    """
+    Convert the database to the normalized layout (or back with expand=True)
+    in one transaction, and record the mode for future writes. Idempotent.
+    `conn` must be in autocommit mode; VACUUM afterwards to return the space.
+    """
+    stats = NormalizeStats()
+    t0 = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if expand:
+            counts = [
+                conn.execute(
+                    f"""UPDATE paragraphs SET {col} = coalesce({_JOINED.format(col=col)}, ''),
+                                              derived = derived & ~{bit}
+                         WHERE derived & {bit}"""
+                ).rowcount
+                for col, bit in (("en_text", EN_DERIVED), ("cn_text", CN_DERIVED))
+            ]
+            stats.analyses = _recode_analysis(conn, "typeof(analysis) = 'blob'", unpack_analysis)
+            _set_mode(conn, PLAIN)
+        else:
+            counts = [
+                conn.execute(
+                    f"""UPDATE paragraphs SET {col} = '', derived = derived | {bit}
+                         WHERE NOT derived & {bit} AND {col} != ''
+                           AND {col} = {_JOINED.format(col=col)}"""
+                ).rowcount
+                for col, bit in (("en_text", EN_DERIVED), ("cn_text", CN_DERIVED))
+            ]
+            stats.analyses = _recode_analysis(
+                conn, "typeof(analysis) = 'text' AND analysis != ''", pack_analysis
+            )
+            _set_mode(conn, NORMALIZED)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    stats.en_paragraphs, stats.cn_paragraphs = counts
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def table_sizes(conn: sqlite3.Connection) -> dict[str, int]:
+    """Bytes used per table (indexes included), largest first; needs dbstat."""
+    try:
+        rows = conn.execute(
+            """SELECT coalesce(m.tbl_name, d.name), sum(d.pgsize)
+                 FROM dbstat d LEFT JOIN sqlite_master m ON m.name = d.name
+                GROUP BY 1 ORDER BY 2 DESC"""
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return {}  # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+    return dict(rows)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--expand", action="store_true", help="Convert back to the plain layout")
+    mode.add_argument("--status", action="store_true", help="Only print the mode and table sizes")
+    parser.add_argument("--no-vacuum", action="store_true",
+                        help="Skip VACUUM (the file keeps its size until the next one)")
+
+
+def cli(args: argparse.Namespace) -> None:
+    from .db import ArticleDB  # migrates the schema to include the derived flags
+
+    if args.status:
+        ArticleDB(args.db).close()
+        conn = sqlite3.connect(args.db.resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            print(f"  {args.db}: {storage_mode(conn)} storage, {args.db.stat().st_size / 1e6:.1f} MB")
+            for table, size in list(table_sizes(conn).items())[:8]:
+                print(f"    {table:<24} {size / 1e6:>8.2f} MB")
+        finally:
+            conn.close()
+        return
+
+    with ArticleDB(args.db) as db:
+        stats = db.normalize(expand=args.expand, vacuum=not args.no_vacuum)
+    what = "Expanded" if args.expand else "Normalized"
+    print(f"  {what} {stats.en_paragraphs} en / {stats.cn_paragraphs} cn paragraph texts "
+          f"and {stats.analyses} analyses in {stats.seconds:.1f}s")
+    print(f"  {args.db}: {stats.bytes_before / 1e6:.1f} MB → {stats.bytes_after / 1e6:.1f} MB")
@@ -5,6 +5,25 @@ Usage (from data/ directory):
     python run_crawler.py              # run once and exit
     python run_crawler.py --loop       # run daily at 08:00 (blocking)
     python run_crawler.py --time 20:00 # run daily at 20:00
+    python run_crawler.py --sources guardian,bbc --limit 2   # a quick partial run
+    python run_crawler.py --no-translate   # store English only; `backfill translate` later
+
+Multi-process mode (see crawler/worker.py):
+    python run_crawler.py --enqueue    # queue fetch jobs (combine with --loop)
+    python run_crawler.py --worker     # start a worker; run as many as you like
+    python run_crawler.py --queue-stats
+
+Corpus tools:
+    python run_crawler.py search "climate change"   # full-text sentence search
+    python run_crawler.py archive --keep-months 3   # move old months to partitions
+    python run_crawler.py export --web ../article-data --daily .  # JSON exports
+    python run_crawler.py metrics                   # backfill readability metrics
+    python run_crawler.py words                     # backfill the word-list index
+    python run_crawler.py glossary --limit 200      # backfill article glossaries
+    python run_crawler.py thumbs --limit 500        # backfill article image thumbnails
+    python run_crawler.py normalize                 # deduplicated, compressed storage
+    python run_crawler.py backfill translate --budget 2000000  # re-translate with the current backend
+    python run_crawler.py serve                     # shared batching translation service
 
 Windows Task Scheduler alternative (recommended for production):
     1. Open Task Scheduler → Create Basic Task
@@ -13,16 +32,60 @@ Windows Task Scheduler alternative (recommended for production):
        Program: python
        Arguments: run_crawler.py
        Start in: C:\path\to\OpenWords\data
+
+Only the modules the chosen command needs are imported: a subcommand loads
+its own module, and the crawler's sources, HTTP clients and translators are
+loaded by the crawl itself (see benchmarks/bench_startup.py).
 """
 import argparse
+import sys
 import time
+from functools import partial
+from importlib import import_module
+
+from . import config
+from .jobqueue import JOB_KINDS
+from .sources import parse_sources
+
+# Subcommand → (module providing add_arguments() and cli(), help)
+COMMANDS = {
+    "search": (".search", "Full-text search over stored sentences"),
+    "archive": (".archive", "Move old months into partition files"),
+    "export": (".export.engine", "Write JSON exports in one pass over the DB"),
+    "metrics": (".metrics", "Compute readability metrics (backfill)"),
+    "words": (".wordindex", "Build the lemma index over word lists (backfill)"),
+    "glossary": (".glossary", "Build per-article glossaries (backfill)"),
+    "thumbs": (".thumbnails", "Make article image thumbnails (backfill)"),
+    "normalize": (".normalize", "Switch articles.db to normalized storage"),
+    "backfill": (".backfill", "Re-translate / re-analyze stored sentences"),
+    "serve": (".service", "Run the shared translation service (HTTP)"),
+}
+
 
-import schedule  # pip install schedule
+def _add_commands(parser: argparse.ArgumentParser, argv: list[str]) -> None:
+    """
+    Register every subcommand, importing only the module of the one named
+    in `argv` (the others just need their help line).
+    """
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    chosen = next((arg for arg in argv if arg in COMMANDS), None)
+    for name, (module_name, help_text) in COMMANDS.items():
+        command_parser = commands.add_parser(name, help=help_text)
+        if name == chosen:
+            module = import_module(module_name, __package__)
+            module.add_arguments(command_parser)
+            command_parser.set_defaults(func=module.cli)
 
-from .main import run
 
+def _source_list(value: str) -> list[str]:
+    try:
+        return parse_sources(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
 
-def main() -> None:
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
     parser = argparse.ArgumentParser(description="OpenWords Crawler Scheduler")
     parser.add_argument(
         "--loop",
@@ -35,19 +98,98 @@ def main() -> None:
         metavar="HH:MM",
         help="Time of day for the daily run (default: 08:00)",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Queue fetch jobs for workers instead of crawling in-process",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Claim and run queued jobs until stopped",
+    )
+    parser.add_argument(
+        "--kinds",
+        default=",".join(JOB_KINDS),
+        help="Comma-separated job kinds a worker accepts (default: all)",
+    )
+    parser.add_argument(
+        "--exit-when-idle",
+        action="store_true",
+        help="Worker exits once the queue has no runnable jobs",
+    )
+    parser.add_argument(
+        "--queue-stats",
+        action="store_true",
+        help="Print job counts by kind and status, then exit",
+    )
+    parser.add_argument(
+        "--sources",
+        type=_source_list,
+        metavar="NAME,...",
+        help="Crawl / enqueue only these sources (default: all)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=config.ARTICLES_PER_SOURCE,
+        metavar="N",
+        help=f"New articles per source (default: {config.ARTICLES_PER_SOURCE})",
+    )
+    parser.add_argument(
+        "--no-translate",
+        action="store_true",
+        help="Store articles untranslated (fill in later with `backfill translate`)",
+    )
+    _add_commands(parser, argv)
+
+    args = parser.parse_args(argv)
+
+    if args.command:
+        args.func(args)
+        return
+
+    if args.no_translate and (args.worker or args.enqueue):
+        parser.error("--no-translate only applies to an in-process crawl")
+
+    if args.queue_stats:
+        from .worker import print_queue_stats
+
+        print_queue_stats()
+        return
+
+    if args.worker:
+        from .worker import run_worker
+
+        kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+        unknown = set(kinds) - set(JOB_KINDS)
+        if unknown:
+            parser.error(f"unknown job kind(s): {', '.join(sorted(unknown))}")
+        run_worker(kinds=kinds, exit_when_idle=args.exit_when_idle)
+        return
+
+    if args.enqueue:
+        from .worker import enqueue_candidates
+
+        job = partial(enqueue_candidates, args.limit, args.sources)
+    else:
+        from .main import run
+
+        job = partial(run, args.sources, args.limit, translate=not args.no_translate)
 
     if not args.loop:
         # One-shot mode
-        run()
+        job()
         return
 
     # Daily loop mode
+    import schedule  # pip install schedule
+
     print(f"Scheduler: daily run at {args.time}")
-    schedule.every().day.at(args.time).do(run)
+    schedule.every().day.at(args.time).do(job)
 
     print("Running initial crawl now...")
-    run()
+    job()
 
     print(f"Waiting for next scheduled run at {args.time}...")
     while True:
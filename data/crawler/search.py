@@ -0,0 +1,174 @@
+"""
+Full-text search over stored sentences.
+
+Backed by the FTS5 tables created in migrations.py (v4): English queries are
+stemmed ("studies" finds "study"), Chinese queries use a trigram index. Hits
+are ranked by BM25 and returned with a highlighted snippet plus enough
+article context to link to the reader.
+
+Chinese queries shorter than three characters cannot use a trigram index and
+fall back to a LIKE scan, as does everything on SQLite builds without FTS5.
+
+Usage (from data/ directory):
+    python run_crawler.py search "renewable energy"
+    python run_crawler.py search 气候 --lang cn --limit 5
+    python run_crawler.py search --rebuild        # (re)create the index
+"""
+import argparse
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .migrations import create_fts_index, migrate
+
+_HIGHLIGHT = ("[", "]")
+_CJK = re.compile(r"[㐀-鿿]")
+
+
+@dataclass
+class SearchHit:
+    sentence_id: int
+    article_id: int
+    paragraph_seq: int
+    title: str
+    source: str
+    crawled_at: str
+    en_text: str
+    cn_text: str
+    snippet: str     # matched column with hits wrapped in [ ]
+    rank: float      # BM25, lower is better; 0.0 for LIKE fallback hits
+
+
+def _fts_query(text: str) -> str:
+    """Quote every term so user input can never be parsed as FTS5 syntax."""
+    terms = text.split()
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def _resolve_lang(query: str, lang: str) -> str:
+    if lang == "auto":
+        return "cn" if _CJK.search(query) else "en"
+    return lang
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    lang: str = "auto",
+    limit: int = 20,
+    source: str | None = None,
+) -> list[SearchHit]:
+    """
+    Return up to `limit` sentences matching `query`, best first.
+
+    Args:
+        lang:   'en', 'cn', or 'auto' (cn if the query contains CJK characters).
+        source: Optional source filter, e.g. 'bbc'.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    lang = _resolve_lang(query, lang)
+
+    fts_table, column = ("sentences_fts", "en_text") if lang == "en" else ("sentences_fts_cn", "cn_text")
+    use_fts = _has_table(conn, fts_table) and not (lang == "cn" and len(query) < 3)
+
+    source_sql = "AND a.source = ?" if source else ""
+    if use_fts:
+        sql = f"""
+            SELECT s.id, a.id, p.seq, a.title, a.source, a.crawled_at,
+                   s.en_text, s.cn_text,
+                   snippet({fts_table}, 0, ?, ?, '…', 16), f.rank
+              FROM {fts_table} f
+              JOIN sentences  s ON s.id = f.rowid
+              JOIN paragraphs p ON p.id = s.paragraph_id
+              JOIN articles   a ON a.id = p.article_id
+             WHERE {fts_table} MATCH ? {source_sql}
+             ORDER BY f.rank
+             LIMIT ?
+        """
+        # Chinese has no spaces to split on: match the whole query as a phrase
+        match = _fts_query(query) if lang == "en" else '"' + query.replace('"', '""') + '"'
+        params: list = [*_HIGHLIGHT, match]
+    else:
+        sql = f"""
+            SELECT s.id, a.id, p.seq, a.title, a.source, a.crawled_at,
+                   s.en_text, s.cn_text, s.{column}, 0.0
+              FROM sentences  s
+              JOIN paragraphs p ON p.id = s.paragraph_id
+              JOIN articles   a ON a.id = p.article_id
+             WHERE s.{column} LIKE ? ESCAPE '\\' {source_sql}
+             ORDER BY a.crawled_at DESC
+             LIMIT ?
+        """
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params = [f"%{escaped}%"]
+    if source:
+        params.append(source)
+    params.append(limit)
+
+    return [SearchHit(*row) for row in conn.execute(sql, params)]
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("query", nargs="?", default="", help="Words or phrase to find")
+    parser.add_argument("--lang", choices=["auto", "en", "cn"], default="auto")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--source", default=None, help="Only this source (e.g. bbc)")
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="(Re)create the full-text index from the sentences table",
+    )
+
+
+def cli(args: argparse.Namespace) -> None:
+    if not args.db.exists():
+        print(f"  {args.db} not found.")
+        return
+
+    conn = sqlite3.connect(str(args.db), isolation_level=None)
+    try:
+        if args.rebuild:
+            conn.execute("BEGIN")
+            ok = create_fts_index(conn)
+            conn.execute("COMMIT")
+            print("  Full-text index rebuilt." if ok else "  Full-text index unavailable.")
+            return
+        migrate(conn, verbose=True)  # older DBs get the index on first search
+        if not args.query:
+            print("  Nothing to search for.")
+            return
+
+        hits = search(conn, args.query, lang=args.lang, limit=args.limit, source=args.source)
+    finally:
+        conn.close()
+
+    if not hits:
+        print("  No matches.")
+    for hit in hits:
+        print(f"\n  [{hit.source}] #{hit.article_id} ¶{hit.paragraph_seq}  {hit.title[:70]}")
+        print(f"    {hit.snippet}")
+        other = hit.cn_text if _resolve_lang(args.query, args.lang) == "en" else hit.en_text
+        if other:
+            print(f"    {other}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search stored article sentences")
+    add_arguments(parser)
+    cli(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Sentence segmentation by character offsets.
+
+segment_article() takes all paragraphs of an article in one call and
+returns, per paragraph, the (start, end) offsets of its sentences — no
+substrings are built unless the caller slices them. The paragraphs are
+joined and scanned once by a compiled boundary pattern; each candidate
+boundary is then checked against a few rules:
+
+  - terminal punctuation . ! ? may be followed by closing quotes or brackets
+    ('He said "no." Then' splits after the quote)
+  - the next sentence must start with a capital or a digit, optionally
+    behind an opening quote or bracket
+  - after a bare full stop, the preceding token must not be a known
+    abbreviation (ABBREVIATIONS; NUMBER_ABBREVIATIONS before a digit), a
+    single-letter initial ("J. K. Rowling"), or a dotted acronym ("U.S.",
+    "a.m.", "Ph.D.")
+
+Decimal numbers ("3.5 Million") never split: a boundary needs whitespace
+after the punctuation. Any whitespace counts, line breaks inside a paragraph
+included; the paragraphs are joined with a separator that is not whitespace
+to the pattern, so no boundary spans two paragraphs.
+"""
+import re
+
+# Lower-case, without the trailing full stop. A full stop after one of these
+# does not end a sentence. Ambiguous sentence-final abbreviations ("etc",
+# "Inc") are included: in news text they are far more often mid-sentence.
+ABBREVIATIONS = frozenset({
+    # titles and ranks
+    "mr", "mrs", "ms", "mx", "dr", "prof", "sr", "jr", "st", "rev", "hon",
+    "gen", "lt", "col", "maj", "capt", "cpt", "sgt", "cpl", "adm", "cmdr",
+    "gov", "sen", "rep", "pres", "supt", "insp", "det", "fr", "mme", "mlle",
+    # months and days
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct",
+    "nov", "dec", "mon", "tue", "tues", "wed", "thu", "thur", "thurs", "fri",
+    # organisations and places
+    "inc", "corp", "co", "ltd", "plc", "bros", "assn", "dept", "univ", "govt",
+    "ave", "blvd", "rd", "mt", "ft",
+    # references, measures and Latin
+    "vs", "v", "etc", "cf", "al", "approx", "est", "ed", "eds", "op", "viz",
+    "ca", "km", "kg", "lb", "lbs", "oz", "hr", "hrs", "sq",
+})
+
+# Abbreviations only before a number ("No. 10", "pp. 3-5"); elsewhere these
+# are ordinary words that may end a sentence ("She said no. Then...")
+NUMBER_ABBREVIATIONS = frozenset({
+    "no", "nos", "vol", "vols", "p", "pp", "fig", "figs", "ch", "para", "art",
+})
+
+# Joins paragraphs for the single scan: the unit separator, which cannot
+# occur in crawled text (see hashing.py)
+_SEP = "\x1f"
+
+# A terminator, any closers, then the whitespace before the next sentence,
+# which must open with a capital or digit (behind optional quotes/brackets).
+# \s would match _SEP as well, so the whitespace class leaves it out.
+_BOUNDARY = re.compile(
+    r"""([.!?…]+)["'”’)\]]*"""
+    r"""([^\S\x1f]+)"""
+    r"""(?=["'“‘(\[]?[A-Z0-9])"""
+)
+
+# A dotted acronym such as U.S, e.g, a.m, Ph.D (checked without the final dot)
+_ACRONYM = re.compile(r"(?:[A-Za-z]{1,2}\.)+[A-Za-z]{1,2}")
+
+_OPENERS = "\"'“‘(["
+
+
+def _is_abbreviation(text: str, dot: int, lo: int, next_char: str) -> bool:
+    """True if the full stop at text[dot] ends an abbreviation or initial."""
+    start = text.rfind(" ", lo, dot) + 1 or lo
+    # The token may follow a line break rather than a space
+    words = text[start:dot].split()
+    token = words[-1].lstrip(_OPENERS) if words else ""
+    if not token:
+        return False
+    lower = token.lower()
+    if lower in NUMBER_ABBREVIATIONS:
+        return next_char.isdigit()
+    if len(token) == 1:
+        return token.isupper() or lower in ABBREVIATIONS  # initials: "J. K."
+    return lower in ABBREVIATIONS or _ACRONYM.fullmatch(token) is not None
+
+
+def segment_article(paragraphs: list[str]) -> list[list[tuple[int, int]]]:
+    """
+    Sentence offsets for every paragraph: result[i] is a list of (start, end)
+    into paragraphs[i], with surrounding whitespace excluded. Blank
+    paragraphs get an empty list.
+    """
+    text = _SEP.join(paragraphs)
+    result: list[list[tuple[int, int]]] = [[] for _ in paragraphs]
+
+    # Paragraph starts in the joined text
+    starts, pos = [], 0
+    for para in paragraphs:
+        starts.append(pos)
+        pos += len(para) + len(_SEP)
+
+    def emit(i: int, lo: int, hi: int) -> None:
+        """Record text[lo:hi] (joined offsets) as a sentence of paragraph i."""
+        base = starts[i]
+        s, e = lo - base, hi - base
+        para = paragraphs[i]
+        while s < e and para[s].isspace():
+            s += 1
+        while e > s and para[e - 1].isspace():
+            e -= 1
+        if s < e:
+            result[i].append((s, e))
+
+    para_i = 0
+    sent_start = 0
+    for m in _BOUNDARY.finditer(text):
+        # Close any paragraphs that ended before this match
+        while para_i + 1 < len(starts) and starts[para_i + 1] <= m.start():
+            emit(para_i, sent_start, starts[para_i] + len(paragraphs[para_i]))
+            para_i += 1
+            sent_start = starts[para_i]
+        # Only a bare full stop can end an abbreviation: 'said "no." Then' splits
+        if (m.group(1) == "." and m.end(1) == m.start(2)
+                and _is_abbreviation(text, m.start(1), max(sent_start, starts[para_i]), text[m.end()])):
+            continue
+        emit(para_i, sent_start, m.start(2))
+        sent_start = m.end()
+
+    for i in range(para_i, len(paragraphs)):
+        emit(i, sent_start if i == para_i else starts[i], starts[i] + len(paragraphs[i]))
+    return result
+
+
+def segment(text: str) -> list[tuple[int, int]]:
+    """Sentence offsets within a single paragraph."""
+    return segment_article([text])[0]
@@ -0,0 +1,474 @@
+"""
+Local translation service shared by the crawler and the web app.
+
+    python run_crawler.py serve                       # configured backend, port 8787
+    python run_crawler.py serve --backend stub        # offline, for tests
+
+    TRANSLATION_SERVICE_URL=http://127.0.0.1:8787     # crawler and Next.js routes
+
+One process owns the translator backend (crawler.translator) and answers
+
+  POST /translate  {"text": ...} → {"translation": ...}
+                   {"texts": [...]} → {"translations": [...]}
+  POST /analyze    {"text": ...} → {"analysis": {...}}    (DeepSeek / stub)
+  GET  /health     {"backend", "analysis"}
+  GET  /metrics    request latency percentiles, batch sizes, cache hit rates
+
+Requests for the same kind are merged into micro-batches: the first text
+waits up to --window-ms for others (up to --max-batch distinct texts), and
+the batch goes to the backend as one translate_batch() call where that is a
+single request (DeepSeek). Backends without batched requests (Google) run
+one translate_batch() loop at a time, request_interval apart, paced as when
+the crawler calls them directly. A text already in flight joins the pending
+request instead of being sent twice.
+Answers are cached in an in-memory LRU in front of a SQLite table
+(config.TRANSLATION_CACHE_PATH), keyed by kind, backend and text, so they
+survive restarts and are shared by every client. Failed (empty) answers are
+not cached.
+"""
+import argparse
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from . import config
+from .hashing import text_hash
+from .translator import BACKENDS, BaseTranslator, get_translator
+
+WINDOW_SECONDS = 0.02
+MAX_BATCH = 32
+WORKERS = 4
+LRU_SIZE = 20_000
+MAX_TEXTS_PER_REQUEST = 200
+MAX_BODY_BYTES = 1 << 20
+_LATENCY_SAMPLES = 2048
+
+
+def supports_analysis(translator: BaseTranslator) -> bool:
+    return type(translator).analyze_sentence is not BaseTranslator.analyze_sentence
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+class Cache:
+    """LRU of recent answers in front of a SQLite table of all of them."""
+
+    def __init__(self, path: Path | None, capacity: int = LRU_SIZE) -> None:
+        self.capacity = capacity
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache (
+                       key        TEXT PRIMARY KEY,
+                       value      TEXT NOT NULL,
+                       created_at REAL NOT NULL
+                   ) WITHOUT ROWID"""
+            )
+        self._db_lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, backend: str, text: str) -> str:
+        return f"{kind}:{backend}:{text_hash(text)}"
+
+    def get_recent(self, key: str) -> str | None:
+        with self._lock:
+            value = self._lru.get(key)
+            if value is not None:
+                self._lru.move_to_end(key)
+            return value
+
+    def get_stored(self, keys: list[str]) -> dict[str, str]:
+        if self._conn is None or not keys:
+            return {}
+        with self._db_lock:
+            found = dict(self._conn.execute(
+                f"SELECT key, value FROM cache WHERE key IN ({','.join('?' * len(keys))})", keys
+            ))
+        self._remember(found)
+        return found
+
+    def put(self, items: dict[str, str]) -> None:
+        if not items:
+            return
+        self._remember(items)
+        if self._conn is None:
+            return
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                [(k, v, now) for k, v in items.items()],
+            )
+            self._conn.execute("COMMIT")
+
+    def _remember(self, items: dict[str, str]) -> None:
+        with self._lock:
+            for k, v in items.items():
+                self._lru[k] = v
+                self._lru.move_to_end(k)
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters: dict[str, int] = {}
+        self._latency: dict[str, deque] = {}
+        self._batch_sizes: dict[str, deque] = {}
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self._latency.setdefault(endpoint, deque(maxlen=_LATENCY_SAMPLES)).append(seconds)
+
+    def batch(self, kind: str, size: int) -> None:
+        with self._lock:
+            self._batch_sizes.setdefault(kind, deque(maxlen=_LATENCY_SAMPLES)).append(size)
+
+    @staticmethod
+    def _percentile(values: list[float], q: float) -> float:
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+            latency = {k: sorted(v) for k, v in self._latency.items()}
+            batches = {k: list(v) for k, v in self._batch_sizes.items()}
+        out: dict = {"uptime_s": round(time.time() - self.started, 1), "counters": counters}
+        out["latency_ms"] = {
+            endpoint: {
+                "samples": len(v),
+                "p50": round(self._percentile(v, 0.50) * 1000, 1),
+                "p95": round(self._percentile(v, 0.95) * 1000, 1),
+                "p99": round(self._percentile(v, 0.99) * 1000, 1),
+                "max": round(v[-1] * 1000, 1),
+            }
+            for endpoint, v in latency.items() if v
+        }
+        out["batches"] = {
+            kind: {"recent": len(v), "mean_size": round(sum(v) / len(v), 2), "max_size": max(v)}
+            for kind, v in batches.items() if v
+        }
+        cache = {}
+        for kind in ("translate", "analyze"):
+            recent = counters.get(f"{kind}.cache_lru", 0)
+            stored = counters.get(f"{kind}.cache_db", 0)
+            backend = counters.get(f"{kind}.backend_texts", 0)
+            joined = counters.get(f"{kind}.joined_inflight", 0)
+            total = recent + stored + backend + joined
+            if total:
+                cache[kind] = {
+                    "lru_hits": recent, "db_hits": stored, "inflight_joins": joined,
+                    "backend_texts": backend, "hit_rate": round((recent + stored + joined) / total, 4),
+                }
+        out["cache"] = cache
+        return out
+
+
+# ── Micro-batching ────────────────────────────────────────────────────────────
+
+class MicroBatcher:
+    """
+    Collects texts from concurrent callers for up to `window` seconds (or
+    `max_batch` texts) and answers them with one call of `run(texts)`.
+    Batches are dispatched on a pool, so collection continues while earlier
+    batches wait on the backend.
+    """
+
+    def __init__(self, kind: str, backend: str, run, encode, decode, cache: Cache,
+                 metrics: Metrics, window: float, max_batch: int, workers: int) -> None:
+        self.kind = kind
+        self.backend = backend
+        self._run, self._encode, self._decode = run, encode, decode
+        self._cache, self._metrics = cache, metrics
+        self._window, self._max_batch = window, max_batch
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._inflight: dict[str, list[Future]] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{kind}-batch")
+        threading.Thread(target=self._collect, name=f"{kind}-collector", daemon=True).start()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        key = Cache.key(self.kind, self.backend, text)
+        cached = self._cache.get_recent(key)
+        if cached is not None:
+            self._metrics.count(f"{self.kind}.cache_lru")
+            future.set_result(self._decode(cached))
+            return future
+        with self._lock:
+            waiters = self._inflight.get(text)
+            if waiters is not None:
+                waiters.append(future)
+                self._metrics.count(f"{self.kind}.joined_inflight")
+                return future
+            self._inflight[text] = [future]
+        self._queue.put(text)
+        return future
+
+    def _collect(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._pool.submit(self._dispatch, batch)
+
+    def _dispatch(self, texts: list[str]) -> None:
+        keys = {t: Cache.key(self.kind, self.backend, t) for t in texts}
+        try:
+            stored = self._cache.get_stored(list(keys.values()))
+            answers = {t: self._decode(stored[k]) for t, k in keys.items() if k in stored}
+            self._metrics.count(f"{self.kind}.cache_db", len(answers))
+            missing = [t for t in texts if t not in answers]
+            if missing:
+                self._metrics.batch(self.kind, len(missing))
+                self._metrics.count(f"{self.kind}.backend_calls")
+                self._metrics.count(f"{self.kind}.backend_texts", len(missing))
+                results = self._run(missing)
+                fresh = {}
+                for text, result in zip(missing, results):
+                    answers[text] = result
+                    if result:
+                        fresh[keys[text]] = self._encode(result)
+                self._cache.put(fresh)
+            error = None
+        except Exception as exc:
+            self._metrics.count(f"{self.kind}.errors")
+            answers, error = {}, exc
+        for text in texts:
+            with self._lock:
+                waiters = self._inflight.pop(text, [])
+            for future in waiters:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(answers.get(text))
+
+
+class TranslationService:
+    """The translator backend behind a cache and one micro-batcher per kind."""
+
+    def __init__(
+        self,
+        translator: BaseTranslator,
+        cache_path: Path | None = config.TRANSLATION_CACHE_PATH,
+        lru_size: int = LRU_SIZE,
+        window: float = WINDOW_SECONDS,
+        max_batch: int = MAX_BATCH,
+        workers: int = WORKERS,
+    ) -> None:
+        self.translator = translator
+        self.analysis = supports_analysis(translator)
+        self.metrics = Metrics()
+        self.cache = Cache(cache_path, lru_size)
+        # Parallel single-text calls after a batched request came back short
+        self._calls = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backend")
+        common = dict(cache=self.cache, metrics=self.metrics, window=window,
+                      max_batch=max_batch, workers=workers)
+        # Backends without batched requests are paced: one call at a time
+        self._paced = threading.Lock()
+        self._last_call = 0.0
+        self._translate = MicroBatcher(
+            "translate", translator.name, self._translate_texts,
+            encode=str, decode=str, **common,
+        )
+        self._analyze = MicroBatcher(
+            "analyze", translator.name, self._analyze_texts,
+            encode=lambda a: json.dumps(a, ensure_ascii=False), decode=json.loads, **common,
+        )
+
+    def _translate_texts(self, texts: list[str]) -> list[str]:
+        if not self.translator.batch_calls:
+            with self._paced:
+                wait = self._last_call + self.translator.request_interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    return self.translator.translate_batch(texts)
+                finally:
+                    self._last_call = time.monotonic()
+        if len(texts) > 1:
+            try:
+                results = self.translator.translate_batch(texts)
+            except Exception as exc:
+                print(f"    [service] batch of {len(texts)} failed: {exc}")
+                results = []
+            if len(results) == len(texts) and all(results):
+                return results
+            self.metrics.count("translate.batch_fallbacks")
+        return list(self._calls.map(self.translator.translate, texts))
+
+    def _analyze_texts(self, texts: list[str]) -> list[dict | None]:
+        return list(self._calls.map(self.translator.analyze_sentence, texts))
+
+    def translate(self, texts: list[str], timeout: float = 300) -> list[str]:
+        futures = [self._translate.submit(t) for t in texts]
+        return [f.result(timeout) or "" for f in futures]
+
+    def analyze(self, text: str, timeout: float = 300) -> dict | None:
+        return self._analyze.submit(text).result(timeout)
+
+    def health(self) -> dict:
+        return {"backend": self.translator.name, "analysis": self.analysis}
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "OpenWordsTranslate/1"
+    service: TranslationService  # set on the subclass by make_server()
+    quiet = True
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        elif self.path == "/metrics":
+            self._send(200, self.service.metrics.snapshot())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        t0 = time.perf_counter()
+        endpoint = self.path
+        if endpoint not in ("/translate", "/analyze"):
+            self._send(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, {"error": "body too large"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "Invalid JSON body"})
+            return
+        self.service.metrics.count(f"{endpoint[1:]}.requests")
+        try:
+            status, payload = self._handle(endpoint, body)
+        except Exception as exc:
+            self.service.metrics.count(f"{endpoint[1:]}.errors")
+            status, payload = 502, {"error": f"backend error: {exc}"}
+        self._send(status, payload)
+        self.service.metrics.observe(endpoint, time.perf_counter() - t0)
+
+    def _handle(self, endpoint: str, body: dict) -> tuple[int, dict]:
+        service = self.service
+        if endpoint == "/analyze":
+            text = body.get("text")
+            if not isinstance(text, str) or not text.strip():
+                return 400, {"error": "text is required"}
+            if not service.analysis:
+                return 503, {"error": f"backend '{service.translator.name}' has no sentence analysis"}
+            analysis = service.analyze(text.strip())
+            return (200, {"analysis": analysis}) if analysis else (502, {"error": "Analysis failed"})
+
+        texts = body.get("texts")
+        if texts is not None:
+            if (not isinstance(texts, list) or not all(isinstance(t, str) for t in texts)
+                    or len(texts) > MAX_TEXTS_PER_REQUEST):
+                return 400, {"error": f"texts must be a list of at most {MAX_TEXTS_PER_REQUEST} strings"}
+            return 200, {"translations": service.translate([t.strip() for t in texts])}
+        text = body.get("text")
+        if not isinstance(text, str) or not text.strip():
+            return 400, {"error": "text is required"}
+        translation = service.translate([text.strip()])[0]
+        return (200, {"translation": translation}) if translation else (502, {"error": "Translation failed"})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog (5) resets connections under a burst of
+    # concurrent clients (a backfill with several workers, many browser tabs)
+    request_queue_size = 128
+
+
+def make_server(service: TranslationService, host: str, port: int, quiet: bool = True) -> ThreadingHTTPServer:
+    """A threaded HTTP server for `service`; call serve_forever() on it."""
+    handler = type("Handler", (_Handler,), {"service": service, "quiet": quiet})
+    return _Server((host, port), handler)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=config.TRANSLATION_SERVICE_PORT)
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="Translator backend (default: DeepSeek if DEEPSEEK_API_KEY is set, else Google)")
+    parser.add_argument("--window-ms", type=float, default=WINDOW_SECONDS * 1000,
+                        help="How long a request waits for others to batch with")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="Distinct texts per backend call")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Backend calls in flight at once")
+    parser.add_argument("--cache", type=Path, default=config.TRANSLATION_CACHE_PATH,
+                        help="SQLite cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Only the in-memory LRU")
+    parser.add_argument("--lru", type=int, default=LRU_SIZE, help="Answers kept in memory")
+    parser.add_argument("--stub-delay", type=float, default=0.0, metavar="SECONDS",
+                        help="Per-request latency of the stub backend")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+
+def cli(args: argparse.Namespace) -> None:
+    translator = get_translator(args.backend or config.TRANSLATOR_BACKEND)
+    if args.backend == "stub":
+        translator.delay = args.stub_delay
+    service = TranslationService(
+        translator,
+        cache_path=None if args.no_cache else args.cache,
+        lru_size=args.lru,
+        window=args.window_ms / 1000,
+        max_batch=args.max_batch,
+        workers=args.workers,
+    )
+    server = make_server(service, args.host, args.port, quiet=not args.verbose)
+    print(f"  Translation service ({translator.name}) on http://{args.host}:{args.port}"
+          f" — window {args.window_ms:g} ms, batches of ≤{args.max_batch}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.cache.close()
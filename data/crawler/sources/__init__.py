@@ -1 +1,69 @@
-# Article source adapters
+"""
+Article source adapters, resolved lazily by name.
+
+SOURCE_CLASSES maps each source name to the "module:Class" implementing it;
+a source's module — and with it bs4, lxml, feedparser and requests — is only
+imported when get_source() first asks for it, so commands that never crawl
+do not load them and a single-source run loads one adapter:
+
+    python run_crawler.py --sources guardian,bbc --limit 2
+
+Further sources (e.g. in another package) are added with register_source()
+before the crawl starts; a class must subclass BaseSource and set `name`.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import BaseSource
+
+# Crawl order of a run over all sources
+SOURCE_CLASSES: dict[str, str] = {
+    "guardian": ".guardian:GuardianSource",
+    "bbc": ".bbc:BBCSource",
+    "voa": ".voa:VOASource",
+    "conversation": ".conversation:ConversationSource",
+}
+
+_instances: dict[str, "BaseSource"] = {}
+
+
+def register_source(name: str, target: str) -> None:
+    """
+    Add (or replace) source `name`, implemented by the class at
+    "package.module:Class" (a leading "." is relative to this package).
+    """
+    SOURCE_CLASSES[name] = target
+    _instances.pop(name, None)
+
+
+def source_names() -> list[str]:
+    return list(SOURCE_CLASSES)
+
+
+def parse_sources(value: str) -> list[str]:
+    """Source names from a comma-separated list; ValueError on an unknown one."""
+    names = [n.strip().lower() for n in value.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SOURCE_CLASSES]
+    if unknown:
+        raise ValueError(
+            f"unknown source(s): {', '.join(unknown)} (choose from {', '.join(SOURCE_CLASSES)})"
+        )
+    return list(dict.fromkeys(names))
+
+
+def get_source(name: str) -> "BaseSource":
+    """The source called `name`, importing its module on first use."""
+    if name not in _instances:
+        try:
+            target = SOURCE_CLASSES[name]
+        except KeyError:
+            raise ValueError(f"unknown source {name!r}") from None
+        module, _, cls = target.partition(":")
+        _instances[name] = getattr(import_module(module, __package__), cls)()
+    return _instances[name]
+
+
+def get_sources(names: list[str] | None = None) -> list["BaseSource"]:
+    """The sources called `names` in that order, or every registered source."""
+    return [get_source(n) for n in (source_names() if names is None else names)]
@@ -8,6 +8,7 @@ import requests
 
 from .. import config
 from ..models import RawArticle
+from ..timing import StageTimer
 
 
 class BaseSource(ABC):
@@ -65,45 +66,73 @@ class BaseSource(ABC):
         """Return a list of paragraph text strings from article HTML."""
         ...
 
-    # ── Public entry point ────────────────────────────────────────────────────
+    # ── Public entry points ───────────────────────────────────────────────────
 
-    def get_articles(self, limit: int = 5) -> list[RawArticle]:
-        """Fetch up to `limit` new articles from this source."""
-        entries = self._parse_rss()
-        articles: list[RawArticle] = []
-        fetched = 0
+    def discover(self, limit: int | None = None) -> list[dict]:
+        """
+        Return metadata dicts for candidate articles from the RSS feeds.
 
-        for entry in entries:
-            if fetched >= limit:
+        No article pages are fetched here, so this is cheap enough for a
+        producer to call before handing each candidate to a worker.
+        """
+        metas: list[dict] = []
+        for entry in self._parse_rss():
+            if limit is not None and len(metas) >= limit:
                 break
-
             meta = self.entry_to_meta(entry)
             if not meta or not meta.get("url") or not meta.get("title"):
                 continue
+            metas.append(meta)
+        return metas
+
+    def fetch_article(self, meta: dict) -> RawArticle | None:
+        """
+        Fetch and extract a single article described by `meta`.
+
+        Returns None if the page yields no usable paragraphs.
+        Network / parse errors propagate to the caller.
+        """
+        url = meta["url"]
+        resp = self._get(url)
+        paragraphs = self.extract_paragraphs(url, resp.text)
+        # Drop boilerplate / empty fragments
+        paragraphs = [p.strip() for p in paragraphs if len(p.split()) >= 8]
+        if not paragraphs:
+            return None
+
+        return RawArticle(
+            source=self.name,
+            url=url,
+            title=meta["title"],
+            author=meta.get("author", ""),
+            published_at=meta.get("published_at", ""),
+            category=meta.get("category", ""),
+            difficulty=self.difficulty,
+            image_url=meta.get("image_url", ""),
+            paragraphs=paragraphs,
+        )
+
+    def get_articles(self, limit: int = 5, timer: StageTimer | None = None) -> list[RawArticle]:
+        """
+        Fetch up to `limit` new articles from this source; the feeds and
+        each page are timed as "discover" and "fetch" samples of `timer`.
+        """
+        timer = timer or StageTimer()
+        articles: list[RawArticle] = []
+
+        with timer.stage("discover"):
+            metas = self.discover()
+        for meta in metas:
+            if len(articles) >= limit:
+                break
 
             url = meta["url"]
             try:
-                resp = self._get(url)
-                paragraphs = self.extract_paragraphs(url, resp.text)
-                # Drop boilerplate / empty fragments
-                paragraphs = [p.strip() for p in paragraphs if len(p.split()) >= 8]
-                if not paragraphs:
+                with timer.stage("fetch"):
+                    raw = self.fetch_article(meta)
+                if raw is None:
                     continue
-
-                articles.append(
-                    RawArticle(
-                        source=self.name,
-                        url=url,
-                        title=meta["title"],
-                        author=meta.get("author", ""),
-                        published_at=meta.get("published_at", ""),
-                        category=meta.get("category", ""),
-                        difficulty=self.difficulty,
-                        image_url=meta.get("image_url", ""),
-                        paragraphs=paragraphs,
-                    )
-                )
-                fetched += 1
+                articles.append(raw)
                 time.sleep(config.CRAWL_DELAY_SECONDS)
 
             except Exception as exc:
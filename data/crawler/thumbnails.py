@@ -0,0 +1,309 @@
+"""
+Article thumbnails: each article's image downloaded once and served by the
+web app as a small WebP (or AVIF) file instead of hot-linking the original.
+
+Publisher images are full-size originals, often several megabytes, and a
+list page of article cards loads dozens of them. update_thumbnails()
+downloads every articles.image_url without a current thumbnail — with the
+crawler's headers and proxy, and at most one request per
+CRAWL_DELAY_SECONDS to any one host — scales it to THUMBNAIL_SIZE pixels on
+its longest side and writes
+
+    THUMBNAIL_DIR/ab/abcdef…-480.webp
+
+named after the SHA-256 of the downloaded bytes, size and format. A URL
+shared by several articles is downloaded once, and the same picture under
+different URLs (agency photos, source logos) is encoded and stored once.
+The `images` table (migration 10) maps each URL to its file; the web export
+replaces image_url by the file's path under THUMBNAIL_URL when there is one
+and keeps the publisher URL otherwise. Rows stay in the hot database when
+articles are archived, so archived articles keep their thumbnails.
+
+A failed download is retried on later runs, up to MAX_ATTEMPTS times
+(--retry tries again regardless). Changing THUMBNAIL_SIZE or THUMBNAIL_FORMAT
+makes every existing thumbnail stale, to be redone by the next backfill.
+
+The crawler makes the thumbnails of new articles after saving them;
+
+    python run_crawler.py thumbs --limit 500   # older articles, newest first
+    python run_crawler.py thumbs --status
+
+backfills the hot database. Needs Pillow: pip install pillow
+"""
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from . import config
+
+if TYPE_CHECKING:
+    import requests  # imported when downloading: db.py imports this module
+
+FORMATS = ("webp", "avif")
+MAX_ATTEMPTS = 3
+_QUALITY = {"webp": 75, "avif": 55}
+_HEADERS = {**config.HEADERS, "Accept": "image/webp,image/png,image/jpeg,image/*;q=0.8"}
+
+
+def _require_pillow(fmt: str) -> None:
+    """Raise RuntimeError unless Pillow is installed and can write `fmt`."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown thumbnail format {fmt!r}")
+    try:
+        import PIL.features
+        from PIL import Image, ImageOps  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            "The 'Pillow' package is required for thumbnails.\n"
+            "Install it with: pip install pillow"
+        )
+    if not PIL.features.check(fmt):
+        raise RuntimeError(
+            f"This Pillow build cannot write {fmt.upper()}.\n"
+            "Install a recent Pillow: pip install -U pillow"
+        )
+
+
+def thumbnail_name(digest: str, size: int, fmt: str) -> str:
+    """Path of a thumbnail under THUMBNAIL_DIR, from the original's SHA-256."""
+    return f"{digest[:2]}/{digest[:32]}-{size}.{fmt}"
+
+
+def make_thumbnail(data: bytes, size: int, fmt: str) -> tuple[bytes, int, int]:
+    """
+    Encode the image in `data` (any format Pillow reads) scaled down to fit
+    size × size pixels. Returns (encoded bytes, width, height).
+    """
+    _require_pillow(fmt)
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as original:
+        original.draft("RGB", (size, size))  # JPEG: decode at a reduced scale
+        img = ImageOps.exif_transpose(original)
+        if img.mode not in ("RGB", "RGBA"):
+            alpha = "A" in img.getbands() or "transparency" in img.info
+            img = img.convert("RGBA" if alpha else "RGB")
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, fmt.upper(), quality=_QUALITY[fmt])
+    return out.getvalue(), img.width, img.height
+
+
+class _HostPacer:
+    """Spaces requests to the same host at least `delay` seconds apart."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self._last: dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        host = urlsplit(url).hostname or ""
+        if host in self._last:
+            time.sleep(max(0.0, self._last[host] + self.delay - time.monotonic()))
+        self._last[host] = time.monotonic()
+
+
+def _download(session: "requests.Session", url: str, max_bytes: int) -> bytes:
+    with session.get(
+        url, headers=_HEADERS, proxies=config.PROXIES or None, timeout=20, stream=True
+    ) as resp:
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "")
+        if content_type and not content_type.startswith("image/"):
+            raise ValueError(f"not an image ({content_type})")
+        data = bytearray()
+        for chunk in resp.iter_content(64 * 1024):
+            data += chunk
+            if len(data) > max_bytes:
+                raise ValueError(f"larger than {max_bytes:,} bytes")
+    return bytes(data)
+
+
+# ── Database ──────────────────────────────────────────────────────────────────
+
+@dataclass
+class ThumbnailStats:
+    images: int = 0        # distinct image URLs processed
+    downloaded: int = 0    # bytes downloaded
+    written: int = 0       # thumbnail files written
+    reused: int = 0        # identical to an existing thumbnail file
+    failed: int = 0
+    thumb_bytes: int = 0   # size of the thumbnails of this run
+    seconds: float = 0.0
+
+
+def _pending(
+    conn: sqlite3.Connection,
+    article_ids: list[int] | None,
+    suffix: str,
+    retry: bool,
+    limit: int | None,
+) -> list[str]:
+    """Image URLs without a thumbnail at the current settings, newest article first."""
+    clauses = [
+        "a.image_url != ''",
+        "(i.url IS NULL OR (i.thumb NOT LIKE ?" + ("" if retry else " AND i.attempts < ?") + "))",
+    ]
+    params: list = [f"%{suffix}"] + ([] if retry else [MAX_ATTEMPTS])
+    if article_ids is not None:
+        clauses.append(f"a.id IN ({','.join('?' * len(article_ids))})")
+        params += article_ids
+    return [r[0] for r in conn.execute(
+        f"""SELECT a.image_url FROM articles a
+              LEFT JOIN images i ON i.url = a.image_url
+             WHERE {" AND ".join(clauses)}
+             GROUP BY a.image_url
+             ORDER BY max(a.id) DESC
+             LIMIT ?""",
+        (*params, -1 if limit is None else limit),
+    )]
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def update_thumbnails(
+    conn: sqlite3.Connection,
+    article_ids: list[int] | None = None,
+    limit: int | None = None,
+    retry: bool = False,
+    out_dir: Path = config.THUMBNAIL_DIR,
+    size: int = config.THUMBNAIL_SIZE,
+    fmt: str = config.THUMBNAIL_FORMAT,
+    session: "requests.Session | None" = None,
+) -> ThumbnailStats:
+    """
+    Make the thumbnails of `article_ids`, or of every article without a
+    current one, newest first and at most `limit` images. Each image is
+    committed on its own. `conn` must be in autocommit mode
+    (isolation_level=None). Raises RuntimeError if Pillow is unavailable.
+    """
+    _require_pillow(fmt)
+    stats = ThumbnailStats()
+    t0 = time.perf_counter()
+    if article_ids is not None and not article_ids:
+        return stats
+    urls = _pending(conn, article_ids, f"-{size}.{fmt}", retry, limit)
+    if session is None:
+        import requests
+
+        session = requests.Session()
+    pacer = _HostPacer(config.CRAWL_DELAY_SECONDS)
+
+    for url in urls:
+        stats.images += 1
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            pacer.wait(url)
+            data = _download(session, url, config.THUMBNAIL_MAX_BYTES)
+            stats.downloaded += len(data)
+            digest = hashlib.sha256(data).hexdigest()
+            name = thumbnail_name(digest, size, fmt)
+            path = out_dir / name
+            known = conn.execute(
+                "SELECT width, height FROM images WHERE thumb = ? LIMIT 1", (name,)
+            ).fetchone()
+            if known and path.exists():
+                (width, height), thumb_bytes = known, path.stat().st_size
+                stats.reused += 1
+            else:
+                encoded, width, height = make_thumbnail(data, size, fmt)
+                _write_file(path, encoded)
+                thumb_bytes = len(encoded)
+                stats.written += 1
+        except Exception as exc:
+            # Network errors, non-images, files Pillow cannot read
+            print(f"    [thumbs] {url[:80]}: {exc}")
+            conn.execute(
+                """INSERT INTO images (url, attempts, error, fetched_at) VALUES (?, 1, ?, ?)
+                   ON CONFLICT (url) DO UPDATE
+                      SET attempts = attempts + 1, error = excluded.error,
+                          fetched_at = excluded.fetched_at""",
+                (url, str(exc)[:200], now),
+            )
+            stats.failed += 1
+            continue
+        conn.execute(
+            """INSERT OR REPLACE INTO images
+                   (url, thumb, digest, width, height, bytes, thumb_bytes, attempts, error, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, 0, '', ?)""",
+            (url, name, digest, width, height, len(data), thumb_bytes, now),
+        )
+        stats.thumb_bytes += thumb_bytes
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def thumbnail_status(
+    conn: sqlite3.Connection,
+    size: int = config.THUMBNAIL_SIZE,
+    fmt: str = config.THUMBNAIL_FORMAT,
+) -> dict[str, int]:
+    """Counts of the hot database's image URLs by thumbnail state."""
+    return dict(zip(
+        ("urls", "current", "stale", "failed", "files", "original_bytes", "thumb_bytes"),
+        conn.execute(
+            """SELECT count(*),
+                      count(*) FILTER (WHERE i.thumb LIKE ?1),
+                      count(*) FILTER (WHERE i.thumb != '' AND i.thumb NOT LIKE ?1),
+                      count(*) FILTER (WHERE i.thumb = '' AND i.attempts >= ?2),
+                      count(DISTINCT i.thumb) FILTER (WHERE i.thumb LIKE ?1),
+                      coalesce(sum(i.bytes) FILTER (WHERE i.thumb LIKE ?1), 0),
+                      coalesce(sum(i.thumb_bytes) FILTER (WHERE i.thumb LIKE ?1), 0)
+                 FROM (SELECT DISTINCT image_url FROM articles WHERE image_url != '') a
+                 LEFT JOIN images i ON i.url = a.image_url""",
+            (f"%-{size}.{fmt}", MAX_ATTEMPTS),
+        ).fetchone(),
+    ))
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--dir", type=Path, default=config.THUMBNAIL_DIR,
+                        help="Thumbnail directory, served by the web app at " + config.THUMBNAIL_URL)
+    parser.add_argument("--limit", type=int, metavar="N", help="At most N images, newest articles first")
+    parser.add_argument("--size", type=int, default=config.THUMBNAIL_SIZE, help="Longest side in pixels")
+    parser.add_argument("--format", choices=FORMATS, default=config.THUMBNAIL_FORMAT, dest="fmt")
+    parser.add_argument("--retry", action="store_true",
+                        help=f"Also retry images that failed {MAX_ATTEMPTS} times")
+    parser.add_argument("--status", action="store_true", help="Only print how many images have thumbnails")
+
+
+def cli(args: argparse.Namespace) -> None:
+    from .db import ArticleDB  # migrates the schema to include the images table
+
+    with ArticleDB(args.db) as db:
+        if args.status:
+            s = db.thumbnail_status(args.size, args.fmt)
+            pending = s["urls"] - s["current"] - s["stale"] - s["failed"]
+            print(f"  {s['urls']} image URLs: {s['current']} with a {args.size}px {args.fmt} thumbnail "
+                  f"({s['files']} files), {s['stale']} stale, {pending} pending, "
+                  f"{s['failed']} failed {MAX_ATTEMPTS} times")
+            if s["current"]:
+                print(f"  originals {s['original_bytes'] / 1e6:.1f} MB → "
+                      f"thumbnails {s['thumb_bytes'] / 1e6:.1f} MB")
+            return
+        try:
+            stats = db.update_thumbnails(
+                limit=args.limit, retry=args.retry, out_dir=args.dir, size=args.size, fmt=args.fmt,
+            )
+        except RuntimeError as exc:
+            print(f"  {exc}")
+            return
+    print(f"  Thumbnails for {stats.images} images: {stats.written} written, {stats.reused} reused, "
+          f"{stats.failed} failed; {stats.downloaded / 1e6:.1f} MB downloaded → "
+          f"{stats.thumb_bytes / 1e6:.2f} MB in {stats.seconds:.1f}s")
@@ -0,0 +1,51 @@
+"""
+Per-stage wall-clock timing of a crawl.
+
+main.run() records how long each stage took for every article (discover,
+fetch, translate, save) and for each pass after the crawl (metrics, word
+index, glossary, thumbnails), prints the totals at the end of the run and
+returns the timer; benchmarks/bench_pipeline.py reports the percentiles.
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the body of a `with` block as one sample of stage `name`; a body
+        that raises (a failed fetch, a skipped pass) is not counted.
+        """
+        t0 = time.perf_counter()
+        yield
+        self.samples.setdefault(name, []).append(time.perf_counter() - t0)
+
+    @staticmethod
+    def _percentile(values: list[float], q: float) -> float:
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def summary(self) -> dict[str, dict]:
+        """Sample count, total seconds and p50/p95/p99/max milliseconds per stage."""
+        out: dict[str, dict] = {}
+        for name, samples in self.samples.items():
+            v = sorted(samples)
+            out[name] = {
+                "samples": len(v),
+                "total_s": round(sum(v), 3),
+                "p50": round(self._percentile(v, 0.50) * 1000, 1),
+                "p95": round(self._percentile(v, 0.95) * 1000, 1),
+                "p99": round(self._percentile(v, 0.99) * 1000, 1),
+                "max": round(v[-1] * 1000, 1),
+            }
+        return out
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{name} {sum(v):.1f}s" + (f" ({len(v)}×)" if len(v) > 1 else "")
+            for name, v in self.samples.items()
+        )
@@ -3,6 +3,14 @@ Translation service with two backends:
   - GoogleTranslator  (default, free, no API key needed)
   - DeepSeekTranslator (optional, requires DEEPSEEK_API_KEY, adds sentence analysis)
 
+plus ServiceTranslator, a client of the shared translation service
+(service.py, used when TRANSLATION_SERVICE_URL is set), StubTranslator,
+an offline stand-in for tests and benchmarks, and NullTranslator for crawls
+that store the English text only.
+
+requests and openai are imported by the backends that use them, when first
+used, so importing this module stays cheap.
+
 Usage:
     translator = get_translator()   # auto-selects based on config
     cn = translator.translate("Hello world")
@@ -11,8 +19,6 @@ import json
 import time
 from abc import ABC, abstractmethod
 
-import requests
-
 from . import config
 
 
@@ -20,6 +26,13 @@ from . import config
 
 class BaseTranslator(ABC):
 
+    # Recorded in sentences.translated_by for what this backend translates
+    name: str = ""
+    # True if translate_batch() is a single request rather than a loop
+    batch_calls: bool = False
+    # Pause between the requests of a translate_batch() loop (rate-limit politeness)
+    request_interval: float = 1.2
+
     @abstractmethod
     def translate(self, text: str) -> str:
         """Translate a single English text to Simplified Chinese."""
@@ -31,9 +44,23 @@ class BaseTranslator(ABC):
         for i, text in enumerate(texts):
             results.append(self.translate(text))
             if i < len(texts) - 1:
-                time.sleep(1.2)  # rate-limit politeness
+                time.sleep(self.request_interval)
         return results
 
+    def translate_terms(self, terms: list[str]) -> list[str]:
+        """
+        Translate single words or short terms in one request, one per line.
+        If the lines do not come back one for one, every term is returned
+        untranslated ("") rather than sent one request at a time — the
+        glossary retries the article on its next run.
+        """
+        if not terms:
+            return []
+        lines = [ln.strip() for ln in self.translate("\n".join(terms)).splitlines()]
+        if len(lines) == len(terms):
+            return lines
+        return [""] * len(terms)
+
     def analyze_sentence(self, text: str) -> dict | None:
         """Return a structured analysis dict for a complex sentence.
         Returns None if this backend does not support analysis.
@@ -46,6 +73,8 @@ class BaseTranslator(ABC):
 class GoogleTranslator(BaseTranslator):
     """Calls the public Google Translate endpoint — no API key required."""
 
+    name = "google"
+    request_interval = 1.5
     _URL = "https://translate.googleapis.com/translate_a/single"
 
     def translate(self, text: str) -> str:
@@ -58,6 +87,8 @@ class GoogleTranslator(BaseTranslator):
             "dt": "t",
             "q": text.strip(),
         }
+        import requests
+
         for attempt in range(3):
             try:
                 resp = requests.get(self._URL, params=params, timeout=12)
@@ -72,20 +103,15 @@ class GoogleTranslator(BaseTranslator):
                     return ""
         return ""
 
-    def translate_batch(self, texts: list[str]) -> list[str]:
-        results = []
-        for i, text in enumerate(texts):
-            results.append(self.translate(text))
-            if i < len(texts) - 1:
-                time.sleep(1.5)
-        return results
-
 
 # ── DeepSeek (optional, requires openai package + API key) ────────────────────
 
 class DeepSeekTranslator(BaseTranslator):
     """Uses the DeepSeek LLM for translation and structural sentence analysis."""
 
+    name = "deepseek"
+    batch_calls = True
+
     def __init__(self) -> None:
         try:
             from openai import OpenAI  # type: ignore
@@ -147,6 +173,10 @@ class DeepSeekTranslator(BaseTranslator):
             results.append("")
         return results[: len(texts)]
 
+    def translate_terms(self, terms: list[str]) -> list[str]:
+        """Numbered list in one API call, as translate_batch()."""
+        return self.translate_batch(terms)
+
     def analyze_sentence(self, text: str) -> dict | None:
         """Return a structured analysis of a complex sentence as a dict."""
         prompt = (
@@ -173,11 +203,144 @@ class DeepSeekTranslator(BaseTranslator):
             return None
 
 
+# ── Translation service client ────────────────────────────────────────────────
+
+class ServiceTranslator(BaseTranslator):
+    """
+    Sends everything to the shared translation service (service.py), which
+    batches and caches requests from every crawler process and the web app.
+    Takes the name of the service's backend, so translated_by stays accurate.
+    Like the other backends, a failed request translates to "" rather than
+    raising; the constructor raises if the service cannot be reached.
+    """
+
+    batch_calls = True
+
+    def __init__(self, url: str = config.TRANSLATION_SERVICE_URL) -> None:
+        import requests
+
+        self._url = url.rstrip("/")
+        self._session = requests.Session()
+        health = self._session.get(f"{self._url}/health", timeout=5)
+        health.raise_for_status()
+        info = health.json()
+        self.name = info["backend"]
+        self._analysis = info.get("analysis", False)
+
+    def _post(self, path: str, payload: dict, timeout: float = 120) -> dict:
+        resp = self._session.post(f"{self._url}{path}", json=payload, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def translate(self, text: str) -> str:
+        if not text or not text.strip():
+            return ""
+        try:
+            return self._post("/translate", {"text": text})["translation"]
+        except Exception as exc:  # 502 for a failed translation, service down, bad reply
+            print(f"    [ServiceTranslator] translate error: {exc}")
+            return ""
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        if not texts:
+            return []
+        try:
+            return self._post("/translate", {"texts": texts})["translations"]
+        except Exception as exc:
+            print(f"    [ServiceTranslator] translate_batch error: {exc}")
+            return [""] * len(texts)
+
+    def analyze_sentence(self, text: str) -> dict | None:
+        if not self._analysis:
+            return None
+        try:
+            return self._post("/analyze", {"text": text}).get("analysis")
+        except Exception as exc:
+            print(f"    [ServiceTranslator] analyze_sentence error: {exc}")
+            return None
+
+
+# ── Offline stub ──────────────────────────────────────────────────────────────
+
+class StubTranslator(BaseTranslator):
+    """
+    Deterministic offline backend: "[zh] " + text, after `delay` seconds per
+    request. Supports analysis and single-request batches, like DeepSeek.
+    """
+
+    name = "stub"
+    batch_calls = True
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    def translate(self, text: str) -> str:
+        return self.translate_batch([text])[0] if text and text.strip() else ""
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        self.calls += 1
+        time.sleep(self.delay)
+        return [f"[zh] {t.strip()}" if t and t.strip() else "" for t in texts]
+
+    def analyze_sentence(self, text: str) -> dict | None:
+        self.calls += 1
+        time.sleep(self.delay)
+        words = text.split()
+        return {
+            "subject": words[0] if words else "",
+            "predicate": words[1] if len(words) > 1 else "",
+            "object": "",
+            "clauses": [],
+            "structure_note": "",
+            "translation": f"[zh] {text.strip()}",
+        }
+
+
+# ── No translation ────────────────────────────────────────────────────────────
+
+class NullTranslator(BaseTranslator):
+    """
+    Translates nothing (`run_crawler.py --no-translate`). Its empty name
+    leaves sentences.translated_by NULL, so `backfill translate` picks the
+    sentences up later.
+    """
+
+    batch_calls = True
+
+    def translate(self, text: str) -> str:
+        return ""
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        return [""] * len(texts)
+
+
 # ── Factory ───────────────────────────────────────────────────────────────────
 
-def get_translator() -> BaseTranslator:
-    """Return the translator configured in config.py."""
-    if config.TRANSLATOR_BACKEND == "deepseek" and config.DEEPSEEK_API_KEY:
+BACKENDS = ("google", "deepseek", "stub")
+
+
+def get_translator(backend: str | None = None) -> BaseTranslator:
+    """
+    Return the translator configured in config.py: the translation service
+    if TRANSLATION_SERVICE_URL is set and it answers, else DeepSeek or Google. `backend`
+    picks a local backend explicitly (the service itself uses this).
+    """
+    if backend is None and config.TRANSLATION_SERVICE_URL:
+        # Like the web app's routes: use the local backend if the service is down
+        try:
+            translator = ServiceTranslator(config.TRANSLATION_SERVICE_URL)
+        except Exception as exc:
+            print(f"  Translation service at {config.TRANSLATION_SERVICE_URL} unavailable ({exc}); "
+                  "translating locally")
+        else:
+            print(f"  Translator: service at {config.TRANSLATION_SERVICE_URL} ({translator.name})")
+            return translator
+    backend = backend or config.TRANSLATOR_BACKEND
+    if backend == "stub":
+        print("  Translator: offline stub")
+        return StubTranslator()
+    if backend == "deepseek" and config.DEEPSEEK_API_KEY:
         print("  Translator: DeepSeek")
         return DeepSeekTranslator()
     print("  Translator: Google Translate (free)")
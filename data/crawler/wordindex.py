@@ -0,0 +1,249 @@
+"""
+Lemma-level inverted index linking articles to the app's word lists.
+
+Two tables (migration 6), filled per article after it is saved:
+
+  word_index     (lemma, article_id, sentence_id) — every sentence a
+                 dictionary word occurs in, keyed by lemma first so that
+                 "example sentences for this word" is one index range scan
+  word_coverage  (article_id, level, words, coverage) — per word list
+                 (gaokao … gre, the tags of the web app's CATEGORIES): how many
+                 distinct list words the article contains, and the share of
+                 its word tokens that belong to the list
+
+Lemmas come from vocab.db: a token maps to itself when it is a list or
+ranked word, else to the headword whose ECDICT `exchange` field lists it
+as an inflection ("went" → "go", "studies" → "study"). Tokens vocab.db does
+not know (names, numbers) are not indexed. Without vocab.db the stage is
+skipped.
+
+The crawler indexes new articles after each run;
+
+    python run_crawler.py words                # articles not indexed yet
+    python run_crawler.py words --rebuild      # all articles (new vocab.db)
+    python run_crawler.py words --word take    # example sentences for a word
+
+backfills or inspects the hot database. export/words.py publishes the
+index as per-level shards for the web app.
+"""
+import argparse
+import re
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from . import config
+from .metrics import tokenize
+
+# Tags of the word lists in vocab.db (CATEGORIES in src/types/index.ts)
+LEVELS = ("gaokao", "cet4", "cet6", "kaoyan", "toefl", "ielts", "gre", "medical")
+BATCH_ARTICLES = 500
+
+# ECDICT exchange keys of inflected forms: past, past participle, -ing,
+# third person, comparative, superlative, plural
+_INFLECTIONS = "pdi3rts"
+_WORD = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+
+@dataclass(frozen=True)
+class Vocabulary:
+    lemma_of: dict[str, str]            # known word form → lemma
+    levels: dict[str, frozenset[str]]   # level tag → lemmas in that list
+
+    def lemma(self, token: str) -> str | None:
+        lemma = self.lemma_of.get(token)
+        if lemma is None and token.endswith("'s"):
+            lemma = self.lemma_of.get(token[:-2])
+        return lemma
+
+
+@lru_cache(maxsize=2)
+def load_vocabulary(vocab_db: Path = config.VOCAB_DB_PATH) -> Vocabulary | None:
+    """Word forms and word lists from vocab.db, or None if it is missing."""
+    if not vocab_db.exists():
+        return None
+    uri = vocab_db.resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        rows = conn.execute(
+            """SELECT lower(word), coalesce(exchange, ''), coalesce(tags, '') FROM words
+                WHERE coalesce(tags, '') != '' OR frq > 0 OR bnc > 0"""
+        ).fetchall()
+    except sqlite3.DatabaseError:
+        return None
+    finally:
+        conn.close()
+
+    # Later dicts win: inflections < headword of an inflected entry < the word itself
+    inflected: dict[str, str] = {}
+    base_of: dict[str, str] = {}
+    known: dict[str, str] = {}
+    levels: dict[str, set[str]] = {level: set() for level in LEVELS}
+    for word, exchange, tags in rows:
+        if not _WORD.fullmatch(word):
+            continue  # phrases, hyphenated and non-ASCII entries
+        parts = dict(p.split(":", 1) for p in exchange.split("/") if ":" in p)
+        listed = False
+        for level in LEVELS:
+            if level in tags:  # same test as the web app's `tags LIKE '%level%'`
+                levels[level].add(word)
+                listed = True
+        lemma = parts.get("0", "").lower()
+        if lemma and not listed and _WORD.fullmatch(lemma):
+            base_of[word] = lemma
+        else:
+            known[word] = word
+        for key in _INFLECTIONS:
+            form = parts.get(key, "").lower()
+            if _WORD.fullmatch(form):
+                inflected.setdefault(form, word)
+
+    return Vocabulary(
+        lemma_of={**inflected, **base_of, **known},
+        levels={level: frozenset(words) for level, words in levels.items()},
+    )
+
+
+def require_vocabulary(vocab: Vocabulary | None = None) -> Vocabulary:
+    """`vocab`, else the default vocab.db; RuntimeError if it is missing."""
+    vocab = vocab or load_vocabulary()
+    if vocab is None:
+        raise RuntimeError(
+            f"{config.VOCAB_DB_PATH.name} not found; word lists and inflections come from it.\n"
+            f"Place vocab.db at {config.VOCAB_DB_PATH}"
+        )
+    return vocab
+
+
+# ── Database ──────────────────────────────────────────────────────────────────
+
+@dataclass
+class WordIndexStats:
+    articles: int = 0
+    sentences: int = 0
+    postings: int = 0
+    seconds: float = 0.0
+
+
+def index_articles(
+    conn: sqlite3.Connection,
+    article_ids: list[int] | None = None,
+    rebuild: bool = False,
+    vocab: Vocabulary | None = None,
+    batch_size: int = BATCH_ARTICLES,
+) -> WordIndexStats:
+    """
+    Index `article_ids`, or every article not indexed yet (all articles with
+    rebuild=True), replacing their previous rows. Each batch is one
+    transaction. `conn` must be in autocommit mode (isolation_level=None).
+    Raises RuntimeError if vocab.db is unavailable.
+    """
+    vocab = require_vocabulary(vocab)
+    if article_ids is None:
+        # Every indexed article has a coverage row per level, even with no hits
+        where = "" if rebuild else (
+            "WHERE NOT EXISTS (SELECT 1 FROM word_coverage c WHERE c.article_id = a.id)"
+        )
+        article_ids = [r[0] for r in conn.execute(f"SELECT id FROM articles a {where} ORDER BY id")]
+
+    stats = WordIndexStats()
+    t0 = time.perf_counter()
+    for i in range(0, len(article_ids), batch_size):
+        ids = article_ids[i:i + batch_size]
+        marks = ",".join("?" * len(ids))
+        postings: list[tuple[str, int, int]] = []
+        tokens: dict[int, Counter] = {a: Counter() for a in ids}
+        totals: dict[int, int] = dict.fromkeys(ids, 0)
+        for article_id, sentence_id, en_text in conn.execute(
+            f"""SELECT p.article_id, s.id, s.en_text
+                  FROM paragraphs p JOIN sentences s ON s.paragraph_id = p.id
+                 WHERE p.article_id IN ({marks})""",
+            ids,
+        ):
+            words = tokenize(en_text)
+            lemmas = [lemma for w in words if (lemma := vocab.lemma(w))]
+            totals[article_id] += len(words)
+            tokens[article_id].update(lemmas)
+            postings.extend((lemma, article_id, sentence_id) for lemma in set(lemmas))
+            stats.sentences += 1
+
+        coverage = []
+        for article_id, counts in tokens.items():
+            for level in LEVELS:
+                hits = counts.keys() & vocab.levels[level]
+                share = sum(counts[w] for w in hits) / totals[article_id] if totals[article_id] else 0.0
+                coverage.append((article_id, level, len(hits), round(share, 4)))
+
+        conn.execute("BEGIN")
+        try:
+            conn.execute(f"DELETE FROM word_index WHERE article_id IN ({marks})", ids)
+            conn.execute(f"DELETE FROM word_coverage WHERE article_id IN ({marks})", ids)
+            conn.executemany(
+                "INSERT INTO word_index (lemma, article_id, sentence_id) VALUES (?, ?, ?)", postings
+            )
+            conn.executemany(
+                "INSERT INTO word_coverage (article_id, level, words, coverage) VALUES (?, ?, ?, ?)",
+                coverage,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        stats.articles += len(ids)
+        stats.postings += len(postings)
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def example_sentences(
+    conn: sqlite3.Connection,
+    word: str,
+    limit: int = 10,
+    vocab: Vocabulary | None = None,
+) -> tuple[str, list[tuple[int, str]]]:
+    """(lemma, [(article_id, en_text), ...]) for `word`, newest articles first."""
+    vocab = require_vocabulary(vocab)
+    token = word.strip().lower()
+    lemma = vocab.lemma(token) or token
+    rows = conn.execute(
+        """SELECT w.article_id, s.en_text
+             FROM word_index w JOIN sentences s ON s.id = w.sentence_id
+            WHERE w.lemma = ?
+            ORDER BY w.article_id DESC, w.sentence_id
+            LIMIT ?""",
+        (lemma, limit),
+    ).fetchall()
+    return lemma, rows
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every article")
+    parser.add_argument("--vocab", type=Path, default=config.VOCAB_DB_PATH,
+                        help="vocab.db with the word lists and inflections")
+    parser.add_argument("--word", metavar="WORD", help="Print example sentences for WORD instead")
+    parser.add_argument("-n", "--limit", type=int, default=10)
+
+
+def cli(args: argparse.Namespace) -> None:
+    from .db import ArticleDB  # migrates the schema to include the index tables
+
+    vocab = load_vocabulary(args.vocab)
+    if vocab is None:
+        print(f"  {args.vocab} not found — the word index needs its word lists.")
+        return
+    with ArticleDB(args.db) as db:
+        if args.word:
+            lemma, rows = db.example_sentences(args.word, args.limit, vocab=vocab)
+            print(f"  {lemma}: {len(rows)} sentence(s)")
+            for article_id, en_text in rows:
+                print(f"    [{article_id}] {en_text}")
+            return
+        stats = db.update_word_index(rebuild=args.rebuild, vocab=vocab)
+    print(f"  Indexed {stats.articles} articles / {stats.sentences} sentences "
+          f"({stats.postings:,} postings) in {stats.seconds:.1f}s")
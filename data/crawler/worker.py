@@ -0,0 +1,238 @@
+"""
+Queue-based crawler workers.
+
+Usage (from data/ directory):
+    python run_crawler.py --enqueue                   # discover candidates → fetch jobs
+    python run_crawler.py --enqueue --sources voa     # only some sources
+    python run_crawler.py --worker                    # run jobs until stopped
+    python run_crawler.py --worker --kinds translate  # only translation jobs
+
+Any number of workers may run at once, on one machine or several sharing the
+queue DB. Each article URL is fetched, translated and analyzed exactly once.
+
+Job kinds:
+  fetch     — download and extract one article page; enqueues `translate`
+  translate — translate title and paragraphs, then save the article; with
+              DeepSeek, complex sentences are analyzed here too and take
+              their translation from the analysis, as in main.run()
+  analyze   — retry the analysis of complex sentences it failed for
+"""
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+
+from . import config
+from .db import ArticleDB
+from .jobqueue import JOB_KINDS, Job, JobQueue
+from .main import build_paragraphs, word_count_skip_reason
+from .models import RawArticle
+from .sources import get_source, get_sources
+from .translator import get_translator
+
+
+# ── Producer ──────────────────────────────────────────────────────────────────
+
+def enqueue_candidates(
+    limit: int = config.ARTICLES_PER_SOURCE, sources: list[str] | None = None
+) -> int:
+    """
+    Queue up to `limit` new fetch jobs per source of `sources` (names;
+    default all). Returns the number queued.
+    """
+    db = ArticleDB()
+    queue = JobQueue()
+    queued = 0
+    try:
+        for source in get_sources(sources):
+            try:
+                metas = source.discover()
+            except Exception as exc:
+                print(f"  [{source.name}] ERROR: {exc}")
+                continue
+
+            added = 0
+            for meta in metas:
+                if added >= limit:
+                    break
+                if db.url_exists(meta["url"]):
+                    continue
+                if queue.enqueue("fetch", meta["url"], {"source": source.name, "meta": meta}):
+                    added += 1
+            print(f"  [{source.name}] queued {added} fetch job(s)")
+            queued += added
+    finally:
+        queue.close()
+        db.close()
+    return queued
+
+
+# ── Lease keep-alive ──────────────────────────────────────────────────────────
+
+class _Heartbeat(threading.Thread):
+    """Extends a job's lease in the background while its handler runs."""
+
+    def __init__(self, job: Job) -> None:
+        super().__init__(daemon=True)
+        self.job = job
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        queue = JobQueue()  # sqlite3 connections are per-thread
+        try:
+            while not self._stop_event.wait(config.JOB_LEASE_SECONDS / 3):
+                if not queue.heartbeat(self.job):
+                    self.lost = True
+                    return
+        finally:
+            queue.close()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+@contextmanager
+def _keep_alive(job: Job):
+    hb = _Heartbeat(job)
+    hb.start()
+    try:
+        yield hb
+    finally:
+        hb.stop()
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+class Worker:
+    """Claims jobs from the queue and dispatches them to handlers."""
+
+    def __init__(self, worker_id: str = "", kinds: list[str] | None = None) -> None:
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = kinds or list(JOB_KINDS)
+        self.queue = JobQueue()
+        self.db = ArticleDB()
+        self._translator = None
+
+    @property
+    def translator(self):
+        # Created on first use so fetch-only workers never build one
+        if self._translator is None:
+            self._translator = get_translator()
+        return self._translator
+
+    def run(self, exit_when_idle: bool = False) -> None:
+        print(f"Worker {self.worker_id} — kinds: {', '.join(self.kinds)}")
+        try:
+            while True:
+                job = self.queue.claim(self.worker_id, self.kinds)
+                if job is None:
+                    if exit_when_idle:
+                        print("  Queue idle — exiting.")
+                        return
+                    time.sleep(config.WORKER_POLL_SECONDS)
+                    continue
+                self.run_job(job)
+        finally:
+            self.queue.close()
+            self.db.close()
+
+    def run_job(self, job: Job) -> None:
+        handler = getattr(self, f"_handle_{job.kind}")
+        try:
+            with _keep_alive(job) as hb:
+                handler(job)
+        except Exception as exc:
+            print(f"  ✗ {job.kind} #{job.id} (attempt {job.attempts}): {exc}")
+            self.queue.fail(job, str(exc))
+            return
+        if hb.lost or not self.queue.complete(job):
+            print(f"  ! {job.kind} #{job.id}: lease lost — result may be duplicated")
+
+    # ── Handlers ──────────────────────────────────────────────────────────────
+
+    def _handle_fetch(self, job: Job) -> None:
+        meta = job.payload["meta"]
+        if self.db.url_exists(meta["url"]):
+            return
+        source = get_source(job.payload["source"])
+        raw = source.fetch_article(meta)
+        time.sleep(config.CRAWL_DELAY_SECONDS)
+        if raw is None:
+            print(f"  SKIP (empty) : {meta['title'][:60]}")
+            return
+        reason = word_count_skip_reason(raw)
+        if reason:
+            print(f"  SKIP ({reason}) : {raw.title[:60]}")
+            return
+        self.queue.enqueue("translate", raw.url, asdict(raw))
+        print(f"  ✓ fetched : {raw.title[:60]}")
+
+    def _handle_translate(self, job: Job) -> None:
+        raw = RawArticle(**job.payload)
+        if self.db.url_exists(raw.url):
+            return
+        title_cn = self.translator.translate(raw.title)
+        # The analysis carries the sentence's translation, so a complex
+        # sentence costs one request instead of a translation plus an analysis
+        analyze = config.TRANSLATOR_BACKEND == "deepseek"
+        paragraph_data = build_paragraphs(raw, self.translator, analyze=analyze)
+        article_id = self.db.save_article(raw, paragraph_data, title_cn, self.translator.name)
+        print(f"  ✓ Saved (id={article_id}): {raw.title[:60]}")
+        try:
+            self.db.update_metrics([article_id])
+        except RuntimeError:
+            pass  # numpy missing: `run_crawler.py metrics` backfills later
+        try:
+            self.db.update_word_index([article_id])
+        except RuntimeError:
+            pass  # vocab.db missing: `run_crawler.py words` backfills later
+        try:
+            self.db.update_glossary(self.translator, [article_id])
+        except RuntimeError:
+            pass  # vocab.db missing: `run_crawler.py glossary` backfills later
+        try:
+            self.db.update_thumbnails([article_id])
+        except RuntimeError:
+            pass  # Pillow missing: `run_crawler.py thumbs` backfills later
+        if analyze and self.db.pending_analysis(article_id):
+            self.queue.enqueue("analyze", raw.url, {"article_id": article_id})
+
+    def _handle_analyze(self, job: Job) -> None:
+        article_id = job.payload["article_id"]
+        results: list[tuple[int, str, str]] = []
+        for sentence_id, en_text in self.db.pending_analysis(article_id):
+            result = self.translator.analyze_sentence(en_text)
+            if result:
+                results.append((
+                    sentence_id,
+                    json.dumps(result, ensure_ascii=False),
+                    result.get("translation", ""),
+                ))
+        self.db.save_analysis(article_id, results, self.translator.name)
+        print(f"  ✓ analyzed {len(results)} sentence(s) in article {article_id}")
+
+
+def run_worker(
+    kinds: list[str] | None = None,
+    worker_id: str = "",
+    exit_when_idle: bool = False,
+) -> None:
+    Worker(worker_id=worker_id, kinds=kinds).run(exit_when_idle=exit_when_idle)
+
+
+def print_queue_stats() -> None:
+    queue = JobQueue()
+    try:
+        stats = queue.stats()
+    finally:
+        queue.close()
+    if not stats:
+        print("  Queue is empty.")
+    for kind in sorted(stats):
+        counts = "  ".join(f"{k}={v}" for k, v in sorted(stats[kind].items()))
+        print(f"  {kind:<10} {counts}")
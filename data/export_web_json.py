@@ -3,134 +3,77 @@
 Export articles from articles.db into JSON files for the Next.js web app.
 
 Output structure:
-  article-data/index.json         — metadata for all articles (listing/filtering)
+  article-data/index/root.json    — counts per month / day / source × difficulty
+  article-data/index/YYYY-MM.json — metadata + facet id lists for one month
   article-data/detail/{id}.json   — full article with paragraphs and sentences
+  article-data/words/             — word-list shards of the lemma index, when
+                                    vocab.db is available (see
+                                    crawler/export/words.py)
+  article-data/manifest.json      — content hash of every file above, and the
+                                    articles.content_hash key each detail
+                                    file was built from
+
+Exports are incremental: articles whose content hash, metadata and glossary
+are unchanged are not even read, only new or changed files are rewritten
+(atomically) and only files of deleted articles are removed — see
+crawler/export/files.py.
+
+Archived months (see crawler/archive.py) are read from archive/ next to the
+database and attached one at a time. The work is done by the streaming engine
+in crawler/export/; `python data/run_crawler.py export` can write this layout
+and the per-date one in a single pass.
+
+Detail files use the compact format (see crawler/export/layouts.py), which the
+web app expands on load; pass --full-detail for the original format.
 
 Run from the web/ directory:
     python data/export_web_json.py
+    python data/export_web_json.py --full-detail
+    python data/export_web_json.py --compress gz,br   # + .gz / .br siblings
+    python data/export_web_json.py --workers 4        # parallel detail files
 """
-import json
-import shutil
-import sqlite3
+import argparse
+import sys
 from pathlib import Path
 
+# Ensure the data/ directory is on sys.path so the crawler package is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from crawler.export.engine import run_export  # noqa: E402
+from crawler.export.layouts import WebLayout  # noqa: E402
+from crawler.export.words import export_words  # noqa: E402
+from crawler.wordindex import load_vocabulary  # noqa: E402
+
 WEB_DIR = Path(__file__).resolve().parent.parent  # web/
 DB_PATH = WEB_DIR / "articles.db"
 OUTPUT_DIR = WEB_DIR / "article-data"
 
 
-def export() -> None:
+def export(detail_format: str = "compact", compress: tuple[str, ...] = (), workers: int = 1) -> None:
     if not DB_PATH.exists():
         print(f"[export] {DB_PATH} not found — nothing to export.")
         return
-
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-
-    # Clean output directory
-    if OUTPUT_DIR.exists():
-        shutil.rmtree(OUTPUT_DIR)
-    OUTPUT_DIR.mkdir(parents=True)
-    detail_dir = OUTPUT_DIR / "detail"
-    detail_dir.mkdir()
-
-    # Fetch all articles ordered by crawled_at DESC
-    articles = conn.execute(
-        "SELECT * FROM articles ORDER BY crawled_at DESC"
-    ).fetchall()
-
-    index_entries: list[dict] = []
-
-    for article in articles:
-        aid = article["id"]
-
-        # Count paragraphs
-        para_count = conn.execute(
-            "SELECT COUNT(*) FROM paragraphs WHERE article_id = ?", (aid,)
-        ).fetchone()[0]
-
-        # Build index entry (metadata only, no paragraphs/sentences)
-        index_entries.append({
-            "id": aid,
-            "source": article["source"],
-            "url": article["url"],
-            "title": article["title"],
-            "title_cn": article["title_cn"] or "",
-            "author": article["author"] or "",
-            "published_at": article["published_at"] or "",
-            "category": article["category"] or "",
-            "difficulty": article["difficulty"] or "cet6",
-            "image_url": article["image_url"] or "",
-            "crawled_at": article["crawled_at"],
-            "paragraph_count": para_count,
-        })
-
-        # Build full detail (with paragraphs and sentences)
-        para_rows = conn.execute(
-            "SELECT * FROM paragraphs WHERE article_id = ? ORDER BY seq", (aid,)
-        ).fetchall()
-
-        paragraphs: list[dict] = []
-        for para in para_rows:
-            sent_rows = conn.execute(
-                "SELECT * FROM sentences WHERE paragraph_id = ? ORDER BY seq",
-                (para["id"],),
-            ).fetchall()
-
-            sentences = [
-                {
-                    "id": sent["id"],
-                    "paragraph_id": sent["paragraph_id"],
-                    "seq": sent["seq"],
-                    "en_text": sent["en_text"],
-                    "cn_text": sent["cn_text"] or "",
-                    "is_complex": bool(sent["is_complex"]),
-                    "analysis": sent["analysis"] or "",
-                }
-                for sent in sent_rows
-            ]
-
-            paragraphs.append({
-                "id": para["id"],
-                "article_id": para["article_id"],
-                "seq": para["seq"],
-                "en_text": para["en_text"],
-                "cn_text": para["cn_text"] or "",
-                "sentences": sentences,
-            })
-
-        detail = {
-            "id": aid,
-            "source": article["source"],
-            "url": article["url"],
-            "title": article["title"],
-            "title_cn": article["title_cn"] or "",
-            "author": article["author"] or "",
-            "published_at": article["published_at"] or "",
-            "category": article["category"] or "",
-            "difficulty": article["difficulty"] or "cet6",
-            "image_url": article["image_url"] or "",
-            "crawled_at": article["crawled_at"],
-            "paragraphs": paragraphs,
-        }
-
-        # One JSON file per article (compact — no indentation)
-        with open(detail_dir / f"{aid}.json", "w", encoding="utf-8") as f:
-            json.dump(detail, f, ensure_ascii=False)
-
-    conn.close()
-
-    # Write master index (pretty-printed for easier debugging)
-    with open(OUTPUT_DIR / "index.json", "w", encoding="utf-8") as f:
-        json.dump({"articles": index_entries}, f, ensure_ascii=False, indent=2)
-
-    print(f"  Exported {len(index_entries)} articles → {OUTPUT_DIR}")
-    print(f"    Index : {OUTPUT_DIR / 'index.json'}")
-    print(f"    Detail: {detail_dir}/ ({len(index_entries)} files)")
+    run_export(DB_PATH, [WebLayout(OUTPUT_DIR, detail_format=detail_format, compress=compress)],
+               workers=workers)
+    # As `run_crawler.py export --web`; prints a note and skips without vocab.db
+    export_words(DB_PATH, OUTPUT_DIR / "words", load_vocabulary())
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export articles.db to article-data/")
+    parser.add_argument("--full-detail", action="store_true",
+                        help="Write detail files in the original (uncompacted) format")
+    parser.add_argument("--compress", default="", metavar="gz,br",
+                        help="Also write precompressed .gz and/or .br siblings (br needs brotli)")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Serialize and write detail files with N worker processes")
+    args = parser.parse_args()
+
     print("=" * 50)
     print("OpenWords → Export articles to JSON")
     print("=" * 50)
-    export()
+    export(
+        "full" if args.full_detail else "compact",
+        tuple(f.strip() for f in args.compress.split(",") if f.strip()),
+        args.workers,
+    )
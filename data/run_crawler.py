@@ -6,6 +6,8 @@ Run from the data/ directory:
     python run_crawler.py              # crawl once, then exit
     python run_crawler.py --loop       # run daily in a blocking loop
     python run_crawler.py --time 20:00 # daily loop at 20:00
+    python run_crawler.py --enqueue    # queue fetch jobs for workers
+    python run_crawler.py --worker     # run queued fetch/translate/analyze jobs
 
 Environment variables:
     DEEPSEEK_API_KEY  — Optional. Fill in your DeepSeek API key to enable:
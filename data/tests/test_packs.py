@@ -0,0 +1,76 @@
+"""
+Round trip of the packed archive (crawler/export/packs.py) against the
+per-file detail output, including a run interrupted after compaction.
+
+Run from data/ directory:
+    python -m pytest tests
+"""
+import contextlib
+import io
+import json
+
+from benchmarks.synth import build_corpus_db
+from crawler.export.engine import run_export
+from crawler.export.layouts import PackLayout, WebLayout
+from crawler.export.packs import PackReader, PackWriter, load_pack_names, verify
+
+
+def _export(db, web, packs) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_export(db, [WebLayout(web), PackLayout(packs)])
+
+
+def test_packs_match_detail_files(tmp_path):
+    db = tmp_path / "bench.db"
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_corpus_db(db, 60, days=90, n_paragraphs=4)
+    _export(db, tmp_path / "web", tmp_path / "packs")
+
+    detail = tmp_path / "web" / "detail"
+    assert len(list(detail.glob("*.json"))) == 60
+    assert verify(tmp_path / "packs", detail) == []
+    with PackReader(tmp_path / "packs", use_mmap=False) as packs:
+        for path in detail.glob("*.json"):
+            assert packs.read(int(path.stem)) == json.loads(path.read_bytes())
+
+    # An unchanged re-export appends nothing and still matches
+    _export(db, tmp_path / "web", tmp_path / "packs")
+    assert verify(tmp_path / "packs", detail) == []
+
+
+def _write(root, records: dict[str, dict[int, bytes]], finish: bool = True) -> None:
+    writer = PackWriter(root)
+    for month, articles in records.items():
+        for article_id, data in articles.items():
+            writer.add(month, article_id, data)
+    if finish:
+        writer.finish()
+    else:
+        writer.close()
+
+
+def test_interrupted_compaction_keeps_old_index_readable(tmp_path):
+    root = tmp_path / "packs"
+    run1 = {
+        "2026-01": {i: json.dumps({"id": i, "text": "a" * 400}).encode() for i in range(10)},
+        "2026-02": {i: json.dumps({"id": i, "text": "b" * 400}).encode() for i in range(10, 20)},
+    }
+    _write(root, run1)
+
+    # Every January record changes and shrinks, so January is compacted;
+    # the run then fails before finish() writes the new index
+    run2 = {**run1, "2026-01": {i: json.dumps({"id": i}).encode() for i in range(10)}}
+    _write(root, run2, finish=False)
+    with PackReader(root) as packs:
+        for articles in run1.values():
+            for article_id, data in articles.items():
+                assert packs.read_bytes(article_id) == data
+
+    # The next complete run switches to the compacted pack and removes the old one
+    _write(root, run2)
+    assert load_pack_names(root)["2026-01"] == "2026-01.1.pack"
+    assert sorted(p.name for p in root.glob("*.pack")) == ["2026-01.1.pack", "2026-02.pack"]
+    with PackReader(root) as packs:
+        for articles in run2.values():
+            for article_id, data in articles.items():
+                assert packs.read_bytes(article_id) == data
@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from "next/server";
+import { callTranslationService } from "@/lib/translation-service";
 
 const MAX_TEXT_LENGTH = 800;
 
@@ -8,7 +9,8 @@ const MAX_TEXT_LENGTH = 800;
  * Response: { analysis: SentenceAnalysis } | { error: string }
  *
  * Calls DeepSeek to produce a structural breakdown of a complex English sentence.
- * Requires DEEPSEEK_API_KEY environment variable.
+ * Asks the shared translation service first if TRANSLATION_SERVICE_URL is set;
+ * otherwise requires DEEPSEEK_API_KEY environment variable.
  */
 export async function POST(request: NextRequest) {
   let text: string;
@@ -23,6 +25,17 @@ export async function POST(request: NextRequest) {
     return NextResponse.json({ error: "text is required" }, { status: 400 });
   }
 
+  const truncated = text.slice(0, MAX_TEXT_LENGTH);
+
+  // ── Shared translation service (batched + cached), if configured ──────────
+  const shared = await callTranslationService<{ analysis?: unknown }>(
+    "/analyze",
+    { text: truncated }
+  );
+  if (shared?.data.analysis) {
+    return NextResponse.json({ analysis: shared.data.analysis });
+  }
+
   const deepseekKey = process.env.DEEPSEEK_API_KEY;
   if (!deepseekKey) {
     return NextResponse.json(
@@ -31,8 +44,6 @@ export async function POST(request: NextRequest) {
     );
   }
 
-  const truncated = text.slice(0, MAX_TEXT_LENGTH);
-
   const prompt =
     `Analyze the following complex English sentence and return a JSON object with:\n` +
     `- subject: main subject\n` +
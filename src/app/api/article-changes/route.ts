@@ -0,0 +1,18 @@
+import { NextRequest, NextResponse } from "next/server";
+import { getChangesSince } from "@/lib/article-actions";
+
+/**
+ * GET /api/article-changes?since=<export version>
+ * Response: { version, full, added, updated, removed }
+ *
+ * Articles added, updated and removed since the given export version, so a
+ * client holding a cached index can catch up without downloading it again.
+ * `full: true` means the version is too old (or unknown): reload everything.
+ */
+export async function GET(request: NextRequest) {
+  const since = Number(request.nextUrl.searchParams.get("since"));
+  if (!Number.isInteger(since) || since < 0) {
+    return NextResponse.json({ error: "since must be an export version" }, { status: 400 });
+  }
+  return NextResponse.json(await getChangesSince(since));
+}
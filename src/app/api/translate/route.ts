@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from "next/server";
+import { callTranslationService } from "@/lib/translation-service";
 
 const MAX_TEXT_LENGTH = 600;
 
@@ -7,7 +8,8 @@ const MAX_TEXT_LENGTH = 600;
  * Body: { text: string }
  * Response: { translation: string }
  *
- * Uses DeepSeek if DEEPSEEK_API_KEY is set in env, otherwise Google Translate (free).
+ * Uses the shared translation service if TRANSLATION_SERVICE_URL is set,
+ * then DeepSeek if DEEPSEEK_API_KEY is set in env, otherwise Google Translate (free).
  */
 export async function POST(request: NextRequest) {
   let text: string;
@@ -24,6 +26,15 @@ export async function POST(request: NextRequest) {
 
   const truncated = text.slice(0, MAX_TEXT_LENGTH);
 
+  // ── Shared translation service (batched + cached), if configured ──────────
+  const shared = await callTranslationService<{ translation?: string }>(
+    "/translate",
+    { text: truncated }
+  );
+  if (shared?.data.translation) {
+    return NextResponse.json({ translation: shared.data.translation });
+  }
+
   // ── Try DeepSeek first if API key is configured ───────────────────────────
   const deepseekKey = process.env.DEEPSEEK_API_KEY;
   if (deepseekKey) {
@@ -0,0 +1,35 @@
+import { NextRequest, NextResponse } from "next/server";
+import { getArticlesForWords } from "@/lib/article-actions";
+
+const MAX_WORDS = 200;
+const MAX_LIMIT = 100;
+
+/**
+ * GET /api/word-articles?level=<word list>[&words=a,b,c][&limit=20]
+ * Response: { articles: [article id, words contained][] }
+ *
+ * Articles that practise the most of the given words from one word list,
+ * best first; without `words`, ranked by all of the list's words.
+ *
+ * Only each word's newest articles (words/index.json `max_articles`, 100)
+ * are counted, so results favour recent articles: an older article that
+ * practises many of the words may not appear at all.
+ */
+export async function GET(request: NextRequest) {
+  const params = request.nextUrl.searchParams;
+  const level = params.get("level")?.trim() ?? "";
+  if (!level) {
+    return NextResponse.json({ error: "level is required" }, { status: 400 });
+  }
+  const words = (params.get("words") ?? "")
+    .split(",")
+    .map((w) => w.trim())
+    .filter(Boolean)
+    .slice(0, MAX_WORDS);
+  const limit = Number(params.get("limit") ?? 20);
+  if (!Number.isInteger(limit) || limit < 1) {
+    return NextResponse.json({ error: "limit must be a positive integer" }, { status: 400 });
+  }
+  const articles = await getArticlesForWords(level, words, Math.min(limit, MAX_LIMIT));
+  return NextResponse.json({ articles });
+}
@@ -0,0 +1,20 @@
+import { NextRequest, NextResponse } from "next/server";
+import { getWordEntry } from "@/lib/article-actions";
+
+/**
+ * GET /api/word-entry?word=<list word>[&level=<word list>]
+ * Response: { word, entry: { n, a, ex } | null }
+ *
+ * Articles and example sentences for a word-list word, from the words/
+ * index written by the export. Without `level`, the first list containing
+ * the word is used.
+ */
+export async function GET(request: NextRequest) {
+  const params = request.nextUrl.searchParams;
+  const word = params.get("word")?.trim() ?? "";
+  if (!word) {
+    return NextResponse.json({ error: "word is required" }, { status: 400 });
+  }
+  const entry = await getWordEntry(word, params.get("level") || undefined);
+  return NextResponse.json({ word, entry });
+}
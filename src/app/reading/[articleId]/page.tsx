@@ -111,7 +111,7 @@ export default async function ArticleDetailPage({ params }: PageProps) {
         </div>
 
         {/* Bilingual reader wrapped in selection translator */}
-        <SelectionTranslator>
+        <SelectionTranslator glossary={article.glossary}>
           <BilingualReader paragraphs={article.paragraphs} />
         </SelectionTranslator>
 
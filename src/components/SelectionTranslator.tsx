@@ -16,10 +16,20 @@ interface PopupState {
 
 interface SelectionTranslatorProps {
   children: React.ReactNode;
+  /** The article's precomputed word translations (term → Chinese), if any */
+  glossary?: Record<string, string>;
+}
+
+/** Glossary entry for a selected word; terms are lower-case, without "'s". */
+function glossaryLookup(glossary: Record<string, string> | undefined, text: string) {
+  if (!glossary) return undefined;
+  const term = text.trim().toLowerCase().replace(/’/g, "'").replace(/'s$/, "");
+  return glossary[term];
 }
 
 export default function SelectionTranslator({
   children,
+  glossary,
 }: SelectionTranslatorProps) {
   const [popup, setPopup] = useState<PopupState | null>(null);
   const containerRef = useRef<HTMLDivElement>(null);
@@ -77,17 +87,19 @@ export default function SelectionTranslator({
               prev ? { ...prev, word, loading: false } : null
             );
           } else {
-            // vocab.db miss — use translation API as fallback
-            const resp = await fetch("/api/translate", {
-              method: "POST",
-              headers: { "Content-Type": "application/json" },
-              body: JSON.stringify({ text }),
-            });
-            const data = await resp.json();
+            // vocab.db miss — the article's glossary, then the translation API
+            let translation = glossaryLookup(glossary, text) ?? "";
+            if (!translation) {
+              const resp = await fetch("/api/translate", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ text }),
+              });
+              const data = await resp.json();
+              translation = data.translation ?? "";
+            }
             setPopup((prev) =>
-              prev
-                ? { ...prev, translation: data.translation ?? "", loading: false }
-                : null
+              prev ? { ...prev, translation, loading: false } : null
             );
           }
         } else {
@@ -118,7 +130,7 @@ export default function SelectionTranslator({
         );
       }
     }, 300);
-  }, []);
+  }, [glossary]);
 
   // Close popup on click outside
   useEffect(() => {
@@ -239,7 +251,7 @@ export default function SelectionTranslator({
               </div>
             )}
 
-            {/* Single word API translation fallback (when vocab.db is absent) */}
+            {/* Single word: article glossary, or API translation fallback (when vocab.db is absent) */}
             {!popup.loading && !popup.word && popup.translation && isSingleWord(popup.selectedText) && (
               <p className="text-gray-700 dark:text-gray-300 leading-relaxed">
                 {popup.translation}
@@ -247,7 +259,7 @@ export default function SelectionTranslator({
             )}
 
             {/* Phrase / sentence translation */}
-            {!popup.loading && popup.translation && (
+            {!popup.loading && popup.translation && !isSingleWord(popup.selectedText) && (
               <p className="text-gray-700 dark:text-gray-300 leading-relaxed">
                 {popup.translation}
               </p>
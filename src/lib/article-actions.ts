@@ -13,26 +13,137 @@ import type { Word } from "@/types";
 
 const DATA_DIR = path.join(process.cwd(), "article-data");
 
-// ── In-memory index cache (lives for the lifetime of the serverless function) ─
+// ── Sharded index (written by data/crawler/export/layouts.py) ─────────────────
+//
+//   index/root.json     counts per month and day, and per source × difficulty
+//                       within each month — small, read once per cold start
+//   index/YYYY-MM.json  one month's article metadata (crawled_at DESC) plus
+//                       ordered id lists per source, difficulty and day
+//
+// Both are cached for the lifetime of the serverless function; a list page
+// only opens the month shards its page window falls into.
 
 interface ArticleMeta extends Article {
   paragraph_count: number;
 }
 
-let _indexCache: ArticleMeta[] | null = null;
+interface DayCount {
+  date: string;   // YYYY-MM-DD
+  count: number;
+}
+
+interface MonthSummary {
+  month: string;  // YYYY-MM
+  count: number;
+  /** source → difficulty → article count */
+  counts: Record<string, Record<string, number>>;
+  days: DayCount[]; // newest first
+}
+
+interface IndexRoot {
+  version: number;
+  /** Bumped by every export that changes an article (absent before deltas existed) */
+  export_version?: number;
+  /** Versions with a changes/{v}-{export_version}.json delta, newest first */
+  changes_from?: number[];
+  total: number;
+  sources: Record<string, number>;
+  difficulties: Record<string, number>;
+  months: MonthSummary[]; // newest first
+}
+
+interface MonthShard {
+  month: string;
+  articles: ArticleMeta[];
+  ids: {
+    source: Record<string, number[]>;
+    difficulty: Record<string, number[]>;
+    day: Record<string, number[]>;
+  };
+}
 
-function loadIndex(): ArticleMeta[] {
-  if (_indexCache) return _indexCache;
+interface LoadedShard extends MonthShard {
+  byId: Map<number, ArticleMeta>;
+}
+
+let _rootCache: IndexRoot | null = null;
+const _shardCache = new Map<string, LoadedShard>();
+
+function readJson<T>(...parts: string[]): T | null {
   try {
-    const raw = fs.readFileSync(path.join(DATA_DIR, "index.json"), "utf-8");
-    const data = JSON.parse(raw) as { articles: ArticleMeta[] };
-    _indexCache = data.articles;
-    return _indexCache;
+    return JSON.parse(fs.readFileSync(path.join(DATA_DIR, ...parts), "utf-8")) as T;
   } catch {
-    return [];
+    return null;
   }
 }
 
+function cacheShard(shard: MonthShard): LoadedShard {
+  const loaded = { ...shard, byId: new Map(shard.articles.map((a) => [a.id, a])) };
+  _shardCache.set(shard.month, loaded);
+  return loaded;
+}
+
+/** Same structure as build_month_shard() in layouts.py. */
+function buildShard(month: string, articles: ArticleMeta[]): [MonthShard, MonthSummary] {
+  const ids: MonthShard["ids"] = { source: {}, difficulty: {}, day: {} };
+  const counts: MonthSummary["counts"] = {};
+  for (const a of articles) {
+    const day = a.crawled_at.slice(0, 10);
+    (ids.source[a.source] ??= []).push(a.id);
+    (ids.difficulty[a.difficulty] ??= []).push(a.id);
+    (ids.day[day] ??= []).push(a.id);
+    const byDiff = (counts[a.source] ??= {});
+    byDiff[a.difficulty] = (byDiff[a.difficulty] ?? 0) + 1;
+  }
+  const days = Object.entries(ids.day).map(([date, list]) => ({ date, count: list.length }));
+  return [
+    { month, articles, ids },
+    { month, count: articles.length, counts, days },
+  ];
+}
+
+/** Exports older than the sharded index wrote one flat index.json: shard it in memory. */
+function loadLegacyIndex(): IndexRoot {
+  const data = readJson<{ articles: ArticleMeta[] }>("index.json");
+  const byMonth = new Map<string, ArticleMeta[]>();
+  for (const a of data?.articles ?? []) {
+    const month = a.crawled_at.slice(0, 7);
+    if (!byMonth.has(month)) byMonth.set(month, []);
+    byMonth.get(month)!.push(a);
+  }
+
+  const root: IndexRoot = { version: 0, total: 0, sources: {}, difficulties: {}, months: [] };
+  const months = Array.from(byMonth.entries()).sort(([a], [b]) => b.localeCompare(a));
+  for (const [month, articles] of months) {
+    const [shard, summary] = buildShard(month, articles);
+    cacheShard(shard);
+    root.months.push(summary);
+    root.total += articles.length;
+    for (const a of articles) {
+      root.sources[a.source] = (root.sources[a.source] ?? 0) + 1;
+      root.difficulties[a.difficulty] = (root.difficulties[a.difficulty] ?? 0) + 1;
+    }
+  }
+  return root;
+}
+
+function loadIndex(): IndexRoot {
+  if (_rootCache) return _rootCache;
+  _rootCache = readJson<IndexRoot>("index", "root.json") ?? loadLegacyIndex();
+  return _rootCache;
+}
+
+function loadShard(month: string): LoadedShard {
+  const cached = _shardCache.get(month);
+  if (cached) return cached;
+  const shard = readJson<MonthShard>("index", `${month}.json`) ?? {
+    month,
+    articles: [],
+    ids: { source: {}, difficulty: {}, day: {} },
+  };
+  return cacheShard(shard);
+}
+
 // ── Article list ──────────────────────────────────────────────────────────────
 
 interface ListOptions {
@@ -50,36 +161,88 @@ interface ArticleRow extends Article {
   paragraph_count: number;
 }
 
+type FacetFilter = Pick<ListOptions, "source" | "difficulty" | "date">;
+
+/** Articles in one month summary matching source / difficulty (no date filter). */
+function countInMonth(summary: MonthSummary, { source, difficulty }: FacetFilter): number {
+  let n = 0;
+  for (const [s, byDiff] of Object.entries(summary.counts)) {
+    if (source && s !== source) continue;
+    for (const [d, count] of Object.entries(byDiff)) {
+      if (!difficulty || d === difficulty) n += count;
+    }
+  }
+  return n;
+}
+
+/** Matching articles of one month shard, newest first. */
+function matchInShard(shard: LoadedShard, { source, difficulty, date }: FacetFilter): ArticleRow[] {
+  // Start from the most selective id list, then apply the remaining filters
+  const ids = date
+    ? shard.ids.day[date]
+    : source
+      ? shard.ids.source[source]
+      : difficulty
+        ? shard.ids.difficulty[difficulty]
+        : undefined;
+  let rows = (ids ? ids.map((id) => shard.byId.get(id)!) : shard.articles) as ArticleRow[];
+  if (source) rows = rows.filter((a) => a.source === source);
+  if (difficulty) rows = rows.filter((a) => a.difficulty === difficulty);
+  return rows;
+}
+
+/** Month summaries a query can touch, newest first. */
+function monthsFor(root: IndexRoot, { date, month }: Pick<ListOptions, "date" | "month">) {
+  const only = date ? date.slice(0, 7) : month;
+  return only ? root.months.filter((m) => m.month === only) : root.months;
+}
+
 export async function getArticles(
   options: ListOptions = {}
 ): Promise<ArticleRow[]> {
-  const all = loadIndex();
+  const root = loadIndex();
   const { page = 1, limit = 12, source, difficulty, date, month } = options;
+  const filter = { source, difficulty, date };
 
-  let filtered = all as ArticleRow[];
-  if (source) filtered = filtered.filter((a) => a.source === source);
-  if (difficulty) filtered = filtered.filter((a) => a.difficulty === difficulty);
-  if (date) filtered = filtered.filter((a) => a.crawled_at.slice(0, 10) === date);
-  else if (month) filtered = filtered.filter((a) => a.crawled_at.slice(0, 7) === month);
-
-  // Index is already sorted by crawled_at DESC from the export script
-  const offset = (page - 1) * limit;
-  return filtered.slice(offset, offset + limit);
+  let skip = (page - 1) * limit;
+  const result: ArticleRow[] = [];
+  for (const summary of monthsFor(root, { date, month })) {
+    // Skip whole months before the page window using the precomputed counts
+    if (!date) {
+      const n = countInMonth(summary, filter);
+      if (skip >= n) {
+        skip -= n;
+        continue;
+      }
+    }
+    const rows = matchInShard(loadShard(summary.month), filter);
+    result.push(...rows.slice(skip, skip + limit - result.length));
+    skip = Math.max(0, skip - rows.length);
+    if (result.length >= limit) break;
+  }
+  return result;
 }
 
 export async function getArticleCount(
   options: Pick<ListOptions, "source" | "difficulty" | "date" | "month"> = {}
 ): Promise<number> {
-  const all = loadIndex();
+  const root = loadIndex();
   const { source, difficulty, date, month } = options;
 
-  let filtered = all as ArticleRow[];
-  if (source) filtered = filtered.filter((a) => a.source === source);
-  if (difficulty) filtered = filtered.filter((a) => a.difficulty === difficulty);
-  if (date) filtered = filtered.filter((a) => a.crawled_at.slice(0, 10) === date);
-  else if (month) filtered = filtered.filter((a) => a.crawled_at.slice(0, 7) === month);
+  if (date) {
+    const summary = monthsFor(root, { date })[0];
+    if (!summary) return 0;
+    if (!source && !difficulty) {
+      return summary.days.find((d) => d.date === date)?.count ?? 0;
+    }
+    return matchInShard(loadShard(summary.month), { source, difficulty, date }).length;
+  }
+  if (!source && !difficulty && !month) return root.total;
 
-  return filtered.length;
+  return monthsFor(root, { month }).reduce(
+    (n, summary) => n + countInMonth(summary, { source, difficulty }),
+    0
+  );
 }
 
 // ── Date-based browsing ───────────────────────────────────────────────────────
@@ -102,38 +265,103 @@ export interface MonthEntry {
  * ordered newest first.
  */
 export async function getAvailableDates(): Promise<MonthEntry[]> {
-  const all = loadIndex();
+  return loadIndex().months.map(({ month, count, days }) => {
+    const [y, m] = month.split("-");
+    return {
+      month,
+      label: `${y}年${parseInt(m)}月`,
+      total: count,
+      days: days
+        .map(({ date, count }) => ({ date, day: date.slice(8, 10), count }))
+        .sort((a, b) => b.date.localeCompare(a.date)),
+    };
+  });
+}
 
-  // Group by date
-  const byDate = new Map<string, number>();
-  for (const a of all) {
-    const date = a.crawled_at.slice(0, 10);
-    byDate.set(date, (byDate.get(date) ?? 0) + 1);
-  }
+// ── Delta feed (written by data/crawler/export/changes.py) ───────────────────
+//
+// A client that cached the index at export version v asks for the changes
+// since v and applies them; when no delta reaches back that far it reloads.
 
-  // Group by month
-  const byMonth = new Map<string, DayEntry[]>();
-  for (const [date, count] of byDate) {
-    const month = date.slice(0, 7);
-    if (!byMonth.has(month)) byMonth.set(month, []);
-    byMonth.get(month)!.push({ date, day: date.slice(8, 10), count });
-  }
+export interface ArticleChanges {
+  version: number;
+  /** True when the client must reload everything instead of applying a delta */
+  full: boolean;
+  added: ArticleRow[];
+  updated: ArticleRow[];
+  removed: number[];
+}
 
-  return Array.from(byMonth.entries())
-    .sort(([a], [b]) => b.localeCompare(a))
-    .map(([month, days]) => {
-      days.sort((a, b) => b.date.localeCompare(a.date));
-      const [y, m] = month.split("-");
-      return {
-        month,
-        label: `${y}年${parseInt(m)}月`,
-        total: days.reduce((s, d) => s + d.count, 0),
-        days,
-      };
-    });
+export async function getChangesSince(since: number): Promise<ArticleChanges> {
+  const root = loadIndex();
+  const version = root.export_version ?? 0;
+  const empty = { version, full: false, added: [], updated: [], removed: [] };
+  if (version && since === version) return empty;
+  if (!version || !root.changes_from?.includes(since)) return { ...empty, full: true };
+
+  const delta = readJson<Omit<ArticleChanges, "version" | "full">>(
+    "changes",
+    `${since}-${version}.json`
+  );
+  if (!delta) return { ...empty, full: true };
+  return { version, full: false, added: delta.added, updated: delta.updated, removed: delta.removed };
 }
 
 // ── Article detail ────────────────────────────────────────────────────────────
+//
+// Detail files come in two formats (see data/crawler/export/layouts.py):
+//   full     one object per paragraph / sentence row, with ids and seq
+//   compact  {"format": 2}: sentences stored once with short keys and no
+//            empty values; paragraph text is the sentences joined by a space
+//            unless the paragraph carries its own "en" / "cn"
+
+interface CompactSentence {
+  en: string;
+  cn?: string;
+  complex?: boolean;
+  analysis?: string;
+}
+
+interface CompactParagraph {
+  en?: string;
+  cn?: string;
+  sentences: CompactSentence[];
+}
+
+interface CompactArticle extends Article {
+  format: 2;
+  glossary?: Record<string, string>;
+  paragraphs: CompactParagraph[];
+}
+
+/** Rebuild the full detail shape; ids are only unique within the article. */
+function expandDetail(data: CompactArticle): ArticleWithContent {
+  const { paragraphs, ...meta } = data;
+  let sentenceId = 0;
+  return {
+    ...meta,
+    paragraphs: paragraphs.map((p, seq) => {
+      const paragraphId = seq + 1;
+      const sentences = p.sentences.map((s, sentSeq) => ({
+        id: ++sentenceId,
+        paragraph_id: paragraphId,
+        seq: sentSeq,
+        en_text: s.en,
+        cn_text: s.cn ?? "",
+        is_complex: s.complex ?? false,
+        analysis: s.analysis ?? "",
+      }));
+      return {
+        id: paragraphId,
+        article_id: meta.id,
+        seq,
+        en_text: p.en ?? sentences.map((s) => s.en_text).join(" "),
+        cn_text: p.cn ?? sentences.map((s) => s.cn_text).join(" "),
+        sentences,
+      };
+    }),
+  };
+}
 
 export async function getArticleById(
   id: number
@@ -143,12 +371,116 @@ export async function getArticleById(
       path.join(DATA_DIR, "detail", `${id}.json`),
       "utf-8"
     );
-    return JSON.parse(raw) as ArticleWithContent;
+    const data = JSON.parse(raw) as ArticleWithContent | CompactArticle;
+    return "format" in data && data.format === 2
+      ? expandDetail(data)
+      : (data as ArticleWithContent);
   } catch {
     return null;
   }
 }
 
+// ── Word lists (written by data/crawler/export/words.py) ──────────────────────
+//
+// words/{level}/{letter}.json maps each list word (a lemma, e.g. "go" for
+// "went") to the articles containing it, newest first, plus a few example
+// sentences; words/{level}/articles.json ranks articles by how many of the
+// list's words they contain.
+
+export interface WordExample {
+  id: number; // article id
+  en: string;
+  cn?: string;
+}
+
+export interface WordEntry {
+  /** Articles containing the word */
+  n: number;
+  /** Newest article ids, at most `max_articles` of the n */
+  a: number[];
+  ex: WordExample[];
+}
+
+interface WordsIndex {
+  version: number;
+  max_articles: number;
+  levels: Record<string, { size: number; words: number; letters: string[] }>;
+}
+
+interface WordShard {
+  level: string;
+  words: Record<string, WordEntry>;
+}
+
+let _wordsIndex: WordsIndex | null | undefined;
+const _wordShardCache = new Map<string, WordShard["words"]>();
+
+function loadWordsIndex(): WordsIndex | null {
+  if (_wordsIndex === undefined) _wordsIndex = readJson<WordsIndex>("words", "index.json");
+  return _wordsIndex;
+}
+
+function wordLetter(lemma: string): string {
+  return /^[a-z]/.test(lemma) ? lemma[0] : "_";
+}
+
+function loadWordShard(level: string, letter: string): WordShard["words"] {
+  const key = `${level}/${letter}`;
+  let words = _wordShardCache.get(key);
+  if (!words) {
+    const known = loadWordsIndex()?.levels[level]?.letters.includes(letter);
+    words = (known && readJson<WordShard>("words", level, `${letter}.json`)?.words) || {};
+    _wordShardCache.set(key, words);
+  }
+  return words;
+}
+
+/**
+ * Articles and example sentences for a list word. Without `level`, the first
+ * word list containing it is used. Returns null if no article contains it.
+ */
+export async function getWordEntry(word: string, level?: string): Promise<WordEntry | null> {
+  const index = loadWordsIndex();
+  const lemma = word.trim().toLowerCase();
+  if (!index || !lemma) return null;
+  for (const l of level ? [level] : Object.keys(index.levels)) {
+    const entry = loadWordShard(l, wordLetter(lemma))[lemma];
+    if (entry) return entry;
+  }
+  return null;
+}
+
+/**
+ * Articles that practise the most of `words` from one word list, as
+ * [article id, number of the words it contains], best first. With no words,
+ * ranks by all of the list's words instead.
+ *
+ * Hits are counted over each word's `a` list, which holds only its newest
+ * `max_articles` (words/index.json) articles: this ranks recent articles,
+ * and an older article that practises many of the words but fell out of
+ * those lists is not found.
+ */
+export async function getArticlesForWords(
+  level: string,
+  words: string[] = [],
+  limit: number = 20
+): Promise<[number, number][]> {
+  if (words.length === 0) {
+    const ranked = readJson<{ articles: [number, number, number][] }>("words", level, "articles.json");
+    return (ranked?.articles ?? []).slice(0, limit).map(([id, n]) => [id, n]);
+  }
+  const hits = new Map<number, number>();
+  for (const word of new Set(words.map((w) => w.trim().toLowerCase()))) {
+    const entry = word && loadWordShard(level, wordLetter(word))[word];
+    if (!entry) continue;
+    for (const id of entry.a) hits.set(id, (hits.get(id) ?? 0) + 1);
+  }
+  // Ties: newer articles have larger ids
+  return Array.from(hits.entries())
+    .sort(([idA, a], [idB, b]) => b - a || idB - idA)
+    .slice(0, limit);
+}
+
 // ── Word lookup (uses vocab.db — gracefully returns null when unavailable) ────
 
 /**
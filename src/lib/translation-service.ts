@@ -0,0 +1,37 @@
+/**
+ * Client for the shared translation service (data/crawler/service.py,
+ * started with `python run_crawler.py serve`).
+ *
+ * When TRANSLATION_SERVICE_URL is set, /api/translate and
+ * /api/analyze-sentence ask the service first, so the web app shares the
+ * crawler's micro-batching and translation cache. Returns null when the
+ * service is not configured or unreachable — callers then talk to DeepSeek /
+ * Google directly as before.
+ */
+const TIMEOUT_MS = 15_000;
+
+export interface ServiceResponse<T> {
+  status: number;
+  data: T;
+}
+
+export async function callTranslationService<T>(
+  path: "/translate" | "/analyze",
+  body: { text: string }
+): Promise<ServiceResponse<T> | null> {
+  const base = process.env.TRANSLATION_SERVICE_URL;
+  if (!base) return null;
+  try {
+    const resp = await fetch(`${base.replace(/\/+$/, "")}${path}`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(body),
+      cache: "no-store",
+      signal: AbortSignal.timeout(TIMEOUT_MS),
+    });
+    return { status: resp.status, data: (await resp.json()) as T };
+  } catch (err) {
+    console.error(`[translation-service] ${path} failed, falling back:`, err);
+    return null;
+  }
+}
@@ -15,6 +15,11 @@ export interface Article {
   image_url: string;
   crawled_at: string;
   paragraph_count?: number;
+  // Readability metrics, present once computed (run_crawler.py metrics)
+  word_count?: number;
+  fk_grade?: number;    // Flesch-Kincaid grade level
+  ttr?: number;         // type-token ratio
+  rare_rate?: number;   // share of words outside the 5000 most frequent
 }
 
 export interface Sentence {
@@ -38,6 +43,8 @@ export interface Paragraph {
 
 export interface ArticleWithContent extends Article {
   paragraphs: Paragraph[];
+  /** Translations of the article's out-of-list / rare words: term → Chinese */
+  glossary?: Record<string, string>;
 }
 
 /** Parsed sentence analysis produced by DeepSeek. */